@@ -0,0 +1,13 @@
+# benchmarks/__init__.py
+"""
+Benchmark suite. Run from the repository root:
+
+    python -m benchmarks.corpus --profile medium --out bench_corpus
+    python -m benchmarks.suite --profile small --workers 1 2 4 --baseline benchmarks/baseline.json
+"""
+import os
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
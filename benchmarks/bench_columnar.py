@@ -0,0 +1,139 @@
+# benchmarks/bench_columnar.py
+"""
+Columnar chunk table vs. the JSONL corpus: file size and load time of
+synthetic tagged chunks, for a full load and for the typical analysis
+(keyword and intent counts, which only need two columns).
+
+    python benchmarks/bench_columnar.py --chunks 100000 1000000
+
+The JSONL side is the Bedrock corpus a run writes, parsed with json.loads;
+the columnar side is chunks.parquet / chunks.arrow as written by
+ColumnarWriter, fed one file's table at a time like the run's parent.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from docs_pipeline.columnar import ColumnarWriter, chunk_table, read_table, require_pyarrow  # noqa: E402
+from docs_pipeline.llm_export import EXPORTERS  # noqa: E402
+
+INTENTS = ["rule", "definition", "procedure", "general"]
+LABELS = ["ORG", "PERSON", "DATE", "GPE", "LAW"]
+
+
+def make_chunks(n: int, words: int, per_file: int, rng: random.Random):
+    vocab = [f"term{i}" for i in range(5000)]
+    keywords = vocab[:300]
+    for i in range(n):
+        yield {
+            "content": " ".join(rng.choices(vocab, k=words)),
+            "chunk_id": i % per_file,
+            "file_name": f"policy_{i // per_file:06d}.docx",
+            "chunk_position": (i % per_file) / per_file,
+            "word_count": words,
+            "keywords": rng.sample(keywords, 5),
+            "policy_keywords": rng.sample(keywords[:40], rng.randint(0, 3)),
+            "intents": rng.sample(INTENTS, rng.randint(1, 2)),
+            "entities": [(f"Entity {rng.randrange(2000)}", rng.choice(LABELS)) for _ in range(rng.randint(0, 4))],
+        }
+
+
+def write_outputs(directory: str, n: int, words: int, per_file: int, seed: int) -> dict:
+    build = EXPORTERS["bedrock"][0]
+    paths = {
+        "jsonl": os.path.join(directory, "bedrock_corpus.jsonl"),
+        "parquet": os.path.join(directory, "chunks.parquet"),
+        "arrow": os.path.join(directory, "chunks.arrow"),
+    }
+    with open(paths["jsonl"], "w", encoding="utf-8") as f, \
+            ColumnarWriter(paths["parquet"]) as parquet, ColumnarWriter(paths["arrow"]) as arrow:
+        batch = []
+        for chunk in make_chunks(n, words, per_file, random.Random(seed)):
+            f.write(json.dumps(build(chunk, chunk["file_name"]), ensure_ascii=False) + "\n")
+            batch.append(chunk)
+            if len(batch) == per_file:  # one worker result
+                table = chunk_table(batch)
+                parquet.append(table)
+                arrow.append(table)
+                batch = []
+        if batch:
+            table = chunk_table(batch)
+            parquet.append(table)
+            arrow.append(table)
+    return paths
+
+
+def jsonl_full(path: str) -> int:
+    with open(path, "r", encoding="utf-8") as f:
+        return len([json.loads(line) for line in f])
+
+
+def jsonl_tags(path: str) -> Counter:
+    counts = Counter()
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            metadata = json.loads(line)["metadata"]
+            counts.update(metadata.get("keywords", []))
+            counts.update(metadata.get("intents", []))
+    return counts
+
+
+def columnar_tags(path: str) -> Counter:
+    import pyarrow.compute as pc
+    table = read_table(path, columns=["keywords", "intents"])
+    counts = Counter()
+    for name in ("keywords", "intents"):
+        for entry in pc.value_counts(pc.list_flatten(table[name])).to_pylist():
+            counts[entry["values"]] += entry["counts"]
+    return counts
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Columnar export benchmark")
+    parser.add_argument("--chunks", type=int, nargs="+", default=[100000])
+    parser.add_argument("--words", type=int, default=300, help="Words per chunk")
+    parser.add_argument("--per_file", type=int, default=40, help="Chunks per input file")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    require_pyarrow()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.chunks:
+            directory = os.path.join(tmp, str(n))
+            os.makedirs(directory)
+            paths = write_outputs(directory, n, args.words, args.per_file, args.seed)
+            assert jsonl_tags(paths["jsonl"]) == columnar_tags(paths["parquet"]) == columnar_tags(paths["arrow"])
+            sizes = {name: os.path.getsize(path) / 1e6 for name, path in paths.items()}
+            full = {
+                "jsonl": best_of(lambda: jsonl_full(paths["jsonl"]), args.repeat),
+                "parquet": best_of(lambda: read_table(paths["parquet"]), args.repeat),
+                "arrow": best_of(lambda: read_table(paths["arrow"]), args.repeat),
+            }
+            tags = {
+                "jsonl": best_of(lambda: jsonl_tags(paths["jsonl"]), args.repeat),
+                "parquet": best_of(lambda: columnar_tags(paths["parquet"]), args.repeat),
+                "arrow": best_of(lambda: columnar_tags(paths["arrow"]), args.repeat),
+            }
+            for name in paths:
+                print(
+                    f"{n:>8} chunks  {name:<7} {sizes[name]:8.1f} MB | full load {full[name]:7.2f}s "
+                    f"({full['jsonl'] / full[name]:5.1f}x) | keyword+intent counts {tags[name]:7.2f}s "
+                    f"({tags['jsonl'] / tags[name]:5.1f}x)"
+                )
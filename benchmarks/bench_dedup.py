@@ -0,0 +1,67 @@
+# benchmarks/bench_dedup.py
+"""
+Near-duplicate removal on a synthetic corpus: unique chunks mixed with
+copies of a few boilerplate chunks, some copies lightly edited. Reports
+throughput, how many planted copies were found (and how many unique chunks
+were wrongly dropped), the corpus reduction and peak memory.
+
+    python benchmarks/bench_dedup.py --chunks 10000 50000 --dup-rate 0.3
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from docs_pipeline.dedup import dedup_corpora  # noqa: E402
+from docs_pipeline.workers import peak_rss_mb  # noqa: E402
+from bench_keywords import make_chunks  # noqa: E402
+
+
+def write_corpus(path: str, n: int, words: int, dup_rate: float, rng: random.Random) -> int:
+    """JSONL corpus of n Bedrock records; returns how many are planted copies."""
+    boilerplate = make_chunks(20, words, rng)
+    unique = (text for _ in range(0, n, 1000) for text in make_chunks(1000, words, rng))  # not all in memory
+    copies = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n):
+            if i >= len(boilerplate) and rng.random() < dup_rate:
+                tokens = rng.choice(boilerplate).split()
+                for _ in range(rng.randrange(3)):  # a few edited words, as in real boilerplate
+                    tokens[rng.randrange(len(tokens))] = "edited"
+                text, copies = " ".join(tokens), copies + 1
+            else:
+                text = boilerplate[i] if i < len(boilerplate) else next(unique)
+            f.write(json.dumps({"text": text, "metadata": {"source": f"doc{i}.docx", "chunk_id": 0}}) + "\n")
+    return copies
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Near-duplicate removal benchmark")
+    parser.add_argument("--chunks", type=int, nargs="+", default=[10000])
+    parser.add_argument("--words", type=int, default=300, help="Words per chunk")
+    parser.add_argument("--dup-rate", type=float, default=0.3, help="Share of chunks that copy boilerplate")
+    parser.add_argument("--threshold", type=float, default=0.9)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.chunks:
+            raw = os.path.join(tmp, "raw.jsonl")
+            planted = write_corpus(raw, n, args.words, args.dup_rate, rng)
+            out = os.path.join(tmp, f"out{n}")
+            os.makedirs(out)
+            start = time.perf_counter()
+            report = dedup_corpora({"bedrock": [raw]}, out, mode="drop", threshold=args.threshold)
+            elapsed = time.perf_counter() - start
+            sizes = report["formats"]["bedrock"]
+            print(
+                f"chunks {n:>7}: {n / elapsed:8.0f} chunks/sec | removed {report['duplicates']} "
+                f"of {planted} planted copies | {sizes['bytes_in'] / 1e6:.1f} MB -> {sizes['bytes_out'] / 1e6:.1f} MB "
+                f"(-{report['reduction']:.1%}) | LSH {report['bands']}x{report['rows']} | peak RSS {peak_rss_mb():.0f} MB"
+            )
@@ -0,0 +1,71 @@
+# benchmarks/bench_ingestion.py
+"""
+Ingestion: python-docx object model vs. streaming word/document.xml.
+
+    python benchmarks/bench_ingestion.py --paragraphs 20000 --tables 200
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import docx  # noqa: E402
+from docs_pipeline.docx_stream import DocxStreamReader  # noqa: E402
+
+SENTENCE = (
+    "Employees must complete the annual security awareness procedure and report "
+    "any suspected breach of access control to the compliance office."
+)
+
+
+def make_docx(path: str, paragraphs: int, tables: int) -> None:
+    doc = docx.Document()
+    per_table = max(1, paragraphs // max(1, tables))
+    for i in range(paragraphs):
+        doc.add_paragraph(f"{i}. {SENTENCE}")
+        if tables and i % per_table == 0:
+            table = doc.add_table(rows=3, cols=3)
+            for r in range(3):
+                for c in range(3):
+                    table.cell(r, c).text = f"cell {r},{c} {SENTENCE[:40]}"
+    doc.save(path)
+
+
+def python_docx_path(path: str) -> int:
+    return sum(1 for p in docx.Document(path).paragraphs if p.text.strip())
+
+
+def streaming_path(path: str) -> int:
+    return sum(1 for _ in DocxStreamReader(path).iter_blocks())
+
+
+def measure(fn, path: str):
+    tracemalloc.start()
+    start = time.perf_counter()
+    blocks = fn(path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024), blocks
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingestion benchmark")
+    parser.add_argument("--paragraphs", type=int, default=20000)
+    parser.add_argument("--tables", type=int, default=200)
+    parser.add_argument("--docx", help="Benchmark an existing .docx instead of a generated one")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.docx
+        if not path:
+            path = os.path.join(tmp, "large.docx")
+            make_docx(path, args.paragraphs, args.tables)
+        print(f"file: {path} ({os.path.getsize(path) / 1024:.0f} KB)")
+        for name, fn in (("python-docx", python_docx_path), ("streaming", streaming_path)):
+            elapsed, peak_mb, blocks = measure(fn, path)
+            print(f"{name:12s} {elapsed:7.2f}s  peak {peak_mb:7.1f} MB  blocks {blocks}")
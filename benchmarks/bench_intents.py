@@ -0,0 +1,63 @@
+# benchmarks/bench_intents.py
+"""
+Intent classification: the old per-intent substring scan vs. the single
+token automaton of IntentClassifier, as the number of intents grows.
+
+    python benchmarks/bench_intents.py --chunks 2000 --intents 3 30 60
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from docs_pipeline.intents import DEFAULT_INTENTS, IntentClassifier  # noqa: E402
+from bench_keywords import make_chunks  # noqa: E402
+
+
+def make_intents(n: int, rng: random.Random):
+    intents = {name: list(spec["markers"]) for name, spec in DEFAULT_INTENTS.items()}
+    while len(intents) < n:
+        intents[f"intent{len(intents)}"] = [f"marker{rng.randrange(10000)} word{k}" for k in range(6)]
+    return intents
+
+
+def substring_scan(chunks, intents):
+    out = []
+    for chunk in chunks:
+        lower = chunk.lower()
+        found = [i for i, markers in intents.items() if any(m in lower for m in markers)]
+        out.append(found or ["general"])
+    return out
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Intent classifier benchmark")
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=500, help="Words per chunk")
+    parser.add_argument("--intents", type=int, nargs="+", default=[3, 30, 60])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    chunks = make_chunks(args.chunks, args.words, rng)
+    print(f"chunks: {args.chunks} x {args.words} words")
+    for n in args.intents:
+        intents = make_intents(n, rng)
+        classifier = IntentClassifier(intents)
+
+        start = time.perf_counter()
+        substring_scan(chunks, intents)
+        t_scan = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for chunk in chunks:
+            classifier.classify(chunk)
+        t_automaton = time.perf_counter() - start
+
+        print(
+            f"intents {n:>3}: substring scan {len(chunks) / t_scan:8.1f} chunks/sec | "
+            f"automaton {len(chunks) / t_automaton:8.1f} chunks/sec"
+        )
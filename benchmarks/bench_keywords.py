@@ -0,0 +1,82 @@
+# benchmarks/bench_keywords.py
+"""
+Keyword matching: per-token set lookup (the old tagger) vs. the
+Aho-Corasick KeywordMatcher, across vocabulary sizes.
+
+    python benchmarks/bench_keywords.py --chunks 2000 --vocab 100 10000 50000
+
+The set lookup only sees single words, so on multi-word vocabularies it
+also finds fewer keywords; both sides use the same word tokenizer so the
+timings compare the lookups, not spaCy.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from docs_pipeline.keywords import KeywordMatcher, tokenize  # noqa: E402
+
+WORDS = (
+    "access control policy review compliance office security breach notification data protection "
+    "officer employees training procedure audit evidence retention schedule risk register governance "
+    "framework privacy impact assessment vendor incident response encryption standard exception"
+).split()
+
+
+def make_vocab(n: int, rng: random.Random):
+    """n distinct terms, about half of them multi-word."""
+    terms = set(WORDS)
+    while len(terms) < n:
+        k = rng.choice([1, 1, 2, 2, 3, 4])
+        words = [rng.choice(WORDS) if rng.random() < 0.5 else f"term{rng.randrange(n * 4)}" for _ in range(k)]
+        terms.add(" ".join(words))
+    return sorted(terms)[:n]
+
+
+def make_chunks(n: int, words: int, rng: random.Random):
+    return [" ".join(rng.choice(WORDS) for _ in range(words)) for _ in range(n)]
+
+
+def set_lookup(chunks, vocab):
+    keywords = {term.lower() for term in vocab}
+    return [list({w for w in tokenize(chunk) if w in keywords}) for chunk in chunks]
+
+
+def automaton(chunks, matcher):
+    return [matcher.match(chunk) for chunk in chunks]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Keyword matcher benchmark")
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=500, help="Words per chunk")
+    parser.add_argument("--vocab", type=int, nargs="+", default=[100, 10000, 50000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    chunks = make_chunks(args.chunks, args.words, rng)
+    print(f"chunks: {args.chunks} x {args.words} words")
+    for n in args.vocab:
+        vocab = make_vocab(n, rng)
+        start = time.perf_counter()
+        matcher = KeywordMatcher(vocab)
+        matcher.match("")
+        t_build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        old = set_lookup(chunks, vocab)
+        t_set = time.perf_counter() - start
+
+        start = time.perf_counter()
+        new = automaton(chunks, matcher)
+        t_ac = time.perf_counter() - start
+
+        print(
+            f"vocab {n:>6}: set lookup {len(chunks) / t_set:8.1f} chunks/sec ({sum(map(len, old))} hits) | "
+            f"automaton {len(chunks) / t_ac:8.1f} chunks/sec ({sum(map(len, new))} hits, "
+            f"built in {t_build * 1000:.0f} ms)"
+        )
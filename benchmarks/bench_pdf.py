@@ -0,0 +1,93 @@
+# benchmarks/bench_pdf.py
+"""
+PDF rendering: the platypus PDFConverter (reload the debug JSON, one
+Paragraph per line) vs. ChunkPDFWriter (tagged chunks straight onto a
+canvas), and what the export loop pays for ChunkPDFWriter inline vs. on
+the BackgroundPDFWriter process. The loop burns --tag_ms of CPU per chunk
+in Python, like tagging: work that a renderer thread would have to share
+the GIL with.
+
+    python benchmarks/bench_pdf.py --chunks 200 500 --words 500 --tag_ms 5
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from docs_pipeline.pdf_conversion import BackgroundPDFWriter, ChunkPDFWriter, PDFConverter, render_chunks  # noqa: E402
+from docs_pipeline.llm_export import ChunkExporter  # noqa: E402
+from bench_keywords import make_chunks  # noqa: E402
+
+
+def make_tagged(n: int, words: int, rng: random.Random):
+    return [
+        {
+            "chunk_id": i, "file_name": "bench.docx", "content": text, "word_count": words,
+            "keywords": text.split()[:10], "policy_keywords": ["policy", "security"],
+            "entities": [["Acme Corp", "ORG"]], "intents": ["rule"], "chunk_position": i / max(1, n - 1),
+        }
+        for i, text in enumerate(make_chunks(n, words, rng))
+    ]
+
+
+def busy(ms: float) -> None:
+    """Stand-in for tagging: pure-Python CPU work for `ms` milliseconds."""
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        sum(range(100))
+
+
+def export_loop(chunks, tmp: str, tag_ms: float, pdf_writer=None) -> float:
+    """Tag (simulated) and export every chunk, plus a PDF write when given; seconds until done."""
+    start = time.perf_counter()
+    with ChunkExporter("bedrock", os.path.join(tmp, "bench.jsonl"), "bench.docx") as exporter:
+        for chunk in chunks:
+            busy(tag_ms)
+            exporter.write(chunk)
+            if pdf_writer:
+                pdf_writer.write(chunk)
+    if pdf_writer:
+        pdf_writer.close()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PDF rendering benchmark")
+    parser.add_argument("--chunks", type=int, nargs="+", default=[200, 500])
+    parser.add_argument("--words", type=int, default=500, help="Words per chunk")
+    parser.add_argument("--tag_ms", type=float, default=5.0, help="Simulated tagging CPU per chunk")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.chunks:
+            chunks = make_tagged(n, args.words, rng)
+            json_file = os.path.join(tmp, "bench.json")
+            with open(json_file, "w", encoding="utf-8") as f:
+                json.dump(chunks, f, indent=4, ensure_ascii=False)
+
+            start = time.perf_counter()
+            PDFConverter().convert(json_file, os.path.join(tmp, "platypus.pdf"))
+            t_platypus = time.perf_counter() - start
+
+            start = time.perf_counter()
+            render_chunks(chunks, os.path.join(tmp, "canvas.pdf"), "JSON Output: bench.json")
+            t_canvas = time.perf_counter() - start
+
+            title = "JSON Output: bench.json"
+            t_export = export_loop(chunks, tmp, args.tag_ms)
+            t_inline = export_loop(chunks, tmp, args.tag_ms, ChunkPDFWriter(os.path.join(tmp, "inline.pdf"), title))
+            t_process = export_loop(chunks, tmp, args.tag_ms, BackgroundPDFWriter(os.path.join(tmp, "bg.pdf"), title))
+
+            sizes = {name: os.path.getsize(os.path.join(tmp, name)) // 1024 for name in ("platypus.pdf", "canvas.pdf")}
+            print(
+                f"chunks {n:>5}: platypus {t_platypus:7.2f}s ({sizes['platypus.pdf']} KB) | "
+                f"canvas {t_canvas:6.2f}s ({sizes['canvas.pdf']} KB, {t_platypus / t_canvas:.0f}x) | "
+                f"tag + export {t_export:.2f}s, + PDF inline {t_inline:.2f}s, + PDF process {t_process:.2f}s"
+            )
@@ -0,0 +1,80 @@
+# benchmarks/bench_search.py
+"""
+BM25 index: build throughput, size and query latency on synthetic corpora
+of Bedrock records. Word frequencies follow a Zipf law, as in real text,
+so common terms have long postings lists.
+
+    python benchmarks/bench_search.py --records 100000 1000000
+
+Queries mix one to three terms drawn across the frequency range; latency is
+reported with and without an intent + file-name filter.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from docs_pipeline.search_index import BM25Index, build_index  # noqa: E402
+from docs_pipeline.workers import peak_rss_mb  # noqa: E402
+
+INTENTS = ["rule", "definition", "procedure", "general"]
+
+
+def write_corpus(path: str, n: int, words: int, vocab: int, rng: np.random.Generator) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n):
+            if i % 10000 == 0:  # draw in batches, so the generator does not dominate peak RSS
+                ranks = np.minimum(rng.zipf(1.2, size=(min(10000, n - i), words)), vocab)
+            tokens = [f"w{r}" for r in ranks[i % 10000]]
+            record = {
+                "text": " ".join(tokens),
+                "metadata": {
+                    "file_name": f"doc{i // 40}.docx", "chunk_id": i % 40,
+                    "keywords": tokens[:5], "intents": [INTENTS[i % 4]],
+                },
+            }
+            f.write(json.dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="BM25 index benchmark")
+    parser.add_argument("--records", type=int, nargs="+", default=[100000])
+    parser.add_argument("--words", type=int, default=120, help="Words per record")
+    parser.add_argument("--vocab", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    pick = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.records:
+            out = os.path.join(tmp, f"out{n}")
+            os.makedirs(out)
+            write_corpus(os.path.join(out, "bedrock_corpus.jsonl"), n, args.words, args.vocab, rng)
+            meta = build_index(out, "bedrock")
+            index = BM25Index(meta["path"])
+            queries = [
+                " ".join(f"w{int(min(10 ** pick.uniform(0, 4), args.vocab))}" for _ in range(pick.randint(1, 3)))
+                for _ in range(args.queries)
+            ]
+            index.search(queries[0])  # map the files
+            for label, filters in (("no filter", {}), ("filtered", {"intents": ["rule"], "file_names": ["doc1*"]})):
+                times = []
+                for query in queries:
+                    start = time.perf_counter()
+                    index.search(query, k=10, **filters)
+                    times.append(time.perf_counter() - start)
+                p50, p95 = np.percentile(times, [50, 95]) * 1000
+                print(
+                    f"records {n:>8}: build {n / meta['build_s']:7.0f} rec/sec, {meta['bytes'] / 1e6:6.1f} MB, "
+                    f"{meta['terms']} terms | {label:<9} p50 {p50:6.2f} ms, p95 {p95:6.2f} ms | "
+                    f"peak RSS {peak_rss_mb():.0f} MB"
+                )
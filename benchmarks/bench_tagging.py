@@ -0,0 +1,97 @@
+# benchmarks/bench_tagging.py
+"""
+Tagging throughput: per-chunk nlp() calls vs. batched nlp.pipe, or the
+tagging profiles side by side (load time, RSS, chunks/sec — each profile
+in a fresh process so their memory does not mix).
+
+    python benchmarks/bench_tagging.py --chunks 2000 --batch_size 64
+    python benchmarks/bench_tagging.py --chunks 2000 --profiles fast balanced full
+"""
+import os
+import sys
+import time
+import argparse
+import multiprocessing
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from docs_pipeline.tagging import TextTagger  # noqa: E402
+
+SAMPLE = (
+    "The organization must maintain an access control policy that is reviewed by the "
+    "compliance team each year. Privacy means the protection of personal data as defined "
+    "in GDPR Article 4. Step one of the audit procedure requires Acme Corp to log every "
+    "security breach within 72 hours and notify the Data Protection Officer in London. "
+)
+
+
+def make_chunks(n: int, words: int = 500):
+    base = SAMPLE.split()
+    return [" ".join((base * (words // len(base) + 1))[i % 7:i % 7 + words]) for i in range(n)]
+
+
+def run(chunks, tagger: TextTagger, batch_size: int):
+    start = time.perf_counter()
+    unbatched = [tagger._tag_single(i, c, "bench.docx", len(chunks)) for i, c in enumerate(chunks)]
+    t_single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = tagger.tag_chunks(chunks, "bench.docx", batch_size=batch_size)
+    t_batch = time.perf_counter() - start
+
+    assert unbatched == batched, "batched output differs from per-chunk output"
+    print(f"chunks:          {len(chunks)}")
+    print(f"per-chunk nlp(): {len(chunks) / t_single:8.1f} chunks/sec")
+    print(f"nlp.pipe({batch_size}):   {len(chunks) / t_batch:8.1f} chunks/sec  ({t_single / t_batch:.2f}x)")
+
+
+def profile_worker(profile: str, chunks, config_path: str, batch_size: int):
+    """Runs in a spawned process: load one profile, tag, report."""
+    from docs_pipeline.workers import peak_rss_mb, rss_mb
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    tagger = TextTagger(config_path=config_path, batch_size=batch_size, profile=profile)
+    t_load = time.perf_counter() - start
+    rss_loaded = rss_mb()
+    start = time.perf_counter()
+    tagged = tagger.tag_chunks(chunks, "bench.docx", batch_size=batch_size)
+    t_tag = time.perf_counter() - start
+    return {
+        "profile": profile,
+        "load_s": t_load,
+        "model_mb": rss_loaded - rss_before,
+        "peak_rss_mb": peak_rss_mb(),
+        "chunks_per_s": len(tagged) / t_tag,
+        "entities": sum(len(c.get("entities", [])) for c in tagged),
+    }
+
+
+def run_profiles(chunks, profiles, config_path: str, batch_size: int):
+    ctx = multiprocessing.get_context("spawn")
+    print(f"chunks: {len(chunks)}")
+    print(f"{'profile':<9} {'load':>7} {'model RSS':>10} {'peak RSS':>9} {'chunks/sec':>11} {'entities':>9}")
+    for profile in profiles:
+        with ctx.Pool(1) as pool:
+            try:
+                r = pool.apply(profile_worker, (profile, chunks, config_path, batch_size))
+            except Exception as e:
+                print(f"{profile:<9} failed ({type(e).__name__})")
+                continue
+        print(
+            f"{r['profile']:<9} {r['load_s']:6.1f}s {r['model_mb']:7.0f} MB {r['peak_rss_mb']:6.0f} MB "
+            f"{r['chunks_per_s']:11.1f} {r['entities']:9d}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tagging throughput benchmark")
+    parser.add_argument("--chunks", type=int, default=1000)
+    parser.add_argument("--words", type=int, default=500, help="Words per chunk")
+    parser.add_argument("--batch_size", type=int, default=TextTagger.DEFAULT_BATCH_SIZE)
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--profiles", nargs="+", choices=TextTagger.PROFILES, help="Compare tagging profiles")
+    args = parser.parse_args()
+    if args.profiles:
+        run_profiles(make_chunks(args.chunks, args.words), args.profiles, args.config, args.batch_size)
+        sys.exit(0)
+    run(make_chunks(args.chunks, args.words), TextTagger(config_path=args.config), args.batch_size)
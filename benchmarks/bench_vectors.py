@@ -0,0 +1,88 @@
+# benchmarks/bench_vectors.py
+"""
+Chunk vectors: spaCy's per-token doc.vector vs. the batched NumPy
+chunk_vectors, then brute-force cosine top-k over memory-mapped matrices
+of growing size.
+
+    python benchmarks/bench_vectors.py --chunks 2000 --rows 100000 1000000 --dtype float16
+
+A blank English pipeline with a random 300-d vector table stands in for
+en_core_web_lg, so no model download is needed; the lookups and
+arithmetic are the same.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from docs_pipeline.vectors import NpyWriter, chunk_vectors, load_matrix, top_k  # noqa: E402
+from docs_pipeline.workers import peak_rss_mb  # noqa: E402
+
+
+def make_nlp(vocab: int, dim: int, rng: np.random.Generator):
+    import spacy
+    nlp = spacy.blank("en")
+    nlp.vocab.vectors.resize((vocab, dim))
+    for i in range(vocab):
+        nlp.vocab.set_vector(f"w{i}", rng.standard_normal(dim).astype(np.float32))
+    return nlp
+
+
+def write_matrix(path: str, rows: int, dim: int, dtype: str, rng: np.random.Generator) -> None:
+    with NpyWriter(path, dtype, dim) as writer:
+        for start in range(0, rows, 65536):
+            block = rng.standard_normal((min(65536, rows - start), dim)).astype(np.float32)
+            writer.append(block / np.linalg.norm(block, axis=1, keepdims=True))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chunk vector benchmark")
+    parser.add_argument("--chunks", type=int, default=2000, help="Chunks to vectorize")
+    parser.add_argument("--words", type=int, default=300, help="Words per chunk")
+    parser.add_argument("--vocab", type=int, default=20000, help="Words with a vector")
+    parser.add_argument("--dim", type=int, default=300)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000], help="Matrix sizes to search")
+    parser.add_argument("--dtype", choices=["float32", "float16"], default="float32")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    words = random.Random(args.seed)
+    nlp = make_nlp(args.vocab, args.dim, rng)
+    texts = [" ".join(f"w{words.randrange(args.vocab * 5 // 4)}" for _ in range(args.words)) for _ in range(args.chunks)]
+    docs = list(nlp.pipe(texts))
+
+    start = time.perf_counter()
+    for doc in docs:
+        doc.vector  # noqa: B018
+    spacy_s = time.perf_counter() - start
+    start = time.perf_counter()
+    for i in range(0, len(docs), 64):  # one nlp.pipe batch at a time, as in the tagger
+        chunk_vectors(docs[i:i + 64], args.dtype)
+    numpy_s = time.perf_counter() - start
+    print(
+        f"vectorize {args.chunks} x {args.words} words: doc.vector {args.chunks / spacy_s:8.0f} chunks/sec | "
+        f"chunk_vectors {args.chunks / numpy_s:8.0f} chunks/sec ({spacy_s / numpy_s:.1f}x)"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            path = os.path.join(tmp, f"vectors{rows}.npy")
+            write_matrix(path, rows, args.dim, args.dtype, rng)
+            matrix = load_matrix(path)
+            query = rng.standard_normal(args.dim).astype(np.float32)
+            top_k(matrix, query, k=args.k)  # warm the page cache
+            start = time.perf_counter()
+            top_k(matrix, query, k=args.k)
+            elapsed = time.perf_counter() - start
+            print(
+                f"top-{args.k} over {rows:>8} x {args.dim} {args.dtype}: {elapsed * 1000:8.1f} ms/query "
+                f"({os.path.getsize(path) / 1e6:.0f} MB on disk) | peak RSS {peak_rss_mb():.0f} MB"
+            )
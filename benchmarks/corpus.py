@@ -0,0 +1,118 @@
+# benchmarks/corpus.py
+"""
+Reproducible synthetic .docx corpora, generated offline with python-docx.
+
+    python -m benchmarks.corpus --profile medium --out bench_corpus --seed 0
+
+The same profile and seed always produce the same documents (text, tables
+and images); only the zip timestamps differ between runs.
+"""
+import io
+import os
+import random
+import argparse
+from typing import Dict, List
+
+import docx
+
+# documents, paragraphs per document (min, max), tables and images per document
+PROFILES: Dict[str, Dict] = {
+    "tiny":   {"documents": 3,   "paragraphs": (20, 60),     "tables": 1, "images": 0},
+    "small":  {"documents": 20,  "paragraphs": (100, 400),   "tables": 2, "images": 2},
+    "medium": {"documents": 100, "paragraphs": (200, 1500),  "tables": 5, "images": 4},
+    "large":  {"documents": 300, "paragraphs": (500, 10000), "tables": 20, "images": 8},
+}
+
+VOCABULARY = (
+    "access control policy must be reviewed annually by the compliance office "
+    "security breach notification within seventy two hours data protection officer "
+    "employees shall complete awareness training procedure step audit evidence "
+    "retention schedule risk register governance framework privacy impact assessment "
+    "vendor management incident response encryption standard guideline exception "
+    "approval means the process defined in section article regulation hipaa gdpr"
+).split()
+NAMES = ["Acme Corp", "London", "Jane Smith", "the Board", "Globex", "Paris", "ISO 27001"]
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(VOCABULARY) for _ in range(rng.randint(8, 24))]
+    if rng.random() < 0.3:
+        words.insert(rng.randrange(len(words)), rng.choice(NAMES))
+    return " ".join(words).capitalize() + "."
+
+
+def _paragraph(rng: random.Random) -> str:
+    return " ".join(_sentence(rng) for _ in range(rng.randint(1, 4)))
+
+
+def _image(rng: random.Random, kind: str) -> bytes:
+    """PNG: a text-like scan, a blank page, or a tiny bullet icon."""
+    from PIL import Image, ImageDraw
+
+    if kind == "icon":
+        img = Image.new("RGB", (16, 16), "white")
+        ImageDraw.Draw(img).ellipse((3, 3, 12, 12), fill="black")
+    elif kind == "blank":
+        img = Image.new("RGB", (800, 600), "white")
+    else:
+        img = Image.new("RGB", (rng.choice([640, 1200, 2600]), rng.choice([300, 800, 1800])), "white")
+        draw = ImageDraw.Draw(img)
+        y = 20
+        while y < img.height - 30:
+            draw.text((20, y), _sentence(rng)[:80], fill="black")
+            y += 24
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def make_document(path: str, rng: random.Random, paragraphs: int, tables: int, images: int) -> None:
+    doc = docx.Document()
+    doc.sections[0].header.paragraphs[0].text = "Internal policy — confidential"
+    doc.sections[0].footer.paragraphs[0].text = f"{os.path.basename(path)} — page footer"
+    table_at = set(rng.sample(range(paragraphs), min(tables, paragraphs)))
+    image_at = set(rng.sample(range(paragraphs), min(images, paragraphs)))
+    for i in range(paragraphs):
+        if i % 50 == 0:
+            doc.add_heading(f"Section {i // 50 + 1}", level=1)
+        doc.add_paragraph(_paragraph(rng))
+        if i in table_at:
+            rows, cols = rng.randint(2, 8), rng.randint(2, 5)
+            table = doc.add_table(rows=rows, cols=cols)
+            for r in range(rows):
+                for c in range(cols):
+                    table.cell(r, c).text = " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(1, 6)))
+        if i in image_at:
+            kind = rng.choices(["text", "blank", "icon"], weights=[6, 1, 2])[0]
+            doc.add_picture(io.BytesIO(_image(rng, kind)), width=docx.shared.Inches(4 if kind != "icon" else 0.2))
+    doc.save(path)
+
+
+def generate_corpus(out_dir: str, profile: str = "small", seed: int = 0, images: bool = True) -> List[str]:
+    """Write the profile's documents to out_dir; returns their paths."""
+    spec = PROFILES[profile]
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for n in range(spec["documents"]):
+        rng = random.Random(f"{seed}-{profile}-{n}")
+        path = os.path.join(out_dir, f"{profile}_{n:04d}.docx")
+        make_document(
+            path, rng,
+            paragraphs=rng.randint(*spec["paragraphs"]),
+            tables=spec["tables"],
+            images=spec["images"] if images else 0,
+        )
+        paths.append(path)
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic .docx corpus")
+    parser.add_argument("--profile", choices=list(PROFILES), default="small")
+    parser.add_argument("--out", required=True, help="Output directory")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no_images", action="store_true", help="Text and tables only")
+    args = parser.parse_args()
+    paths = generate_corpus(args.out, args.profile, args.seed, images=not args.no_images)
+    size = sum(os.path.getsize(p) for p in paths)
+    print(f"Wrote {len(paths)} documents ({size / (1024 * 1024):.1f} MB) to {args.out}")
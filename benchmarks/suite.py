@@ -0,0 +1,283 @@
+# benchmarks/suite.py
+"""
+Stage and end-to-end benchmarks over a synthetic corpus, with a stored
+baseline to catch regressions.
+
+    python -m benchmarks.suite --profile small --workers 1 2 4 --out bench_results.json
+    python -m benchmarks.suite --profile small --save_baseline benchmarks/baseline.json
+    python -m benchmarks.suite --profile small --baseline benchmarks/baseline.json --tolerance 0.25
+
+Every stage is timed best-of `--repeat` over the whole corpus. A stage whose
+dependencies are missing (no spaCy model, no EasyOCR, ...) is recorded as
+skipped with the reason rather than failing the suite. With `--baseline`
+the exit status is 1 when any result is slower than baseline × (1 + tolerance).
+Baselines are machine-specific: save one per machine/CI runner.
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from benchmarks import SRC_DIR
+from benchmarks.corpus import PROFILES, generate_corpus
+
+REPO_DIR = os.path.dirname(SRC_DIR)
+
+
+def best_of(fn: Callable[[], int], repeat: int) -> Dict:
+    """Run fn (which returns an item count) `repeat` times; keep the fastest."""
+    best, items = None, 0
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        items = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return {"seconds": round(best, 4), "items": items, "per_s": round(items / best, 1) if best else None}
+
+
+def _skipped(e: BaseException) -> Dict:
+    return {"skipped": f"{type(e).__name__}: {e}"}
+
+
+def _fake_tags(chunks: List[str], file_name: str) -> List[Dict]:
+    """Tagged-chunk dicts for exporter/PDF benchmarks when no spaCy model is installed."""
+    return [
+        {
+            "chunk_id": i, "file_name": file_name, "content": chunk, "word_count": len(chunk.split()),
+            "keywords": chunk.split()[:5], "policy_keywords": ["policy"], "entities": [["Acme Corp", "ORG"]],
+            "intents": ["rule"], "chunk_position": i / max(1, len(chunks) - 1),
+        }
+        for i, chunk in enumerate(chunks)
+    ]
+
+
+def bench_stages(paths: List[str], repeat: int, pdf_files: int, config_path: str) -> Dict[str, Dict]:
+    from docs_pipeline.docx_stream import DocxStreamReader
+    from docs_pipeline.cleaning import TextCleaner
+    from docs_pipeline.chunking import TextChunker
+    from docs_pipeline.llm_export import EXPORTERS, ChunkExporter
+
+    results: Dict[str, Dict] = {}
+    blocks = {p: list(DocxStreamReader(p).iter_blocks()) for p in paths}
+
+    # ---- ingestion (both modes, no OCR) ----
+    try:
+        from docs_pipeline.ingestion import WordDocumentIngester
+        for mode in WordDocumentIngester.MODES:
+            ingester = WordDocumentIngester(mode=mode)
+            results[f"ingest.{mode}"] = best_of(
+                lambda: sum(sum(1 for _ in ingester.iter_text(p)) for p in paths), repeat
+            )
+    except Exception as e:
+        results["ingest.fast"] = results["ingest.docx"] = _skipped(e)
+
+    # ---- image triage (the OCR front end; OCR itself needs EasyOCR) ----
+    from docs_pipeline.image_triage import ImageTriage
+    triage = ImageTriage()
+    images = [blob for p in paths for blob in _image_blobs(p)]
+    results["triage"] = best_of(lambda: len([triage.prepare(blob) for blob in images]), repeat)
+
+    # ---- cleaning / chunking ----
+    cleaner = TextCleaner()
+    chunker = TextChunker()
+    cleaned = {p: list(cleaner.clean_stream(b)) for p, b in blocks.items()}
+    results["clean"] = best_of(lambda: sum(sum(1 for _ in cleaner.clean_stream(b)) for b in blocks.values()), repeat)
+    results["chunk"] = best_of(lambda: sum(sum(1 for _ in chunker.chunk_stream(c)) for c in cleaned.values()), repeat)
+    chunks = {p: list(chunker.chunk_stream(c)) for p, c in cleaned.items()}
+
+    # ---- tagging ----
+    tagged: Dict[str, List[Dict]] = {}
+    try:
+        from docs_pipeline.tagging import TextTagger
+        tagger = TextTagger(config_path=config_path)
+        results["tag"] = best_of(
+            lambda: sum(len(tagger.tag_chunks(c, os.path.basename(p))) for p, c in chunks.items()), repeat
+        )
+        tagged = {p: tagger.tag_chunks(c, os.path.basename(p)) for p, c in chunks.items()}
+    except Exception as e:
+        results["tag"] = _skipped(e)
+        tagged = {p: _fake_tags(c, os.path.basename(p)) for p, c in chunks.items()}
+
+    # ---- exporters / PDF ----
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt, (_, ext) in EXPORTERS.items():
+            def run_export(fmt=fmt, ext=ext) -> int:
+                n = 0
+                for p, records in tagged.items():
+                    out = os.path.join(tmp, fmt, os.path.basename(p) + "." + ext)
+                    with ChunkExporter(fmt, out, os.path.basename(p)) as exporter:
+                        for chunk in records:
+                            exporter.write(chunk)
+                    n += exporter.count
+                return n
+            results[f"export.{fmt}"] = best_of(run_export, repeat)
+
+        # pdf: the pipeline's canvas renderer; pdf.platypus: the JSON-reloading PDFConverter
+        try:
+            from docs_pipeline.pdf_conversion import PDFConverter, render_chunks
+            converter = PDFConverter()
+            sample = list(tagged.items())[:pdf_files]
+            json_files = []
+            for p, records in sample:
+                json_file = os.path.join(tmp, os.path.basename(p) + ".json")
+                with open(json_file, "w", encoding="utf-8") as f:
+                    json.dump(records, f, indent=4, ensure_ascii=False)
+                json_files.append(json_file)
+
+            def run_pdf() -> int:
+                for (p, records), json_file in zip(sample, json_files):
+                    render_chunks(records, json_file[:-5] + ".pdf", f"JSON Output: {os.path.basename(json_file)}")
+                return len(sample)
+
+            def run_platypus() -> int:
+                for json_file in json_files:
+                    converter.convert(json_file, json_file[:-5] + ".platypus.pdf")
+                return len(json_files)
+            results["pdf"] = best_of(run_pdf, repeat)
+            results["pdf.platypus"] = best_of(run_platypus, repeat)
+        except Exception as e:
+            results["pdf"] = results["pdf.platypus"] = _skipped(e)
+    return results
+
+
+def _image_blobs(path: str) -> List[bytes]:
+    from docs_pipeline.docx_stream import DocxStreamReader
+    reader = DocxStreamReader(path)
+    for _ in reader.iter_blocks():
+        pass
+    return list(reader.iter_image_blobs())
+
+
+def bench_end_to_end(corpus_dir: str, workers: List[int], export_format: str, timeout: int) -> Dict[str, Dict]:
+    """Run `docs run` once per worker count (with --force) and time it."""
+    results: Dict[str, Dict] = {}
+    n_files = len([f for f in os.listdir(corpus_dir) if f.endswith(".docx")])
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SRC_DIR, os.environ.get("PYTHONPATH")])))
+    for n in workers:
+        with tempfile.TemporaryDirectory() as out:
+            cmd = [
+                sys.executable, "-m", "docs_pipeline", "run",
+                "--input_dir", corpus_dir, "--output_dir", out,
+                "--workers", str(n), "--export-format", export_format, "--force",
+            ]
+            start = time.perf_counter()
+            try:
+                proc = subprocess.run(
+                    cmd, cwd=REPO_DIR, env=env, capture_output=True, text=True, timeout=timeout
+                )
+            except subprocess.TimeoutExpired as e:
+                results[f"e2e.workers={n}"] = _skipped(e)
+                continue
+            elapsed = time.perf_counter() - start
+            report_path = os.path.join(out, "run_report.json")
+            if proc.returncode != 0 or not os.path.exists(report_path):
+                tail = (proc.stderr or proc.stdout).strip().splitlines()[-1:] or ["no output"]
+                results[f"e2e.workers={n}"] = {"skipped": f"pipeline exited {proc.returncode}: {tail[0]}"}
+                continue
+            with open(report_path, encoding="utf-8") as f:
+                report = json.load(f)
+            results[f"e2e.workers={n}"] = {
+                "seconds": round(elapsed, 3), "items": n_files, "per_s": round(n_files / elapsed, 2),
+                "stages": {k: v["wall_s"]["total"] for k, v in report.get("stages", {}).items()},
+            }
+    return results
+
+
+def check_regressions(
+    results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float, noise_floor: float = 0.01
+) -> List[str]:
+    """
+    Names (with numbers) of results slower than baseline × (1 + tolerance).
+    `noise_floor` seconds of slack keep millisecond-scale stages from flapping.
+    """
+    regressions = []
+    for name, base in baseline.items():
+        cur = results.get(name)
+        if not cur or "seconds" not in cur or "seconds" not in base:
+            continue
+        limit = max(base["seconds"] * (1 + tolerance), base["seconds"] + noise_floor)
+        if cur["seconds"] > limit:
+            regressions.append(
+                f"{name}: {cur['seconds']:.3f}s vs baseline {base['seconds']:.3f}s (limit {limit:.3f}s)"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark suite")
+    parser.add_argument("--profile", choices=list(PROFILES), default="small")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--corpus", help="Use (or create) the synthetic corpus in this directory")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of runs per stage")
+    parser.add_argument("--pdf_files", type=int, default=3, help="Documents rendered by the PDF benchmark")
+    parser.add_argument("--workers", type=int, nargs="*", default=[1, 2, 4], help="End-to-end worker counts")
+    parser.add_argument("--export-format", dest="export_format", default="bedrock")
+    parser.add_argument("--e2e_timeout", type=int, default=3600)
+    parser.add_argument("--no_e2e", action="store_true", help="Stage benchmarks only")
+    parser.add_argument("--config", default=os.path.join(REPO_DIR, "config.yaml"))
+    parser.add_argument("--out", default="bench_results.json", help="Results JSON")
+    parser.add_argument("--baseline", help="Fail if any result regresses past this stored baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown vs. baseline (0.25 = 25%%)")
+    parser.add_argument("--noise_floor", type=float, default=0.01, help="Seconds of slack on top of the tolerance")
+    parser.add_argument("--save_baseline", help="Write this run's results as the new baseline")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_dir = args.corpus or os.path.join(tmp, "corpus")
+        paths = sorted(
+            os.path.join(corpus_dir, f) for f in os.listdir(corpus_dir) if f.endswith(".docx")
+        ) if os.path.isdir(corpus_dir) else []
+        if not paths:
+            paths = generate_corpus(corpus_dir, args.profile, args.seed)
+        print(f"Corpus: {len(paths)} documents in {corpus_dir}")
+
+        results = bench_stages(paths, args.repeat, args.pdf_files, args.config)
+        if not args.no_e2e:
+            results.update(bench_end_to_end(corpus_dir, args.workers, args.export_format, args.e2e_timeout))
+
+    for name, r in results.items():
+        if "skipped" in r:
+            print(f"  {name:<24} skipped ({r['skipped']})")
+        else:
+            print(f"  {name:<24} {r['seconds']:9.3f}s  {r['items']:>8} items  {r['per_s'] or 0:>10.1f}/s")
+
+    payload = {
+        "meta": {
+            "profile": args.profile, "seed": args.seed, "documents": len(paths), "repeat": args.repeat,
+            "python": platform.python_version(), "platform": platform.platform(),
+            "cpu_count": os.cpu_count(), "timestamp": datetime.utcnow().isoformat() + "Z",
+        },
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+    print(f"Results: {args.out}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+        print(f"Baseline saved: {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["meta"].get("profile") != args.profile:
+            print(f"Baseline was recorded for profile {baseline['meta'].get('profile')!r}, not {args.profile!r}")
+            return 2
+        regressions = check_regressions(results, baseline["results"], args.tolerance, args.noise_floor)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} of {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,9 +15,9 @@ source venv/bin/activate
 # Set SSL certificate file for secure connections
 export SSL_CERT_FILE=$(python -m certifi)
 
-# Check if src/pipeline.py exists
-if [ ! -f "src/pipeline.py" ]; then
-    echo "Error: src/pipeline.py not found. Ensure the project structure is correct."
+# Check if src/docs_pipeline/pipeline.py exists
+if [ ! -f "src/docs_pipeline/pipeline.py" ]; then
+    echo "Error: src/docs_pipeline/pipeline.py not found. Ensure the project structure is correct."
     exit 1
 fi
 
@@ -52,8 +52,8 @@ fi
 
 # Run the pipeline
 echo "Running pipeline with input: $INPUT_DIR and output: $OUTPUT_DIR"
-python src/pipeline.py --input_dir "$INPUT_DIR" --output_dir "$OUTPUT_DIR" || {
-    echo "Error: Pipeline execution failed. Check src/pipeline.py or input files."
+PYTHONPATH=src python -m docs_pipeline run --input_dir "$INPUT_DIR" --output_dir "$OUTPUT_DIR" || {
+    echo "Error: Pipeline execution failed. Check src/docs_pipeline/pipeline.py or input files."
     exit 1
 }
 
@@ -9,5 +9,11 @@ setup(
     install_requires=[
         'python-docx>=1.1.2',
         'nltk>=3.8.1',
+        'PyYAML',
     ],
+    entry_points={
+        'console_scripts': [
+            'docs=docs_pipeline.cli:main',  # docs run --input_dir ... (see src/docs_pipeline/cli.py)
+        ],
+    },
 )
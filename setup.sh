@@ -13,6 +13,7 @@ source venv/bin/activate
 python -m pip install --upgrade pip --trusted-host pypi.org --trusted-host files.pythonhosted.org
 
 pip install -r requirements.txt --trusted-host pypi.org --trusted-host files.pythonhosted.org --quiet
+pip install -e . --quiet  # the docs_pipeline package and its `docs` command
 
 export SSL_CERT_FILE=$(python -m certifi)
 
@@ -23,4 +24,4 @@ python -m spacy download en_core_web_lg
 echo "Setup complete. Run:"
 echo "source venv/bin/activate"
 echo "export SSL_CERT_FILE=$(python -m certifi)"
-echo "python src/pipeline.py --input_dir examples/ --output_dir output/ [--ocr_images] [--to_pdf]"
+echo "docs run --input_dir examples/ --output_dir output/ [--ocr_images] [--to_pdf]"
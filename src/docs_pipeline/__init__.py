@@ -0,0 +1,3 @@
+# src/docs_pipeline/__init__.py
+# Deliberately empty: `docs --help` and each command import only the
+# modules they need (see cli.py).
@@ -0,0 +1,7 @@
+# src/docs_pipeline/__main__.py
+# `python -m docs_pipeline <command>`, the same as the `docs` console script.
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -1,4 +1,4 @@
-# src/bedrock_export.py
+# src/docs_pipeline/bedrock_export.py
 import json
 import os
 from typing import List, Dict
@@ -25,7 +25,7 @@ def export_to_bedrock_jsonl(
                     "keywords": chunk["keywords"],
                     "policy_keywords": chunk["policy_keywords"],
                     "intents": chunk["intents"],
-                    "entities": chunk["entities"],
+                    "entities": chunk.get("entities", []),
                     "ingestion_timestamp": datetime.utcnow().isoformat() + "Z"
                 }
             }
@@ -0,0 +1,54 @@
+# src/docs_pipeline/chunking.py
+from typing import Iterable, Iterator, List
+
+class TextChunker:
+    """Handles chunking with overlap. Configurable sizes."""
+    
+    def __init__(self, chunk_size: int = 500, overlap: int = 100):
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+    
+    def chunk(self, text: str) -> List[str]:
+        """Split text into chunks with overlap."""
+        words = text.split()
+        chunks = []
+        start = 0
+        while start < len(words):
+            end = min(start + self.chunk_size, len(words))
+            chunk = ' '.join(words[start:end])
+            chunks.append(chunk)
+            start += self.chunk_size - self.overlap
+            if start >= end:
+                break
+        return chunks
+
+    def count_chunks(self, n_words: int) -> int:
+        """Number of chunks chunk() returns for a text of n_words words."""
+        if n_words <= 0:
+            return 0
+        step = self.chunk_size - self.overlap
+        if step >= self.chunk_size:  # no overlap: chunk() stops after the first chunk
+            return 1
+        return -(-n_words // step)
+
+    def chunk_stream(self, blocks: Iterable[str]) -> Iterator[str]:
+        """
+        Incremental chunk(): consumes text blocks (paragraphs) and yields the
+        same chunks chunk() would for the whole text, holding at most one
+        chunk plus one block of words in memory.
+        """
+        step = self.chunk_size - self.overlap
+        if step <= 0:
+            raise ValueError("overlap must be smaller than chunk_size")
+        buf: List[str] = []
+        for block in blocks:
+            buf.extend(block.split())
+            while len(buf) >= self.chunk_size:
+                yield ' '.join(buf[:self.chunk_size])
+                if step >= self.chunk_size:
+                    return
+                del buf[:step]
+        # Tail: chunks that end at the last word
+        while buf:
+            yield ' '.join(buf)
+            del buf[:step]
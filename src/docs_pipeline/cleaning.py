@@ -1,6 +1,7 @@
-# src/cleaning.py
+# src/docs_pipeline/cleaning.py
 import re
 import string
+from typing import Iterable, Iterator
 
 class TextCleaner:
     """Handles text cleaning. Extensible for custom cleaning rules."""
@@ -15,3 +16,14 @@ class TextCleaner:
         # text = text.lower()
         # Add more rules here in the future (e.g., remove headers/footers via regex)
         return text.strip()
+
+    def clean_stream(self, blocks: Iterable[str]) -> Iterator[str]:
+        """
+        Clean text block by block (e.g. paragraphs from the ingester).
+        Joining the output with spaces gives the same result as clean()
+        on the newline-joined input; empty blocks are dropped.
+        """
+        for block in blocks:
+            block = self.clean(block)
+            if block:
+                yield block
@@ -0,0 +1,48 @@
+# src/docs_pipeline/cli.py
+import sys
+import importlib
+from typing import Dict, List, Optional, Tuple
+
+# ----------------------------------------------------------------------
+# `docs` console script (setup.py entry point)
+# ----------------------------------------------------------------------
+# Each subcommand lives in its own module with a `main(argv, prog)` (or
+# "module:function" for modules serving several commands); only the
+# chosen module is imported, so `docs --help` loads nothing but this
+# file and every command pays just for its own dependencies.
+
+# name -> (module[:function], one-line description)
+COMMANDS: Dict[str, Tuple[str, str]] = {
+    "run": ("pipeline", "Process .docx files into tagged chunks and LLM exports"),
+    "merge": ("sharding", "Combine the outputs of `run --shard K/N` into the final corpora"),
+    "vectors": ("vectors", "Nearest chunks to a text or chunk, over the vectors of a `run --vectors`"),
+    "index": ("search_index:index_main", "Build a BM25 index over a run's combined corpus"),
+    "search": ("search_index:search_main", "BM25 search of a corpus indexed with `docs index`"),
+}
+
+
+def usage() -> str:
+    width = max(map(len, COMMANDS))
+    lines = [f"  {name:<{width}}  {help_}" for name, (_, help_) in COMMANDS.items()]
+    return (
+        "usage: docs <command> [options]\n\ncommands:\n" + "\n".join(lines)
+        + "\n\nRun `docs <command> --help` for a command's options."
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return 0 if argv else 2
+    command, rest = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"docs: unknown command {command!r}\n\n{usage()}", file=sys.stderr)
+        return 2
+    module_name, _, function = COMMANDS[command][0].partition(":")
+    module = importlib.import_module(f".{module_name}", __package__)
+    return getattr(module, function or "main")(rest, prog=f"docs {command}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+# src/docs_pipeline/columnar.py
+import os
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# ----------------------------------------------------------------------
+# Columnar chunk table — chunks.parquet / chunks.arrow (`--columnar`)
+# ----------------------------------------------------------------------
+# Every tagged chunk also becomes a row of one typed table, so analytics
+# (keyword and intent distributions, per-file counts) read the two or
+# three columns they need instead of parsing every JSON record:
+#
+#   content, file_name                        string
+#   chunk_id, word_count                      int32
+#   chunk_position                            float32
+#   keywords, policy_keywords, intents        list<string>
+#   entities                                  list<struct<text, label>>
+#                                             (null without NER, as with
+#                                             the fast tagging profile)
+#
+# Row i is record i of every combined {format}_corpus, as in vectors.npy.
+# Each worker converts its file's chunks BATCH at a time and writes its
+# table (columnar/<key>.parquet, or a part file without per-file outputs).
+# The parent copies that into the combined file and writes a row group
+# whenever ROW_GROUP rows have collected, so memory stays bounded by one
+# row group. Parquet files are zstd-compressed, and the
+# low-cardinality columns are dictionary-encoded. Arrow IPC files allow only
+# one dictionary per column for the whole file, so `.arrow` output is
+# compressed but not dictionary-encoded. Both formats let a reader
+# decompress only the columns it asks for.
+#
+# pyarrow (>= 13) is optional and only imported when a table is built or
+# read.
+
+FORMATS = {"parquet": "chunks.parquet", "arrow": "chunks.arrow"}
+ROW_GROUP = 65536
+BATCH = 1024  # chunks a worker converts to Arrow at a time
+COMPRESSION = "zstd"
+# Parquet leaf columns that repeat a few values (use_dictionary wants leaf paths)
+DICTIONARY_COLUMNS = [
+    "file_name",
+    "keywords.list.element",
+    "policy_keywords.list.element",
+    "intents.list.element",
+    "entities.list.element.text",
+    "entities.list.element.label",
+]
+
+
+def require_pyarrow():
+    """The pyarrow module, or an ImportError saying how to get it."""
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        raise ImportError("--columnar needs pyarrow (pip install pyarrow)") from None
+    return pyarrow
+
+
+def schema():
+    pa = require_pyarrow()
+    strings = pa.list_(pa.string())
+    return pa.schema([
+        ("content", pa.string()),
+        ("chunk_id", pa.int32()),
+        ("file_name", pa.string()),
+        ("chunk_position", pa.float32()),
+        ("word_count", pa.int32()),
+        ("keywords", strings),
+        ("policy_keywords", strings),
+        ("intents", strings),
+        ("entities", pa.list_(pa.struct([("text", pa.string()), ("label", pa.string())]))),
+    ])
+
+
+def extension(path: str) -> str:
+    """'parquet' or 'arrow', from a file name."""
+    ext = os.path.splitext(path)[1].lstrip(".")
+    if ext not in FORMATS:
+        raise ValueError(f"{path}: not a .parquet or .arrow file")
+    return ext
+
+
+def chunk_table(chunks: Iterable[Dict]):
+    """A pyarrow Table of tagged chunks, one row each, in the schema above."""
+    pa = require_pyarrow()
+    columns: Dict[str, List] = {name: [] for name in schema().names}
+    for chunk in chunks:
+        columns["content"].append(chunk["content"])
+        columns["chunk_id"].append(chunk["chunk_id"])
+        columns["file_name"].append(chunk["file_name"])
+        columns["chunk_position"].append(chunk["chunk_position"])
+        columns["word_count"].append(chunk["word_count"])
+        columns["keywords"].append(chunk.get("keywords") or [])
+        columns["policy_keywords"].append(chunk.get("policy_keywords") or [])
+        columns["intents"].append(chunk.get("intents") or [])
+        entities = chunk.get("entities")
+        columns["entities"].append(
+            None if entities is None else [{"text": e[0], "label": e[1]} for e in entities]
+        )
+    return pa.Table.from_pydict(columns, schema=schema())
+
+
+def read_table(path: str, columns: Optional[List[str]] = None):
+    """A chunks.parquet / chunks.arrow (or per-file table), only `columns` if given."""
+    pa = require_pyarrow()
+    if extension(path) == "parquet":
+        return pa.parquet.read_table(path, columns=columns)
+    names = schema().names
+    options = pa.ipc.IpcReadOptions(included_fields=[names.index(c) for c in columns] if columns else None)
+    with pa.memory_map(path) as source:
+        table = pa.ipc.open_file(source, options=options).read_all()
+    return table.select(columns) if columns else table  # in the order asked
+
+
+def iter_batches(path: str) -> Iterator:
+    """Record batches of a table file, one row group (or IPC batch) at a time."""
+    pa = require_pyarrow()
+    if extension(path) == "parquet":
+        parquet = pa.parquet.ParquetFile(path)
+        for i in range(parquet.num_row_groups):
+            yield from parquet.read_row_group(i).combine_chunks().to_batches()
+        return
+    with pa.memory_map(path) as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            yield reader.get_batch(i)
+
+
+class ColumnarWriter:
+    """
+    Stream tables into one .parquet or .arrow file (by the extension of
+    `path`), in row groups of `row_group` rows. Written to `.tmp` and
+    renamed on close(), like the other combined outputs.
+    """
+
+    def __init__(self, path: str, row_group: int = ROW_GROUP):
+        pa = require_pyarrow()
+        self._pa = pa
+        self.path = path
+        self.format = extension(path)
+        self.row_group = row_group
+        self.rows = 0
+        self._pending: List = []
+        self._pending_rows = 0
+        self._tmp = path + ".tmp"
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if self.format == "parquet":
+            self._writer = pa.parquet.ParquetWriter(
+                self._tmp, schema(), compression=COMPRESSION, use_dictionary=DICTIONARY_COLUMNS,
+            )
+        else:
+            options = pa.ipc.IpcWriteOptions(compression=COMPRESSION)
+            self._writer = pa.ipc.new_file(self._tmp, schema(), options=options)
+
+    def append(self, table) -> None:
+        """Append a Table or RecordBatch of the chunk schema."""
+        if isinstance(table, self._pa.RecordBatch):
+            table = self._pa.Table.from_batches([table])
+        if not table.num_rows:
+            return
+        self._pending.append(table)
+        self._pending_rows += table.num_rows
+        self.rows += table.num_rows
+        while self._pending_rows >= self.row_group:
+            self._write(self.row_group)
+
+    def copy(self, path: str) -> int:
+        """Append every row of the table file at `path`; returns the row count."""
+        rows = 0
+        for batch in iter_batches(path):
+            self.append(batch)
+            rows += batch.num_rows
+        return rows
+
+    def _write(self, limit: Optional[int] = None) -> None:
+        table = self._pa.concat_tables(self._pending)
+        limit = table.num_rows if limit is None else limit
+        group, rest = table.slice(0, limit).combine_chunks(), table.slice(limit)
+        if self.format == "parquet":
+            self._writer.write_table(group, row_group_size=limit)
+        else:
+            self._writer.write_table(group, max_chunksize=limit)
+        self._pending = [rest] if rest.num_rows else []
+        self._pending_rows = rest.num_rows
+
+    def close(self) -> str:
+        if self._pending_rows:
+            self._write()
+        self._writer.close()
+        os.replace(self._tmp, self.path)
+        return self.path
+
+    def abort(self) -> None:
+        self._writer.close()
+        if os.path.exists(self._tmp):
+            os.remove(self._tmp)
+
+    def __enter__(self) -> "ColumnarWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
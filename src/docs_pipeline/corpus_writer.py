@@ -0,0 +1,128 @@
+# src/docs_pipeline/corpus_writer.py
+import os
+import json
+import logging
+from typing import Dict, List, Optional
+
+
+class ShardedCorpusWriter:
+    """
+    Streaming writer for {format}_corpus.jsonl.
+
+    Records are appended as worker results arrive. Without caps the corpus is
+    a single `{format}_corpus.jsonl`, as before. With `max_records` and/or
+    `max_bytes` it rolls over into `{format}_corpus-00000.jsonl`, ... so each
+    shard stays under the Knowledge Base per-file limits. Shards are written
+    to `.tmp` files and renamed into place only when complete, and
+    `{format}_corpus.index.json` lists every shard with its record and byte
+    counts.
+    """
+
+    def __init__(self, output_dir: str, export_format: str, max_records: int = 0, max_bytes: int = 0):
+        self.output_dir = output_dir
+        self.export_format = export_format
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.sharded = bool(max_records or max_bytes)
+        self.index_path = os.path.join(output_dir, f"{export_format}_corpus.index.json")
+        self.shards: List[Dict] = []
+        self.total_records = 0
+        self._f = None
+        self._tmp: Optional[str] = None
+        self._records = 0
+        self._bytes = 0
+        os.makedirs(output_dir, exist_ok=True)
+
+    def _shard_name(self, n: int) -> str:
+        if not self.sharded:
+            return f"{self.export_format}_corpus.jsonl"
+        return f"{self.export_format}_corpus-{n:05d}.jsonl"
+
+    def _open_shard(self) -> None:
+        name = self._shard_name(len(self.shards))
+        self._tmp = os.path.join(self.output_dir, name + ".tmp")
+        self._f = open(self._tmp, "w", encoding="utf-8")
+        self._records = 0
+        self._bytes = 0
+
+    def _close_shard(self) -> None:
+        if self._f is None:
+            return
+        self._f.close()
+        name = self._shard_name(len(self.shards))
+        os.replace(self._tmp, os.path.join(self.output_dir, name))
+        self.shards.append({"file": name, "records": self._records, "bytes": self._bytes})
+        self._f = None
+
+    def write_line(self, line: str) -> None:
+        """Append one JSONL record (with or without its trailing newline)."""
+        if not line.endswith("\n"):
+            line += "\n"
+        size = len(line.encode("utf-8"))
+        if self._f is not None and self._records and (
+            (self.max_records and self._records >= self.max_records)
+            or (self.max_bytes and self._bytes + size > self.max_bytes)
+        ):
+            self._close_shard()
+        if self._f is None:
+            self._open_shard()
+        self._f.write(line)
+        self._records += 1
+        self._bytes += size
+        self.total_records += 1
+
+    def close(self) -> List[str]:
+        """Finish the last shard, drop shards left from earlier runs, write the index."""
+        if self._f is None and not self.shards:
+            self._open_shard()  # an empty corpus is still a (empty) file
+        self._close_shard()
+        self._remove_stale_shards()
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "format": self.export_format,
+                    "records": self.total_records,
+                    "max_records": self.max_records,
+                    "max_bytes": self.max_bytes,
+                    "shards": self.shards,
+                },
+                f,
+                indent=2,
+            )
+        os.replace(tmp, self.index_path)
+        return [os.path.join(self.output_dir, s["file"]) for s in self.shards]
+
+    def _remove_stale_shards(self) -> None:
+        current = {s["file"] for s in self.shards}
+        prefix = f"{self.export_format}_corpus"
+        for name in os.listdir(self.output_dir):
+            if not name.startswith(prefix) or name in current:
+                continue
+            rest = name[len(prefix):]
+            if rest == ".jsonl" or (rest.startswith("-") and rest.endswith(".jsonl")):
+                try:
+                    os.remove(os.path.join(self.output_dir, name))
+                except OSError as e:
+                    logging.warning(f"Could not remove stale shard {name}: {e}")
+
+    def __enter__(self) -> "ShardedCorpusWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def corpus_files(output_dir: str, export_format: str) -> List[str]:
+    """The files of a combined corpus in record order: its shards per the index, or the single file."""
+    index_path = os.path.join(output_dir, f"{export_format}_corpus.index.json")
+    if os.path.exists(index_path):
+        with open(index_path, "r", encoding="utf-8") as f:
+            return [os.path.join(output_dir, s["file"]) for s in json.load(f)["shards"]]
+    return [os.path.join(output_dir, f"{export_format}_corpus.jsonl")]
+
+
+def corpus_formats(output_dir: str) -> List[str]:
+    """Formats with a combined corpus (an index file) in output_dir."""
+    suffix = "_corpus.index.json"
+    return sorted(name[:-len(suffix)] for name in os.listdir(output_dir) if name.endswith(suffix))
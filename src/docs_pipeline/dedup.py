@@ -0,0 +1,312 @@
+# src/docs_pipeline/dedup.py
+import os
+import json
+import time
+import zlib
+import shutil
+import hashlib
+import sqlite3
+import tempfile
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .corpus_writer import ShardedCorpusWriter
+from .keywords import tokenize
+from .llm_export import record_metadata, record_text
+
+# ----------------------------------------------------------------------
+# Near-duplicate chunks — MinHash signatures, LSH index on disk
+# ----------------------------------------------------------------------
+# Boilerplate (confidentiality clauses, definitions, sign-off blocks)
+# recurs across hundreds of documents and every copy would be embedded and
+# stored. After a run, the combined corpus (not the per-file outputs, which
+# keep their duplicates) is read twice:
+#
+#   1. every chunk gets a MinHash signature over its word 5-grams; an LSH
+#      index (signature bands -> buckets) proposes earlier chunks that may
+#      be similar, and a candidate whose estimated Jaccard similarity
+#      reaches the threshold makes this chunk its duplicate. Chunks with no
+#      such match become canonical and are added to the index.
+#   2. the corpus is rewritten without the duplicates ("drop"), or with
+#      each canonical chunk listing the sources of all its copies in its
+#      metadata ("collapse").
+#
+# The index, signatures and duplicate list live in a temporary SQLite file,
+# so memory stays flat however many chunks there are. The first occurrence
+# in corpus order is the one kept. Decisions are taken on the first export
+# format and applied to the others, whose corpora hold the same chunks in
+# the same order. So do the chunk-vector matrix of a `--vectors` run
+# (vectors.py) and the chunk table of a `--columnar` run (columnar.py),
+# which lose the same rows.
+
+MODES = ("drop", "collapse")
+NUM_PERM = 128
+SHINGLE = 5
+
+_SHINGLE_BASE = np.uint64(0x100000001B3)  # polynomial base combining token hashes into a shingle hash
+
+
+def lsh_params(threshold: float, num_perm: int = NUM_PERM) -> Tuple[int, int]:
+    """
+    (bands, rows) for the LSH index. Chunks with similarity s collide in at
+    least one band with probability 1 - (1 - s^rows)^bands, an S-curve
+    whose midpoint is about (1/bands)^(1/rows); the steepest curve with its
+    midpoint at or below the threshold keeps recall high, and candidates
+    are checked against the threshold afterwards.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if (1.0 / bands) ** (1.0 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+class MinHasher:
+    """
+    MinHash signatures (num_perm uint32 values) of a text's word shingles.
+    Each token is hashed once and the shingle hashes are combined from
+    them with NumPy; the permutations are multiply-add-shift hashes
+    ((a·x + b) mod 2^64) >> 32, which need no modulo.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, shingle: int = SHINGLE, seed: int = 1):
+        rng = np.random.RandomState(seed)  # fixed, so signatures are comparable across runs
+        self.a = rng.randint(0, 1 << 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self.b = rng.randint(0, 1 << 63, size=num_perm, dtype=np.uint64)
+        self.shingle = shingle
+        self._token_hashes: Dict[str, int] = {}
+
+    def shingles(self, text: str) -> np.ndarray:
+        """32-bit hashes of the word k-grams (the whole text if it is shorter)."""
+        tokens = tokenize(text)
+        memo = self._token_hashes
+        if len(memo) > 1_000_000:  # bound the memo on corpora with huge vocabularies
+            memo.clear()
+        for tok in set(tokens).difference(memo):
+            memo[tok] = zlib.crc32(tok.encode("utf-8"))
+        hashes = np.fromiter(map(memo.__getitem__, tokens), dtype=np.uint64, count=len(tokens))
+        if not len(hashes):
+            return np.zeros(1, dtype=np.uint64)
+        n = len(hashes) - min(self.shingle, len(hashes)) + 1
+        combined = hashes[:n].copy()
+        for j in range(1, min(self.shingle, len(hashes))):
+            combined = combined * _SHINGLE_BASE + hashes[j:j + n]  # wraps mod 2^64
+        return (combined ^ (combined >> np.uint64(32))) & np.uint64(0xFFFFFFFF)
+
+    def signature(self, text: str) -> np.ndarray:
+        permuted = (np.outer(self.shingles(text), self.a) + self.b) >> np.uint64(32)
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+def jaccard(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """Estimated Jaccard similarity: the share of equal signature values."""
+    return float(np.count_nonzero(sig_a == sig_b)) / len(sig_a)
+
+
+class LSHIndex:
+    """Canonical chunks' signatures and band buckets, in SQLite."""
+
+    COMMIT_EVERY = 10_000
+
+    def __init__(self, path: str, bands: int, rows: int):
+        self.bands, self.rows = bands, rows
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=OFF")  # scratch data, rebuilt on every run
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute("CREATE TABLE buckets (band INTEGER, bucket INTEGER, idx INTEGER)")
+        self._conn.execute("CREATE INDEX buckets_key ON buckets (band, bucket)")
+        self._conn.execute("CREATE TABLE signatures (idx INTEGER PRIMARY KEY, sig BLOB)")
+        self._conn.execute("CREATE TABLE duplicates (idx INTEGER PRIMARY KEY, canonical INTEGER, source TEXT)")
+        self._conn.execute("CREATE INDEX duplicates_canonical ON duplicates (canonical)")
+        self._pending = 0
+
+    def _buckets(self, sig: np.ndarray) -> Iterator[Tuple[int, int]]:
+        for band in range(self.bands):
+            part = sig[band * self.rows:(band + 1) * self.rows].tobytes()
+            yield band, int.from_bytes(hashlib.blake2b(part, digest_size=8).digest(), "big", signed=True)
+
+    def candidates(self, sig: np.ndarray) -> List[int]:
+        found: Set[int] = set()
+        for band, bucket in self._buckets(sig):
+            found.update(idx for (idx,) in self._conn.execute(
+                "SELECT idx FROM buckets WHERE band = ? AND bucket = ?", (band, bucket)
+            ))
+        return sorted(found)
+
+    def signature(self, idx: int) -> np.ndarray:
+        (blob,) = self._conn.execute("SELECT sig FROM signatures WHERE idx = ?", (idx,)).fetchone()
+        return np.frombuffer(blob, dtype=np.uint32)
+
+    def add(self, idx: int, sig: np.ndarray) -> None:
+        self._conn.execute("INSERT INTO signatures VALUES (?, ?)", (idx, sig.tobytes()))
+        self._conn.executemany("INSERT INTO buckets VALUES (?, ?, ?)", ((b, k, idx) for b, k in self._buckets(sig)))
+        self._tick()
+
+    def add_duplicate(self, idx: int, canonical: int, source: str) -> None:
+        self._conn.execute("INSERT INTO duplicates VALUES (?, ?, ?)", (idx, canonical, source))
+        self._tick()
+
+    def _tick(self) -> None:
+        self._pending += 1
+        if self._pending >= self.COMMIT_EVERY:
+            self.commit()
+
+    def commit(self) -> None:
+        self._conn.commit()
+        self._pending = 0
+
+    def duplicates(self) -> Iterator[Tuple[int, int]]:
+        """(idx, canonical) of every duplicate, in corpus order."""
+        return iter(self._conn.execute("SELECT idx, canonical FROM duplicates ORDER BY idx"))
+
+    def copies(self, canonical: int) -> Tuple[int, List[str]]:
+        """Number of duplicates of a canonical chunk and their distinct sources."""
+        rows = self._conn.execute("SELECT source FROM duplicates WHERE canonical = ?", (canonical,)).fetchall()
+        return len(rows), list(dict.fromkeys(source for (source,) in rows))
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def _lines(paths: Iterable[str]) -> Iterator[str]:
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield line
+
+
+def _source(metadata: Dict) -> str:
+    return str(metadata.get("source") or metadata.get("file_name") or "")
+
+
+def dedup_corpora(
+    corpora: Dict[str, List[str]],
+    output_dir: str,
+    mode: str = "drop",
+    threshold: float = 0.9,
+    max_records: int = 0,
+    max_bytes: int = 0,
+    vectors: Optional[str] = None,
+    columnar: Optional[str] = None,
+) -> Dict:
+    """
+    Rewrite each format's combined corpus (format -> its JSONL files, all
+    holding the same chunks in the same order) into output_dir without
+    near-duplicates, and the row-aligned `vectors` matrix (.npy) and
+    `columnar` table (.parquet / .arrow) with them.
+    Returns the numbers for the run report.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown dedup mode {mode!r}; expected one of {MODES}")
+    started = time.perf_counter()
+    formats = list(corpora)
+    bands, rows = lsh_params(threshold)
+    hasher = MinHasher()
+    work_dir = tempfile.mkdtemp(prefix=".dedup-", dir=output_dir)
+    index = LSHIndex(os.path.join(work_dir, "lsh.sqlite"), bands, rows)
+    try:
+        # ---- pass 1: signatures, LSH candidates, duplicate decisions ----
+        records = 0
+        first = formats[0] if formats else None
+        for idx, line in enumerate(_lines(corpora.get(first, []))):
+            record = json.loads(line)
+            sig = hasher.signature(record_text(record, first))
+            canonical = next((c for c in index.candidates(sig) if jaccard(sig, index.signature(c)) >= threshold), None)
+            if canonical is None:
+                index.add(idx, sig)
+            else:
+                index.add_duplicate(idx, canonical, _source(record_metadata(record, first)))
+            records = idx + 1
+        index.commit()
+
+        # ---- pass 2: rewrite every format's corpus ----
+        report = {"mode": mode, "threshold": threshold, "bands": bands, "rows": rows,
+                  "records_in": records, "records_out": 0, "duplicates": 0, "formats": {}}
+        for fmt in formats:
+            bytes_in = bytes_out = seen = 0
+            duplicates = index.duplicates()
+            next_dup = next(duplicates, None)
+            with ShardedCorpusWriter(output_dir, fmt, max_records=max_records, max_bytes=max_bytes) as writer:
+                for idx, line in enumerate(_lines(corpora[fmt])):
+                    seen = idx + 1
+                    bytes_in += len(line.encode("utf-8"))
+                    if next_dup is not None and next_dup[0] == idx:
+                        next_dup = next(duplicates, None)
+                        continue
+                    if mode == "collapse":
+                        count, sources = index.copies(idx)
+                        if count:
+                            record = json.loads(line)
+                            metadata = record_metadata(record, fmt)
+                            metadata["sources"] = list(dict.fromkeys([_source(metadata), *sources]))
+                            metadata["duplicate_count"] = count
+                            line = json.dumps(record, ensure_ascii=False) + "\n"
+                    bytes_out += len(line.encode("utf-8"))
+                    writer.write_line(line)
+            if seen != records:
+                raise ValueError(f"{fmt} corpus has {seen} records, {first} has {records}; cannot share dedup decisions")
+            report["records_out"] = writer.total_records
+            report["formats"][fmt] = {
+                "bytes_in": bytes_in, "bytes_out": bytes_out,
+                "shards": [os.path.join(output_dir, s["file"]) for s in writer.shards],
+            }
+        if vectors:
+            report["vectors"] = _dedup_vectors(vectors, output_dir, index, records)
+        if columnar:
+            report["columnar"] = _dedup_columnar(columnar, output_dir, index, records)
+        report["duplicates"] = records - report["records_out"] if formats else 0
+        report["reduction"] = round(report["duplicates"] / records, 4) if records else 0.0
+        report["seconds"] = round(time.perf_counter() - started, 3)
+        return report
+    finally:
+        index.close()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _dedup_vectors(path: str, output_dir: str, index: LSHIndex, records: int) -> int:
+    """Copy the matrix at `path` to output_dir without the duplicates' rows; returns the rows kept."""
+    from .vectors import MATRIX, NpyWriter, load_matrix
+    matrix = load_matrix(path)
+    if len(matrix) != records:
+        raise ValueError(f"{path} has {len(matrix)} rows for {records} records; cannot share dedup decisions")
+    with NpyWriter(os.path.join(output_dir, MATRIX), matrix.dtype.name, matrix.shape[1]) as writer:
+        start = 0
+        for idx, _ in index.duplicates():
+            writer.append(matrix[start:idx])
+            start = idx + 1
+        writer.append(matrix[start:])
+    return writer.rows
+
+
+def _dedup_columnar(path: str, output_dir: str, index: LSHIndex, records: int) -> int:
+    """Copy the chunk table at `path` to output_dir without the duplicates' rows; returns the rows kept."""
+    from .columnar import ColumnarWriter, iter_batches
+    duplicates = (idx for idx, _ in index.duplicates())  # in row order, streamed from SQLite
+    next_dup = next(duplicates, None)
+    start = 0
+    with ColumnarWriter(os.path.join(output_dir, os.path.basename(path))) as writer:
+        for batch in iter_batches(path):
+            end = start + batch.num_rows
+            keep = np.ones(batch.num_rows, dtype=bool)
+            while next_dup is not None and next_dup < end:
+                keep[next_dup - start] = False
+                next_dup = next(duplicates, None)
+            writer.append(batch if keep.all() else batch.filter(keep))
+            start = end
+        if start != records:
+            raise ValueError(f"{path} has {start} rows for {records} records; cannot share dedup decisions")
+    return writer.rows
+
+
+def format_dedup(report: Dict) -> str:
+    """One line for the console."""
+    sizes = next(iter(report["formats"].values()), {"bytes_in": 0, "bytes_out": 0})
+    mb_in, mb_out = sizes["bytes_in"] / 1e6, sizes["bytes_out"] / 1e6
+    return (
+        f"Dedup ({report['mode']}, Jaccard >= {report['threshold']:g}): {report['records_in']} -> "
+        f"{report['records_out']} records (-{report['reduction']:.1%}), {mb_in:.1f} MB -> {mb_out:.1f} MB, "
+        f"{report['seconds']:.1f}s"
+    )
@@ -0,0 +1,181 @@
+# src/docs_pipeline/docx_stream.py
+import re
+import zipfile
+import posixpath
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterator, List, Optional
+
+# ----------------------------------------------------------------------
+# Streaming .docx reader — no python-docx object model
+# ----------------------------------------------------------------------
+# word/document.xml is parsed incrementally with iterparse; each finished
+# top-level paragraph or table is emitted and its elements are freed, so
+# memory stays flat regardless of document length.
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+R = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+BODY, P, TBL, TR, TC = W + "body", W + "p", W + "tbl", W + "tr", W + "tc"
+RUN, TEXT, TAB, BR, CR = W + "r", W + "t", W + "tab", W + "br", W + "cr"
+BLIP = A + "blip"
+# Run containers whose runs belong to the paragraph text (as in python-docx)
+RUN_CONTAINERS = {W + "hyperlink", W + "ins", W + "smartTag", W + "fldSimple"}
+
+DOCUMENT_PART = "word/document.xml"
+HEADER_RE = re.compile(r"^word/header\d*\.xml$")
+FOOTER_RE = re.compile(r"^word/footer\d*\.xml$")
+
+
+def _run_text(run) -> str:
+    parts = []
+    for child in run:
+        if child.tag == TEXT:
+            parts.append(child.text or "")
+        elif child.tag == TAB:
+            parts.append("\t")
+        elif child.tag in (BR, CR):
+            parts.append("\n")
+    return "".join(parts)
+
+
+def _paragraph_text(p) -> str:
+    parts = []
+    for child in p:
+        if child.tag == RUN:
+            parts.append(_run_text(child))
+        elif child.tag in RUN_CONTAINERS:
+            parts.extend(_run_text(run) for run in child.iter(RUN))
+    return "".join(parts)
+
+
+def _iter_part(stream, blips: Optional[List[str]] = None) -> Iterator[str]:
+    """
+    Yield paragraph texts and table rows ("cell | cell") of one XML part in
+    document order. Image relationship ids (a:blip r:embed) are appended to
+    `blips` when given.
+    """
+    depth = 0
+    container = None      # body / hdr / ftr element, cleared as we go
+    top_depth = 0         # depth at which a direct child of the container ends
+    tbl_depth = 0
+    row: List[str] = []
+    cell: List[str] = []
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            depth += 1
+            if container is None and tag in (BODY, W + "hdr", W + "ftr"):
+                container = elem
+                top_depth = depth
+            elif tag == TBL:
+                tbl_depth += 1
+            elif tag == TR and tbl_depth == 1:
+                row = []
+            elif tag == TC and tbl_depth == 1:
+                cell = []
+            continue
+
+        depth -= 1
+        if tag == P:
+            text = _paragraph_text(elem)
+            if text.strip():
+                if tbl_depth:
+                    cell.append(text.strip())
+                else:
+                    yield text
+            if blips is not None:
+                blips.extend(b.get(R + "embed") for b in elem.iter(BLIP) if b.get(R + "embed"))
+            elem.clear()
+        elif tag == TC and tbl_depth == 1:
+            row.append(" ".join(cell))
+        elif tag == TR and tbl_depth == 1:
+            if any(row):
+                yield " | ".join(row)
+        elif tag == TBL:
+            tbl_depth -= 1
+
+        # A top-level block is complete — drop everything parsed so far
+        if container is not None and depth == top_depth and elem is not container:
+            container.clear()
+
+
+def _relationships(zf: zipfile.ZipFile, part: str) -> Dict[str, str]:
+    """Map relationship id -> zip member name for a part."""
+    rels_name = posixpath.join(posixpath.dirname(part), "_rels", posixpath.basename(part) + ".rels")
+    try:
+        root = ET.fromstring(zf.read(rels_name))
+    except KeyError:
+        return {}
+    base = posixpath.dirname(part)
+    rels = {}
+    for rel in root.iter(PKG_REL + "Relationship"):
+        if rel.get("TargetMode") == "External":
+            continue
+        rels[rel.get("Id")] = posixpath.normpath(posixpath.join(base, rel.get("Target", "")))
+    return rels
+
+
+class DocxStreamReader:
+    """
+    Stream text (and, on demand, image blobs) out of a .docx zip.
+
+    Header and footer parts are read too (python-docx's doc.paragraphs drops
+    them), as are table rows.
+    """
+
+    def __init__(self, file_path: str, headers_footers: bool = True):
+        self.file_path = file_path
+        self.headers_footers = headers_footers
+        self._blips: List[str] = []
+
+    def validate(self) -> None:
+        """Raise BadZipFile/ValueError if this is not a readable .docx package."""
+        with zipfile.ZipFile(self.file_path) as zf:
+            if DOCUMENT_PART not in zf.namelist():
+                raise ValueError(f"{self.file_path} has no {DOCUMENT_PART}")
+
+    def iter_blocks(self) -> Iterator[str]:
+        """Headers, then body paragraphs/table rows, then footers."""
+        self._blips = []
+        with zipfile.ZipFile(self.file_path) as zf:
+            names = zf.namelist()
+            if DOCUMENT_PART not in names:
+                raise ValueError(f"{self.file_path} has no {DOCUMENT_PART}")
+            headers = sorted(n for n in names if HEADER_RE.match(n)) if self.headers_footers else []
+            footers = sorted(n for n in names if FOOTER_RE.match(n)) if self.headers_footers else []
+            seen = set()
+            for name in headers:
+                with zf.open(name) as part:
+                    for text in _iter_part(part):
+                        if text not in seen:  # the same header repeats per section
+                            seen.add(text)
+                            yield text
+            with zf.open(DOCUMENT_PART) as stream:
+                yield from _iter_part(stream, self._blips)
+            seen = set()
+            for name in footers:
+                with zf.open(name) as part:
+                    for text in _iter_part(part):
+                        if text not in seen:
+                            seen.add(text)
+                            yield text
+
+    def iter_image_blobs(self) -> Iterator[bytes]:
+        """
+        Blobs of the pictures referenced in the body, in document order.
+        Reads word/media lazily, one image at a time; call after iter_blocks.
+        """
+        if not self._blips:
+            return
+        with zipfile.ZipFile(self.file_path) as zf:
+            rels = _relationships(zf, DOCUMENT_PART)
+            for rid in self._blips:
+                target = rels.get(rid)
+                if not target:
+                    continue
+                try:
+                    yield zf.read(target)
+                except KeyError:
+                    continue
@@ -0,0 +1,82 @@
+# src/docs_pipeline/image_triage.py
+import io
+import logging
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+# Outcomes reported per image
+SKIPPED = "skipped"        # too small, blank or unreadable — never reaches OCR
+DOWNSCALED = "downscaled"  # larger than max_edge, shrunk before OCR
+OCR = "ocr"                # passed through at original size
+
+
+class ImageTriage:
+    """
+    Cheap pre-OCR filter for inline pictures.
+
+    Dimensions come from the image header (PIL opens lazily), so bullets and
+    rules are rejected without a decode. Survivors are decoded once; an
+    entropy check on a small grayscale thumbnail drops blank images, and
+    oversized images are shrunk (JPEGs decode straight at reduced scale via
+    draft mode) before the NumPy array is built.
+    """
+
+    def __init__(
+        self,
+        min_edge: int = 32,
+        max_edge: int = 2048,
+        min_entropy: float = 1.0,
+        grayscale: bool = False,
+    ):
+        self.min_edge = min_edge
+        self.max_edge = max_edge
+        self.min_entropy = min_entropy
+        self.grayscale = grayscale
+
+    def settings(self) -> Dict:
+        """Everything that changes the array handed to OCR (part of OCR cache keys)."""
+        return {
+            "min_edge": self.min_edge,
+            "max_edge": self.max_edge,
+            "min_entropy": self.min_entropy,
+            "grayscale": self.grayscale,
+        }
+
+    def prepare(self, blob: bytes) -> Tuple[Optional[np.ndarray], str]:
+        """Return (array for OCR or None, outcome)."""
+        try:
+            img = Image.open(io.BytesIO(blob))
+            width, height = img.size  # header only, no pixel decode yet
+        except Exception as e:
+            logging.debug(f"Image header read failed: {e}")
+            return None, SKIPPED
+
+        if min(width, height) < self.min_edge:
+            return None, SKIPPED
+
+        mode = 'L' if self.grayscale else 'RGB'
+        outcome = OCR
+        try:
+            if self.max_edge and max(width, height) > self.max_edge:
+                outcome = DOWNSCALED
+                scale = self.max_edge / max(width, height)
+                target = (max(1, int(width * scale)), max(1, int(height * scale)))
+                img.draft(mode, target)  # JPEG: decode directly at 1/2, 1/4 or 1/8 scale
+                img = img.convert(mode)
+                img.thumbnail((self.max_edge, self.max_edge))
+            else:
+                img = img.convert(mode)
+        except Exception as e:
+            logging.debug(f"Image load failed: {e}")
+            return None, SKIPPED
+
+        if self.min_entropy > 0:
+            probe = img if img.mode == 'L' else img.convert('L')
+            probe = probe.copy()
+            probe.thumbnail((128, 128))
+            if probe.entropy() < self.min_entropy:
+                return None, SKIPPED
+
+        return np.asarray(img), outcome
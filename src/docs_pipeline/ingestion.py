@@ -0,0 +1,278 @@
+# src/docs_pipeline/ingestion.py
+from abc import ABC, abstractmethod
+import os
+import zipfile
+import xml.etree.ElementTree as ET
+import logging
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional
+from collections import Counter
+from .docx_stream import DocxStreamReader
+from . import instrumentation
+
+# easyocr (torch), NumPy/PIL (image_triage) and python-docx are imported
+# where they are used: a run without --ocr_images on the default streaming
+# reader never loads them.
+if TYPE_CHECKING:
+    import numpy as np
+    from .image_triage import ImageTriage
+
+logging.basicConfig(level=logging.INFO)
+
+OCR_LANGS = ['en']
+OCR_ALLOWLIST = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz .,;:!?-()[]{}"\'/\\@#$%&*+=<>'
+
+class DocumentIngester(ABC):
+    @abstractmethod
+    def ingest(self, file_path: str, **kwargs) -> str:
+        pass
+
+class LocalOCR:
+    """
+    In-process EasyOCR (CPU). Triage-decodes image blobs and OCRs them in
+    batches. After each recognize() call, `last_outcomes` holds the triage
+    outcome of every blob (skipped / downscaled / ocr).
+    """
+
+    # Images are padded up to a multiple of this (px) to share OCR batches
+    PAD_STEP = 256
+
+    def __init__(self, batch_size: int = 8, triage: Optional["ImageTriage"] = None):
+        import easyocr
+        from .image_triage import ImageTriage
+        self.batch_size = batch_size
+        self.triage = triage or ImageTriage()
+        self.last_outcomes: List[str] = []
+        logging.info("Initializing EasyOCR (CPU, batched)...")
+        self.reader = easyocr.Reader(OCR_LANGS, gpu=False, recognizer=True, detector=True)
+
+    def _canvas(self, shape: tuple) -> tuple:
+        """`shape` with height and width rounded up to a multiple of PAD_STEP."""
+        step = self.PAD_STEP
+        return (-(-shape[0] // step) * step, -(-shape[1] // step) * step) + tuple(shape[2:])
+
+    @staticmethod
+    def _pad(img: "np.ndarray", canvas: tuple) -> "np.ndarray":
+        """`img` on a white canvas, top left, so the glyphs keep their size and aspect."""
+        if img.shape == canvas:
+            return img
+        import numpy as np
+        padded = np.full(canvas, 255, dtype=img.dtype)
+        padded[:img.shape[0], :img.shape[1]] = img
+        return padded
+
+    def recognize_arrays(self, images: List["np.ndarray"]) -> List[Optional[str]]:
+        """
+        OCR decoded images, preserving order. readtext_batched stacks its
+        inputs, so each image is padded to its size rounded up to PAD_STEP
+        pixels: images of about the same size, from any document of the
+        batch, go through one call. None marks an image whose OCR failed.
+        """
+        texts: List[Optional[str]] = [None] * len(images)
+        groups: Dict[tuple, List[int]] = {}
+        for idx, img in enumerate(images):
+            groups.setdefault(self._canvas(img.shape), []).append(idx)
+        for canvas, indices in groups.items():
+            batch = [self._pad(images[i], canvas) for i in indices]
+            try:
+                # Batch OCR
+                results = self.reader.readtext_batched(
+                    batch, detail=0, allowlist=OCR_ALLOWLIST, batch_size=self.batch_size
+                )
+                for i, words in zip(indices, results):
+                    texts[i] = ' '.join(words).strip()
+            except Exception as e:
+                logging.warning(f"Batch OCR failed, falling back: {e}")
+                # Fallback per image
+                for i in indices:
+                    try:
+                        texts[i] = ' '.join(self.reader.readtext(images[i], detail=0)).strip()
+                    except Exception:
+                        texts[i] = None
+        return texts
+
+    def recognize(self, blobs: List[bytes]) -> List[Optional[str]]:
+        """OCR image blobs in order; images dropped by triage yield an empty string."""
+        texts: List[Optional[str]] = [""] * len(blobs)
+        prepared = [self.triage.prepare(blob) for blob in blobs]
+        self.last_outcomes = [outcome for _, outcome in prepared]
+        kept = [(i, img) for i, (img, _) in enumerate(prepared) if img is not None]
+        results = self.recognize_arrays([img for _, img in kept])
+        for (i, _), text in zip(kept, results):
+            texts[i] = text
+        return texts
+
+class WordDocumentIngester(DocumentIngester):
+    OCR_LANGS = OCR_LANGS
+    OCR_ALLOWLIST = OCR_ALLOWLIST
+
+    MODES = ("fast", "docx")
+
+    def __init__(
+        self,
+        ocr_cache=None,
+        ocr_engine=None,
+        triage: Optional["ImageTriage"] = None,
+        mode: str = "fast",
+    ):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown ingestion mode {mode!r}; expected one of {self.MODES}")
+        self.mode = mode  # "fast" = streaming XML, "docx" = python-docx object model
+        self.ocr_engine = ocr_engine  # LocalOCR, or a RemoteOCR client of the OCR service
+        self._ocr_lock = False  # Prevent multiple init
+        self.ocr_cache = ocr_cache  # Optional OCRCache shared across documents/runs
+        self._triage = triage
+
+    @property
+    def triage(self) -> "ImageTriage":
+        """Image triage settings; the default one is created on first OCR."""
+        if self._triage is None:
+            from .image_triage import ImageTriage
+            self._triage = ImageTriage()
+        return self._triage
+
+    @triage.setter
+    def triage(self, triage: "ImageTriage") -> None:
+        self._triage = triage
+
+    def _init_ocr(self):
+        if self.ocr_engine is None and not self._ocr_lock:
+            self._ocr_lock = True
+            self.ocr_engine = LocalOCR(triage=self.triage)
+            self._ocr_lock = False
+
+    def _ocr_settings(self) -> dict:
+        return {
+            "langs": self.OCR_LANGS, "allowlist": self.OCR_ALLOWLIST, "triage": self.triage.settings(),
+            "pad_step": LocalOCR.PAD_STEP,
+        }
+
+    def _ocr_blobs(self, blobs: List[bytes]) -> List[Optional[str]]:
+        """
+        OCR image blobs in order. Cached results skip both the decode and
+        the OCR call; only misses are sent to the OCR engine, in one request.
+        None marks an image that could not be OCR'd.
+        """
+        texts: List[Optional[str]] = [None] * len(blobs)
+        keys: List[Optional[str]] = [None] * len(blobs)
+        pending: List[int] = []
+        settings = self._ocr_settings()
+        for idx, blob in enumerate(blobs):
+            if self.ocr_cache is not None:
+                keys[idx] = self.ocr_cache.make_key(blob, settings)
+                cached = self.ocr_cache.get(keys[idx])
+                if cached is not None:
+                    texts[idx] = cached
+                    continue
+            pending.append(idx)
+
+        counts = Counter(cached=len(blobs) - len(pending))
+        instrumentation.count("images", len(blobs))
+        if pending:
+            self._init_ocr()
+            with instrumentation.stage("ocr"):
+                results = self.ocr_engine.recognize([blobs[idx] for idx in pending])
+            counts.update(getattr(self.ocr_engine, "last_outcomes", []))
+        else:
+            results = []
+        self.last_image_counts = dict(counts)
+        for idx, text in zip(pending, results):
+            texts[idx] = text
+            if text is not None and self.ocr_cache is not None:
+                self.ocr_cache.put(keys[idx], text)
+        return texts
+
+    def _image_lines(self, blobs: List[bytes], file_path: str) -> Iterator[str]:
+        """OCR the document's images and yield one '[Image Text: ...]' line each."""
+        for text in self._ocr_blobs(blobs):
+            if text is None:
+                yield "[Image: OCR failed]"
+            elif text:
+                yield f"[Image Text: {text}]"
+        c = self.last_image_counts
+        logging.info(
+            f"{os.path.basename(file_path)}: {len(blobs)} images — "
+            f"{c.get('ocr', 0) + c.get('downscaled', 0)} OCR'd "
+            f"({c.get('downscaled', 0)} downscaled), {c.get('skipped', 0)} skipped, "
+            f"{c.get('cached', 0)} cached"
+        )
+
+    def _open_docx(self, file_path: str, ocr_images: bool) -> "IngestedDocument":
+        """python-docx object model: body paragraphs, then inline pictures."""
+        import docx
+        doc = docx.Document(file_path)
+        blocks = [para.text for para in doc.paragraphs if para.text.strip()]
+
+        image_lines: List[str] = []
+        if ocr_images and doc.inline_shapes:
+            blobs = []
+            for shape in doc.inline_shapes:
+                if shape.type != docx.enum.shape.WD_INLINE_SHAPE.PICTURE:
+                    continue
+                try:
+                    rel = shape._inline.graphic.graphicData.pic.blipFill.blip.embed
+                    if not rel:
+                        continue
+                    image_part = doc.part.related_parts.get(rel)
+                    if not image_part:
+                        continue
+                    blobs.append(image_part.blob)
+                except Exception as e:
+                    logging.debug(f"Image load failed: {e}")
+            image_lines = list(self._image_lines(blobs, file_path))
+        return IngestedDocument(lambda: iter(blocks), lambda: image_lines)
+
+    def _open_stream(self, file_path: str, ocr_images: bool) -> "IngestedDocument":
+        """Streaming XML: headers, body paragraphs and table rows, footers, then pictures."""
+        reader = DocxStreamReader(file_path)
+        reader.validate()
+
+        def images() -> List[str]:
+            # The pass over the blocks has just collected the picture references
+            blobs = list(reader.iter_image_blobs()) if ocr_images else []
+            return list(self._image_lines(blobs, file_path)) if blobs else []
+
+        return IngestedDocument(reader.iter_blocks, images)
+
+    def open(self, file_path: str, ocr_images: bool = False) -> "IngestedDocument":
+        """
+        Prepare a document for (repeated) streaming. Text blocks are
+        produced lazily on each iteration; OCR runs once, at the end of the
+        first (python-docx: here, up front). The fast mode falls back to
+        python-docx when it cannot open the file.
+        """
+        if self.mode == "fast":
+            try:
+                return self._open_stream(file_path, ocr_images)
+            except (zipfile.BadZipFile, ValueError, ET.ParseError) as e:
+                logging.warning(f"Streaming ingestion failed for {file_path}, using python-docx: {e}")
+        return self._open_docx(file_path, ocr_images)
+
+    def iter_text(self, file_path: str, ocr_images: bool = False) -> Iterator[str]:
+        """Yield the document's non-empty text blocks, then OCR lines for its pictures."""
+        return iter(self.open(file_path, ocr_images=ocr_images))
+
+    def ingest(self, file_path: str, ocr_images: bool = False) -> str:
+        try:
+            return '\n'.join(self.iter_text(file_path, ocr_images=ocr_images))
+        except Exception as e:
+            raise ValueError(f"Error ingesting {file_path}: {e}")
+
+
+class IngestedDocument:
+    """
+    Re-iterable text of one document: its text blocks (re-read from the file
+    on every pass in streaming mode), then the OCR lines of its pictures.
+    `images` is called once, when the first pass reaches the end of the
+    blocks: the streaming reader finds the pictures in the same parse.
+    """
+
+    def __init__(self, blocks: Callable[[], Iterator[str]], images: Callable[[], List[str]]):
+        self._blocks = blocks
+        self._images = images
+        self.image_lines: Optional[List[str]] = None  # set by the first complete pass
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._blocks()
+        if self.image_lines is None:
+            self.image_lines = self._images()
+        yield from self.image_lines
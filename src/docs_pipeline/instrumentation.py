@@ -0,0 +1,227 @@
+# src/docs_pipeline/instrumentation.py
+import os
+import json
+import time
+import logging
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# ----------------------------------------------------------------------
+# Per-stage timing for one file, and the per-run report built from it
+# ----------------------------------------------------------------------
+# Stages of the streaming pipeline run interleaved (tagging pulls chunks,
+# chunking pulls cleaned blocks, ...), so time is attributed exclusively:
+# entering a stage pauses the one it was entered from. The cost is two
+# clock reads per stage switch, cheap enough to leave on for every run.
+
+STAGES = ("ingest", "ocr", "clean", "chunk", "tag", "export", "pdf")
+
+_ACTIVE: Dict[str, Optional["FileMetrics"]] = {"metrics": None}
+
+
+class FileMetrics:
+    """
+    Wall/CPU seconds per stage and item counts for one processed file.
+    `to_dict()` is small and picklable; it travels back with the result.
+    """
+
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+        self.wall: Dict[str, float] = {}
+        self.cpu: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self._stack: List[str] = []
+        self._mark = (time.perf_counter(), time.process_time())
+        self._start = self._mark
+
+    def _charge(self) -> None:
+        wall, cpu = time.perf_counter(), time.process_time()
+        if self._stack:
+            name = self._stack[-1]
+            self.wall[name] = self.wall.get(name, 0.0) + wall - self._mark[0]
+            self.cpu[name] = self.cpu.get(name, 0.0) + cpu - self._mark[1]
+        self._mark = (wall, cpu)
+
+    def enter(self, name: str) -> None:
+        self._charge()
+        self._stack.append(name)
+
+    def exit(self) -> None:
+        self._charge()
+        self._stack.pop()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        self.enter(name)
+        try:
+            yield
+        finally:
+            self.exit()
+
+    def timed(self, items: Iterable, name: str, count: Optional[str] = None) -> Iterator:
+        """Re-yield `items`, charging the time spent producing each one to `name`."""
+        it = iter(items)
+        while True:
+            self.enter(name)
+            try:
+                item = next(it)
+            except StopIteration:
+                return
+            finally:
+                self.exit()
+            if count:
+                self.counts[count] = self.counts.get(count, 0) + 1
+            yield item
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def to_dict(self) -> Dict:
+        from .workers import peak_rss_mb, rss_mb
+        return {
+            "file": self.file_name,
+            "pid": os.getpid(),
+            "wall_s": round(time.perf_counter() - self._start[0], 4),
+            "cpu_s": round(time.process_time() - self._start[1], 4),
+            "rss_mb": round(rss_mb(), 1),
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+            "stages": {
+                name: {"wall_s": round(self.wall[name], 4), "cpu_s": round(self.cpu.get(name, 0.0), 4)}
+                for name in sorted(self.wall, key=lambda n: STAGES.index(n) if n in STAGES else len(STAGES))
+            },
+            "counts": dict(self.counts),
+        }
+
+
+@contextmanager
+def track(file_name: str) -> Iterator[FileMetrics]:
+    """Make a FileMetrics the active collector of this process for one file."""
+    metrics = FileMetrics(file_name)
+    _ACTIVE["metrics"] = metrics
+    try:
+        yield metrics
+    finally:
+        _ACTIVE["metrics"] = None
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a stage against the active file, if any (no-op otherwise)."""
+    metrics = _ACTIVE["metrics"]
+    if metrics is None:
+        yield
+        return
+    with metrics.stage(name):
+        yield
+
+
+def count(name: str, n: int = 1) -> None:
+    metrics = _ACTIVE["metrics"]
+    if metrics is not None:
+        metrics.count(name, n)
+
+
+# ----------------------------------------------------------------------
+# Run report
+# ----------------------------------------------------------------------
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of `values` (0.0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))  # ceil
+    return ordered[int(rank) - 1]
+
+
+def _distribution(values: List[float]) -> Dict[str, float]:
+    return {
+        "total": round(sum(values), 4),
+        "p50": round(percentile(values, 50), 4),
+        "p95": round(percentile(values, 95), 4),
+        "max": round(max(values), 4) if values else 0.0,
+    }
+
+
+def build_report(file_metrics: Iterable[Optional[Dict]], wall_s: float, slowest: int = 10, **run_info) -> Dict:
+    """
+    Aggregate per-file metrics into one run report: p50/p95/max wall and CPU
+    seconds per stage, summed counts, and the slowest files.
+    """
+    files = [m for m in file_metrics if m]
+    stages = {}
+    for name in STAGES + tuple(sorted({s for m in files for s in m["stages"]} - set(STAGES))):
+        walls = [m["stages"][name]["wall_s"] for m in files if name in m["stages"]]
+        if not walls:
+            continue
+        cpus = [m["stages"][name]["cpu_s"] for m in files if name in m["stages"]]
+        stages[name] = {"files": len(walls), "wall_s": _distribution(walls), "cpu_s": _distribution(cpus)}
+    counts: Dict[str, int] = {}
+    for m in files:
+        for key, n in m["counts"].items():
+            counts[key] = counts.get(key, 0) + n
+    return {
+        **run_info,
+        "files": len(files),
+        "wall_s": round(wall_s, 3),
+        "file_wall_s": _distribution([m["wall_s"] for m in files]),
+        "peak_rss_mb": max((m["peak_rss_mb"] for m in files), default=0.0),
+        "stages": stages,
+        "counts": counts,
+        "slowest_files": [
+            {"file": m["file"], "wall_s": m["wall_s"],
+             "stages": {k: v["wall_s"] for k, v in m["stages"].items()}}
+            for m in sorted(files, key=lambda m: m["wall_s"], reverse=True)[:slowest]
+        ],
+    }
+
+
+def write_report(report: Dict, path: str) -> str:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    os.replace(tmp, path)
+    return path
+
+
+def format_stage_table(report: Dict) -> str:
+    """Short human-readable summary of where the time went."""
+    lines = ["Stage timings (wall s: total / p50 / p95 / max):"]
+    for name, s in report["stages"].items():
+        w = s["wall_s"]
+        lines.append(f"  {name:<7} {w['total']:9.2f} / {w['p50']:.3f} / {w['p95']:.3f} / {w['max']:.3f}")
+    return "\n".join(lines)
+
+
+# ----------------------------------------------------------------------
+# Single-file profiling
+# ----------------------------------------------------------------------
+def profile_call(func, output_base: str, profiler: str = "cprofile"):
+    """
+    Run func() under cProfile (writes <output_base>.prof) or pyinstrument
+    (writes <output_base>.html, if installed). Returns func's result.
+    """
+    if profiler == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            logging.warning("pyinstrument is not installed; falling back to cProfile")
+        else:
+            prof = Profiler()
+            prof.start()
+            try:
+                return func()
+            finally:
+                prof.stop()
+                with open(output_base + ".html", "w", encoding="utf-8") as f:
+                    f.write(prof.output_html())
+                print(f"Profile written to {output_base}.html")
+
+    import cProfile
+    import pstats
+    prof = cProfile.Profile()
+    try:
+        return prof.runcall(func)
+    finally:
+        prof.dump_stats(output_base + ".prof")
+        pstats.Stats(prof).sort_stats("cumulative").print_stats(25)
+        print(f"Profile written to {output_base}.prof (open with snakeviz or pstats)")
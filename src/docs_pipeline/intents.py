@@ -0,0 +1,126 @@
+# src/docs_pipeline/intents.py
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .keywords import KeywordMatcher, tokenize
+
+# ----------------------------------------------------------------------
+# Intent classifier — config.yaml intents compiled into one automaton
+# ----------------------------------------------------------------------
+# Every marker of every intent goes into a single token-level Aho-Corasick
+# automaton (see keywords.py), so markers match whole words only and a
+# chunk is classified in one pass over its tokens however many intents
+# are defined. (One big regex alternation was tried first: Python's re
+# tries every alternative at every position and slowed down linearly with
+# the number of markers.)
+
+# Used when config.yaml has no `intents:` section (the old built-in set,
+# now matched on word boundaries)
+DEFAULT_INTENTS: Dict[str, Dict] = {
+    "rule": {"markers": ["must", "shall", "required", "prohibited"]},
+    "definition": {"markers": ["defined as", "means", "refers to"]},
+    "procedure": {"markers": ["step", "steps", "process", "processes", "procedure", "procedures"]},
+}
+
+VETO = float("inf")
+
+IntentSpec = Union[List[str], Dict]
+
+
+def _weights(markers, default: float) -> Dict[str, float]:
+    """A marker list gets `default` weights; a mapping keeps its own."""
+    if isinstance(markers, dict):
+        return {str(m): float(w) for m, w in markers.items()}
+    return {str(m): default for m in markers or []}
+
+
+class IntentClassifier:
+    """
+    Assign intents to a chunk from weighted marker phrases.
+
+    Each intent is either a list of markers or a mapping with `markers`
+    (list, or marker -> weight), optional `negative` markers (a list vetoes
+    the intent, a mapping subtracts weights) and a `threshold` (default 1).
+    An intent is assigned when the summed weight of the distinct markers
+    found reaches its threshold. A single-word marker ending in `*` matches
+    any word starting with it ("regulat*"). Chunks with no intent get
+    `default`.
+    """
+
+    def __init__(self, intents: Optional[Dict[str, IntentSpec]] = None, default: str = "general"):
+        self.default = default
+        self.intents: List[str] = []
+        self.thresholds: Dict[str, float] = {}
+        self._markers = KeywordMatcher()
+        # marker id -> [(intent, weight)], negative weights < 0
+        self._effects: Dict[str, List[Tuple[str, float]]] = {}
+        self._prefixes: Dict[str, str] = {}       # word prefix -> marker id
+        self._prefix_memo: Dict[str, List[str]] = {}
+        ids: Dict[str, str] = {}
+
+        for intent, spec in (DEFAULT_INTENTS if intents is None else intents).items():
+            if not isinstance(spec, dict):
+                spec = {"markers": spec}
+            self.intents.append(intent)
+            self.thresholds[intent] = float(spec.get("threshold", 1.0))
+            effects = [(m, w) for m, w in _weights(spec.get("markers"), 1.0).items()]
+            effects += [(m, -abs(w)) for m, w in _weights(spec.get("negative"), VETO).items()]
+            for marker, weight in effects:
+                key = " ".join(tokenize(marker)) + ("*" if marker.strip().endswith("*") else "")
+                if not key.strip("*"):
+                    continue
+                if key.endswith("*") and " " in key:
+                    logging.warning(f"Intent marker {marker!r}: '*' only works on single words; ignored")
+                    continue
+                marker_id = ids.get(key)
+                if marker_id is None:
+                    marker_id = ids[key] = f"m{len(ids)}"
+                    if key.endswith("*"):
+                        self._prefixes[key[:-1]] = marker_id
+                    else:
+                        self._markers.add(key, tag=marker_id)
+                self._effects.setdefault(marker_id, []).append((intent, weight))
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "IntentClassifier":
+        """Build from config.yaml's `intents` section (built-in defaults if absent)."""
+        intents = config.get("intents")
+        if intents is not None and not isinstance(intents, dict):
+            logging.warning("config.yaml `intents` must be a mapping; using the built-in intents")
+            intents = None
+        return cls(intents, default=config.get("default_intent", "general"))
+
+    def _prefix_hits(self, tokens: Iterable[str]) -> List[str]:
+        memo, hits = self._prefix_memo, []
+        for tok in set(tokens):
+            ids = memo.get(tok)
+            if ids is None:
+                if len(memo) > 200_000:  # bound the cache on corpora with huge vocabularies
+                    memo.clear()
+                ids = memo[tok] = [mid for prefix, mid in self._prefixes.items() if tok.startswith(prefix)]
+            hits.extend(ids)
+        return hits
+
+    def scores_tokens(self, tokens: List[str]) -> Dict[str, float]:
+        """Summed weights per intent over the distinct markers found."""
+        found = self._markers.match_tokens(tokens)
+        if self._prefixes:
+            found += self._prefix_hits(tokens)
+        scores: Dict[str, float] = {}
+        for marker_id in set(found):
+            for intent, weight in self._effects[marker_id]:
+                scores[intent] = scores.get(intent, 0.0) + weight
+        return scores
+
+    def scores(self, text: str) -> Dict[str, float]:
+        return self.scores_tokens(tokenize(text))
+
+    def classify_tokens(self, tokens: List[str]) -> List[str]:
+        """classify() for text already split with keywords.tokenize()."""
+        scores = self.scores_tokens(tokens)
+        found = [i for i in self.intents if scores.get(i, 0.0) >= self.thresholds[i]]
+        return found or [self.default]
+
+    def classify(self, text: str) -> List[str]:
+        """Intents of `text` in config order, or [default] when none apply."""
+        return self.classify_tokens(tokenize(text))
@@ -0,0 +1,113 @@
+# src/docs_pipeline/journal.py
+import os
+import json
+import time
+import logging
+from typing import Dict, Iterable, Iterator, List
+
+from .manifest import OUTPUT_KEYS
+
+# ----------------------------------------------------------------------
+# Run journal and error log — append-only JSON lines in output_dir
+# ----------------------------------------------------------------------
+# The build manifest is only saved when a run completes. The journal gets
+# one line per file as soon as the file is finished (flushed and fsync'd),
+# so `--resume` can pick up an interrupted run: files it completed are fed
+# back into the manifest and reused, everything else is queued again. A
+# torn last line from a crash is ignored. Each run (or resumed run) first
+# writes a "started" line listing the files it queued, so a reader (e.g.
+# `docs merge`) can tell which of them never finished.
+
+
+def read_journal(path: str) -> Iterator[Dict]:
+    """The entries of a journal.jsonl or errors.jsonl, skipping unreadable (torn) lines."""
+    with open(path, "r", encoding="utf-8") as f:
+        for n, line in enumerate(f, 1):
+            try:
+                yield json.loads(line)
+            except ValueError:
+                logging.warning(f"{path}:{n}: skipping unreadable journal line")
+
+
+def _now() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S%z")
+
+
+class _JsonlAppender:
+    def __init__(self, path: str, resume: bool):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._f = open(path, "a" if resume else "w", encoding="utf-8")
+
+    def _append(self, entry: Dict) -> None:
+        self._f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._f.flush()
+        os.fsync(self._f.fileno())
+
+    def close(self) -> None:
+        if not self._f.closed:
+            self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class RunJournal(_JsonlAppender):
+    """
+    `journal.jsonl`: a "started" line per run, then a "done" line (with the
+    file's outputs) or a "failed" line per input. A new run starts an empty
+    journal; with `resume` the existing one is read into `completed` and
+    appended to.
+    """
+
+    FILENAME = "journal.jsonl"
+
+    def __init__(self, output_dir: str, resume: bool = False):
+        path = os.path.join(output_dir, self.FILENAME)
+        self.completed: Dict[str, Dict] = {}
+        if resume:
+            self._load(path)
+        super().__init__(path, resume)
+
+    def _load(self, path: str) -> None:
+        if not os.path.exists(path):
+            return
+        for entry in read_journal(path):
+            if entry.get("status") == "done":
+                self.completed[entry["file"]] = entry
+            elif entry.get("status") == "failed":
+                self.completed.pop(entry["file"], None)
+
+    def start(self, keys: Iterable[str]) -> None:
+        """Record the files this run is about to process."""
+        self._append({"time": _now(), "status": "started", "files": list(keys)})
+
+    def done(self, key: str, content_hash: str, fingerprint: str, outputs: Dict, seconds: float) -> None:
+        self._append({
+            "time": _now(), "status": "done", "file": key, "hash": content_hash, "fingerprint": fingerprint,
+            "outputs": {k: outputs.get(k) for k in OUTPUT_KEYS}, "seconds": round(seconds, 4),
+        })
+
+    def failed(self, key: str, content_hash: str, fingerprint: str, attempts: int) -> None:
+        self._append({
+            "time": _now(), "status": "failed", "file": key, "hash": content_hash,
+            "fingerprint": fingerprint, "attempts": attempts,
+        })
+
+
+class ErrorLog(_JsonlAppender):
+    """`errors.jsonl`: one line per failed attempt (final=True when given up)."""
+
+    FILENAME = "errors.jsonl"
+
+    def __init__(self, output_dir: str, resume: bool = False):
+        super().__init__(os.path.join(output_dir, self.FILENAME), resume)
+        self.count = 0
+
+    def write(self, key: str, errors: List[Dict], final: bool) -> None:
+        for i, error in enumerate(errors):
+            self._append({"time": _now(), "file": key, "final": final and i == len(errors) - 1, **error})
+            self.count += 1
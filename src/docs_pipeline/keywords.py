@@ -0,0 +1,153 @@
+# src/docs_pipeline/keywords.py
+import re
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+# ----------------------------------------------------------------------
+# Keyword engine — Aho-Corasick over word tokens
+# ----------------------------------------------------------------------
+# Terms from config.yaml are tokenized the same way as the text and
+# compiled once into an automaton whose alphabet is whole (lowercased)
+# tokens. One left-to-right pass over a chunk reports every single- and
+# multi-word term, overlapping ones included, in time linear in the number
+# of tokens regardless of vocabulary size.
+
+TOKEN_RE = re.compile(r"\w+")
+
+KeywordEntry = Union[str, Dict[str, Union[str, List[str]]]]
+
+
+class KeywordMatch(NamedTuple):
+    tag: str      # canonical tag
+    phrase: str   # the configured term or alias that matched
+    start: int    # character offsets into the matched text
+    end: int
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens; punctuation and hyphens separate words."""
+    return TOKEN_RE.findall(text.lower())
+
+
+class KeywordMatcher:
+    """
+    Match configured keywords (and their aliases) in text.
+
+    `entries` are plain terms ("access control") or one-item mappings from
+    a canonical tag to its aliases ({"gdpr": ["general data protection
+    regulation", "eu gdpr"]}); an alias match reports the canonical tag.
+    """
+
+    def __init__(self, entries: Iterable[KeywordEntry] = (), aliases: Optional[Dict[str, str]] = None):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._own: List[List[Tuple[str, str, int]]] = [[]]  # (tag, phrase, n_tokens) ending here
+        self._out: List[List[Tuple[str, str, int]]] = [[]]  # own + those of every suffix state
+        self._built = True
+        self.tags: Dict[str, None] = {}  # canonical tags, in config order
+        for entry in entries:
+            if isinstance(entry, dict):
+                for tag, names in entry.items():
+                    self.add(tag)
+                    for alias in [names] if isinstance(names, str) else (names or []):
+                        self.add(alias, tag=tag)
+            else:
+                self.add(entry)
+        for alias, tag in (aliases or {}).items():
+            self.add(alias, tag=tag)
+
+    @classmethod
+    def from_config(cls, config: Dict) -> "KeywordMatcher":
+        """Build from config.yaml's `keywords` list and optional `keyword_aliases` map."""
+        return cls(config.get("keywords") or [], config.get("keyword_aliases") or {})
+
+    def add(self, phrase: str, tag: Optional[str] = None) -> None:
+        tokens = tokenize(str(phrase))
+        if not tokens:
+            return
+        tag = " ".join(tokenize(str(tag))) if tag else " ".join(tokens)
+        self.tags[tag] = None
+        state = 0
+        for tok in tokens:
+            nxt = self._goto[state].get(tok)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][tok] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._own.append([])
+            state = nxt
+        hit = (tag, " ".join(tokens), len(tokens))
+        if hit not in self._own[state]:
+            self._own[state].append(hit)
+        self._built = False
+
+    def _build(self) -> None:
+        """Breadth-first failure links; outputs of suffix states are merged in."""
+        own = self._own
+        self._out = [list(out) for out in own]
+        queue = deque()
+        for nxt in self._goto[0].values():
+            self._fail[nxt] = 0
+            queue.append(nxt)
+        while queue:
+            state = queue.popleft()
+            for tok, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and tok not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(tok, 0)
+                self._out[nxt] = own[nxt] + self._out[self._fail[nxt]]
+        self._built = True
+
+    def __len__(self) -> int:
+        return len(self.tags)
+
+    def __bool__(self) -> bool:
+        return bool(self.tags)
+
+    def finditer(self, text: str) -> Iterator[KeywordMatch]:
+        """Every match with character offsets, in order of where it ends."""
+        if not self._built:
+            self._build()
+        goto, fail, out = self._goto, self._fail, self._out
+        spans: List[Tuple[int, int]] = []
+        state = 0
+        for m in TOKEN_RE.finditer(text):
+            tok = m.group().lower()
+            spans.append(m.span())
+            while state and tok not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(tok, 0)
+            for tag, phrase, n in out[state]:
+                yield KeywordMatch(tag, phrase, spans[-n][0], spans[-1][1])
+
+    def match(self, text: str) -> List[str]:
+        """Distinct canonical tags found in `text`, in order of first occurrence."""
+        return self.match_tokens(tokenize(text)) if self.tags else []
+
+    def match_tokens(self, tokens: Iterable[str]) -> List[str]:
+        """match() for text already split with tokenize()."""
+        if not self.tags:
+            return []
+        if not self._built:
+            self._build()
+        goto, fail, out = self._goto, self._fail, self._out
+        root = goto[0]
+        found: Dict[str, None] = {}
+        state = 0
+        for tok in tokens:
+            if state:
+                while state and tok not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(tok, 0)
+            else:
+                state = root.get(tok, 0)  # most tokens start no term at all
+                if not state:
+                    continue
+            hits = out[state]
+            if hits:
+                for hit in hits:
+                    found[hit[0]] = None
+        return list(found)
@@ -0,0 +1,272 @@
+# src/docs_pipeline/llm_export.py
+import json
+import os
+from typing import Callable, Dict, IO, Iterable, List, Optional, Tuple
+from datetime import datetime
+
+# ----------------------------------------------------------------------
+# Record builders — one output record per tagged chunk
+# ----------------------------------------------------------------------
+def _drop_empty(metadata: Dict) -> Dict:
+    return {k: v for k, v in metadata.items() if v not in ([], {}, None, "")}
+
+def _langchain_record(chunk: Dict, source_name: str) -> Dict:
+    return {
+        "page_content": chunk["content"],
+        "metadata": {
+            "source": f"{source_name}#chunk-{chunk['chunk_id']}",
+            "chunk_id": chunk["chunk_id"],
+            "file_name": chunk["file_name"],
+            "chunk_position": chunk["chunk_position"],
+            **{k: v for k, v in chunk.items() if k not in ["content", "chunk_id", "file_name", "chunk_position"]}
+        }
+    }
+
+def _llamaindex_record(chunk: Dict, source_name: str) -> Dict:
+    return {
+        "text": chunk["content"],
+        "metadata": {
+            "file_name": chunk["file_name"],
+            "chunk_id": chunk["chunk_id"],
+            "source": source_name,
+            "ingestion_time": datetime.utcnow().isoformat() + "Z",
+            "tags": chunk["keywords"] + chunk.get("policy_keywords", []) + chunk["intents"]
+        }
+    }
+
+def _haystack_record(chunk: Dict, source_name: str) -> Dict:
+    return {
+        "content": chunk["content"],
+        "meta": {
+            "name": f"{source_name}_chunk_{chunk['chunk_id']}",
+            "file_name": chunk["file_name"],
+            "chunk_id": chunk["chunk_id"],
+            "intents": chunk["intents"],
+            "entities": [e[0] for e in chunk.get("entities", [])],
+            "keywords": chunk["keywords"]
+        }
+    }
+
+def _generic_record(chunk: Dict, source_name: str) -> Dict:
+    return {
+        "id": f"{source_name.replace('.docx', '')}_{chunk['chunk_id']}",
+        "text": chunk["content"],
+        "source": source_name,
+        "chunk_id": chunk["chunk_id"],
+        "keywords": "|".join(chunk["keywords"]),
+        "intents": "|".join(chunk["intents"]),
+        "entities": "|".join([e[0] for e in chunk.get("entities", [])])
+    }
+
+def _bedrock_metadata(chunk: Dict, source_name: str) -> Dict:
+    return {
+        "source": source_name,
+        "file_name": chunk["file_name"],
+        "chunk_id": chunk["chunk_id"],
+        "chunk_position": round(chunk["chunk_position"], 3),
+        "word_count": chunk["word_count"],
+        "keywords": chunk["keywords"],
+        "policy_keywords": chunk.get("policy_keywords", []),  # ← SAFE
+        "intents": chunk["intents"],
+        "entities": chunk.get("entities", []),  # absent with the fast tagging profile
+        "ingestion_timestamp": datetime.utcnow().isoformat() + "Z"
+    }
+
+def _bedrock_record(chunk: Dict, source_name: str) -> Dict:
+    return {
+        "text": chunk["content"],
+        "metadata": _drop_empty(_bedrock_metadata(chunk, source_name))
+    }
+
+def _nova_pro_record(chunk: Dict, source_name: str) -> Dict:
+    has_image = "[Image" in chunk["content"]
+    metadata = _bedrock_metadata(chunk, source_name)
+    metadata["multimodal_type"] = "text/image" if has_image else "text"
+    metadata["content_modality"] = "structured"
+    return {"text": chunk["content"], "metadata": _drop_empty(metadata)}
+
+def _claude_sonnet_record(chunk: Dict, source_name: str) -> Dict:
+    metadata = _bedrock_metadata(chunk, source_name)
+    metadata["reasoning_hints"] = (
+        ["multi-step"] if "procedure" in chunk["intents"] else ["contextual"]
+    )
+    metadata["contextual_tags"] = [e[0] for e in chunk.get("entities", [])] + chunk.get("policy_keywords", [])
+    return {"text": chunk["content"], "metadata": _drop_empty(metadata)}
+
+# format -> (record builder, file extension)
+EXPORTERS: Dict[str, Tuple[Callable[[Dict, str], Dict], str]] = {
+    "bedrock": (_bedrock_record, "jsonl"),
+    "langchain": (_langchain_record, "json"),
+    "llamaindex": (_llamaindex_record, "json"),
+    "haystack": (_haystack_record, "json"),
+    "generic": (_generic_record, "jsonl"),
+    "nova_pro": (_nova_pro_record, "jsonl"),
+    "claude_sonnet": (_claude_sonnet_record, "jsonl"),
+}
+
+# format -> field holding a record's metadata (None: the record's top level)
+METADATA_FIELDS: Dict[str, Optional[str]] = {
+    "bedrock": "metadata",
+    "langchain": "metadata",
+    "llamaindex": "metadata",
+    "haystack": "meta",
+    "generic": None,
+    "nova_pro": "metadata",
+    "claude_sonnet": "metadata",
+}
+
+
+def record_metadata(record: Dict, export_format: str) -> Dict:
+    """The dict of a built record that carries chunk_id and friends."""
+    field = METADATA_FIELDS[export_format]
+    return record if field is None else record.setdefault(field, {})
+
+
+def with_global_chunk_id(line: str, key: str, export_format: str) -> str:
+    """
+    One JSONL record, as copied into a combined corpus: its metadata gains
+    `global_chunk_id`, "<key>#<chunk_id>", unique across the corpus (the
+    file name alone is not, in recursive runs).
+    """
+    record = json.loads(line)
+    metadata = record_metadata(record, export_format)
+    metadata["global_chunk_id"] = f"{key}#{metadata.get('chunk_id')}"
+    return json.dumps(record, ensure_ascii=False) + "\n"
+
+
+# format -> field holding a record's chunk text
+TEXT_FIELDS: Dict[str, str] = {
+    "bedrock": "text",
+    "langchain": "page_content",
+    "llamaindex": "text",
+    "haystack": "content",
+    "generic": "text",
+    "nova_pro": "text",
+    "claude_sonnet": "text",
+}
+
+
+def record_text(record: Dict, export_format: str) -> str:
+    return record.get(TEXT_FIELDS[export_format]) or ""
+
+# ----------------------------------------------------------------------
+# Streaming writers
+# ----------------------------------------------------------------------
+class JsonArrayWriter:
+    """
+    Write a JSON array one element at a time. The bytes are identical to
+    json.dump(items, f, indent=indent, ensure_ascii=False).
+    """
+
+    def __init__(self, f: IO[str], indent: int = 2):
+        self.f = f
+        self.pad = " " * indent
+        self.indent = indent
+        self.count = 0
+
+    def write(self, item) -> None:
+        body = json.dumps(item, indent=self.indent, ensure_ascii=False)
+        body = body.replace("\n", "\n" + self.pad)
+        self.f.write(("[\n" if self.count == 0 else ",\n") + self.pad + body)
+        self.count += 1
+
+    def close(self) -> None:
+        self.f.write("\n]" if self.count else "[]")
+
+
+class ChunkExporter:
+    """
+    Incremental exporter: write(chunk) appends one record as soon as the
+    chunk is tagged; close() finishes the file. JSONL formats write one line
+    per record, JSON formats stream the array.
+    """
+
+    def __init__(self, export_format: str, output_file: str, source_name: str):
+        self.build, self.ext = EXPORTERS[export_format]
+        self.export_format = export_format
+        self.output_file = output_file
+        self.source_name = source_name
+        self.count = 0
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+        self._f = open(output_file, 'w', encoding='utf-8')
+        self._array = JsonArrayWriter(self._f, indent=2) if self.ext == "json" else None
+
+    def write(self, chunk: Dict) -> None:
+        record = self.build(chunk, self.source_name)
+        if self._array is not None:
+            self._array.write(record)
+        else:
+            self._f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.count += 1
+
+    def close(self) -> str:
+        if self._array is not None:
+            self._array.close()
+        self._f.close()
+        return self.output_file
+
+    def __enter__(self) -> "ChunkExporter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if not self._f.closed:
+            self.close()
+
+
+def export_chunks(export_format: str, tagged_chunks: Iterable[Dict], output_file: str, source_name: str) -> str:
+    with ChunkExporter(export_format, output_file, source_name) as exporter:
+        for chunk in tagged_chunks:
+            exporter.write(chunk)
+    return output_file
+
+# ----------------------------------------------------------------------
+# Per-format entry points
+# ----------------------------------------------------------------------
+def export_langchain(
+    tagged_chunks: List[Dict],
+    output_file: str,
+    source_name: str
+) -> str:
+    return export_chunks("langchain", tagged_chunks, output_file, source_name)
+
+def export_llamaindex(
+    tagged_chunks: List[Dict],
+    output_file: str,
+    source_name: str
+) -> str:
+    return export_chunks("llamaindex", tagged_chunks, output_file, source_name)
+
+def export_haystack(
+    tagged_chunks: List[Dict],
+    output_file: str,
+    source_name: str
+) -> str:
+    return export_chunks("haystack", tagged_chunks, output_file, source_name)
+
+def export_generic_jsonl(
+    tagged_chunks: List[Dict],
+    output_file: str,
+    source_name: str
+) -> str:
+    return export_chunks("generic", tagged_chunks, output_file, source_name)
+
+def export_bedrock_jsonl(
+    tagged_chunks: List[Dict],
+    output_file: str,
+    source_name: str
+) -> str:
+    return export_chunks("bedrock", tagged_chunks, output_file, source_name)
+
+def export_nova_pro(
+    tagged_chunks: List[Dict],
+    output_file: str,
+    source_name: str
+) -> str:
+    return export_chunks("nova_pro", tagged_chunks, output_file, source_name)
+
+def export_claude_sonnet(
+    tagged_chunks: List[Dict],
+    output_file: str,
+    source_name: str
+) -> str:
+    return export_chunks("claude_sonnet", tagged_chunks, output_file, source_name)
@@ -0,0 +1,160 @@
+# src/docs_pipeline/manifest.py
+import os
+import json
+import hashlib
+import logging
+from typing import Dict, Iterable, List, Optional
+
+import yaml
+
+# config.yaml keys that change how a run executes but not what it produces
+RUN_ONLY_KEYS = {"workers", "tag_batch_size"}
+
+# Per-file outputs a worker result reports and the manifest/journal keep
+OUTPUT_KEYS = ("json", "pdf", "llm", "vectors", "columnar")
+
+# config.yaml keys applied after spaCy, on top of the stage cache (stage_cache.py)
+ANNOTATION_KEYS = {"keywords", "keyword_aliases", "keyword_offsets", "intents", "default_intent"}
+
+# spaCy model package behind each tagging profile (TextTagger.SPACY_MODELS;
+# not imported from tagging.py, which loads NLTK)
+PROFILE_MODELS = {"fast": None, "balanced": "en_core_web_sm", "full": "en_core_web_lg"}
+
+
+def file_digest(path: str, block_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's bytes, read in blocks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def spacy_model_version(model: str = "en_core_web_lg") -> str:
+    """Installed version of a spaCy model package, without importing spaCy."""
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+    except ImportError:  # pragma: no cover - Python < 3.8
+        return "unknown"
+    try:
+        return version(model)
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def settings_fingerprint(config_path: str = "config.yaml", ignore: Iterable[str] = (), **settings) -> str:
+    """
+    Hash of every setting that affects a file's outputs.
+
+    `settings` are the effective CLI options (chunk_size, overlap, ocr_images,
+    export format, ...); config.yaml contributes everything except RUN_ONLY_KEYS
+    and the `ignore`d keys. Only the spaCy model of settings["tagging_profile"]
+    (default full) counts, so upgrading a model another profile uses rebuilds
+    nothing.
+    """
+    skip = RUN_ONLY_KEYS | set(ignore)
+    config = {}
+    if os.path.exists(config_path):
+        with open(config_path, "r", encoding="utf-8") as f:
+            config = yaml.safe_load(f) or {}
+    model = PROFILE_MODELS[settings.get("tagging_profile", "full")]
+    payload = {
+        "settings": settings,
+        "config": {k: v for k, v in config.items() if k not in skip},
+        "spacy_model": [model, spacy_model_version(model)] if model else None,
+    }
+    blob = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+def output_paths(outputs: Dict) -> List[str]:
+    """
+    Flatten {"json": p, "pdf": p, "llm": {format: p}, "vectors": p, ...} into
+    a list of paths. `outputs` may be a whole worker result; only OUTPUT_KEYS
+    count (its "metrics" are a dict too).
+    """
+    paths = []
+    for value in (outputs.get(k) for k in OUTPUT_KEYS):
+        if isinstance(value, dict):
+            paths.extend(p for p in value.values() if p)
+        elif value:
+            paths.append(value)
+    return paths
+
+
+class BuildManifest:
+    """
+    Content-addressed record of what was built, stored in output_dir.
+
+    Each input file maps to the hash of its bytes, the settings fingerprint it
+    was built with, and the output paths it produced. A file whose hash and
+    fingerprint are unchanged (and whose outputs still exist) is skipped.
+    """
+
+    FILENAME = "manifest.json"
+    VERSION = 2
+
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, self.FILENAME)
+        self.entries: Dict[str, Dict] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                self.entries = data.get("files", {})
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable manifest {self.path}: {e}")
+
+    def lookup(self, key: str, content_hash: str, fingerprint: str) -> Optional[Dict]:
+        """Return the stored outputs if `key` is up to date, else None."""
+        entry = self.entries.get(key)
+        if not entry or entry["hash"] != content_hash or entry["fingerprint"] != fingerprint:
+            return None
+        outputs = entry["outputs"]
+        if not all(os.path.exists(p) for p in output_paths(outputs)):
+            return None
+        return outputs
+
+    def record(self, key: str, content_hash: str, fingerprint: str, outputs: Dict) -> None:
+        # Drop outputs the previous build produced but this one no longer does
+        # (e.g. a different export format or --to_pdf switched off)
+        # (`outputs` may be a whole worker result; only the output keys count)
+        outputs = {k: outputs.get(k) for k in OUTPUT_KEYS}
+        old = self.entries.get(key)
+        if old:
+            keep = set(output_paths(outputs))
+            for path in output_paths(old["outputs"]):
+                if path not in keep and os.path.exists(path):
+                    os.remove(path)
+        self.entries[key] = {
+            "hash": content_hash,
+            "fingerprint": fingerprint,
+            "outputs": outputs,
+        }
+
+    def forget(self, key: str) -> None:
+        self.entries.pop(key, None)
+
+    def prune(self, current_keys: Iterable[str]) -> List[str]:
+        """Delete outputs of inputs that no longer exist; returns the removed keys."""
+        current = set(current_keys)
+        removed = [key for key in self.entries if key not in current]
+        for key in removed:
+            for path in output_paths(self.entries.pop(key)["outputs"]):
+                if os.path.exists(path):
+                    os.remove(path)
+        return removed
+
+    def save(self) -> None:
+        """Write atomically so an interrupted run never leaves a torn manifest."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": self.VERSION, "files": self.entries}, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
@@ -0,0 +1,94 @@
+# src/docs_pipeline/ocr_cache.py
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import logging
+from typing import Dict, Optional
+
+
+class OCRCache:
+    """
+    On-disk OCR result cache keyed by image bytes + OCR settings.
+
+    Backed by SQLite (WAL mode), so several worker processes can read and
+    write the same cache file concurrently. Entries carry a last-used
+    timestamp; once the cache holds more than `max_entries`, the least
+    recently used entries are evicted.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS ocr ("
+        " key TEXT PRIMARY KEY,"
+        " text TEXT NOT NULL,"
+        " last_used REAL NOT NULL)"
+    )
+    EVICT_EVERY = 256  # puts between eviction checks
+
+    def __init__(self, path: str, max_entries: int = 100_000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(self.SCHEMA)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ocr_last_used ON ocr(last_used)")
+
+    @staticmethod
+    def make_key(blob: bytes, settings: Dict) -> str:
+        """SHA-256 over the image bytes and the OCR settings that shape the result."""
+        h = hashlib.sha256(blob)
+        h.update(json.dumps(settings, sort_keys=True).encode("utf-8"))
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT text FROM ocr WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        try:
+            self._conn.execute("UPDATE ocr SET last_used = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.OperationalError as e:  # busy: recency is best-effort
+            logging.debug(f"OCR cache touch skipped: {e}")
+        return row[0]
+
+    def put(self, key: str, text: str) -> None:
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ocr (key, text, last_used) VALUES (?, ?, ?)",
+                (key, text, time.time()),
+            )
+        except sqlite3.OperationalError as e:
+            logging.warning(f"OCR cache write failed: {e}")
+            return
+        self._puts += 1
+        if self._puts % self.EVICT_EVERY == 0:
+            self.evict()
+
+    def evict(self) -> int:
+        """Trim to max_entries, least recently used first. Returns rows removed."""
+        try:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM ocr").fetchone()
+            excess = count - self.max_entries
+            if excess <= 0:
+                return 0
+            self._conn.execute(
+                "DELETE FROM ocr WHERE key IN (SELECT key FROM ocr ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+            return excess
+        except sqlite3.OperationalError as e:
+            logging.warning(f"OCR cache eviction failed: {e}")
+            return 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,175 @@
+# src/docs_pipeline/ocr_service.py
+import os
+import time
+import queue
+import logging
+import itertools
+import multiprocessing
+from multiprocessing.managers import SyncManager
+from typing import Dict, List, Optional, Tuple
+
+# ----------------------------------------------------------------------
+# Dedicated OCR server processes shared by all ingestion workers
+# ----------------------------------------------------------------------
+# Ingestion workers send the raw image blobs of one document as a request
+# on a shared queue. Each server drains requests from many documents into
+# one batch (up to max_batch images or linger_ms), runs EasyOCR once on
+# the whole batch and sends every document's texts back on the worker's
+# own reply queue. Only the servers hold an EasyOCR reader.
+
+
+def _serve(request_q, max_batch: int, linger_ms: int, threads: int, niceness: int, triage: Dict) -> None:
+    """Server loop: batch requests across documents, OCR, reply."""
+    try:
+        os.nice(niceness)  # yield CPU to tagging workers under contention
+    except (AttributeError, OSError):
+        pass
+    import torch
+    torch.set_num_threads(threads)
+    from .ingestion import LocalOCR
+    from .image_triage import ImageTriage
+    engine = LocalOCR(batch_size=max_batch, triage=ImageTriage(**triage))
+    logging.info(f"OCR server {os.getpid()} ready ({threads} threads, batch {max_batch})")
+
+    stopping = False
+    while not stopping:
+        first = request_q.get()
+        if first is None:
+            break
+        batch = [first]
+        size = len(first[2])
+        deadline = time.monotonic() + linger_ms / 1000.0
+        while size < max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                req = request_q.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if req is None:
+                stopping = True
+                break
+            batch.append(req)
+            size += len(req[2])
+
+        blobs = [blob for _, _, req_blobs in batch for blob in req_blobs]
+        try:
+            texts = engine.recognize(blobs)
+            outcomes = engine.last_outcomes
+        except Exception as e:
+            logging.warning(f"OCR server batch failed: {e}")
+            texts, outcomes = [None] * len(blobs), []
+
+        offset = 0
+        for req_id, reply_q, req_blobs in batch:
+            end = offset + len(req_blobs)
+            reply_q.put((req_id, texts[offset:end], outcomes[offset:end]))
+            offset = end
+
+
+class OCRService:
+    """
+    Parent-side owner of the OCR server processes.
+
+    Start it before the worker pool and pass `client_args()` to the pool
+    initializer; each worker then builds a RemoteOCR client from them.
+    `ctx` is the pool's multiprocessing context, so the queue and the
+    servers use the same start method as the workers.
+    """
+
+    def __init__(
+        self,
+        num_servers: int = 1,
+        max_batch: int = 32,
+        linger_ms: int = 50,
+        threads: int = 1,
+        niceness: int = 5,
+        triage: Optional[Dict] = None,
+        ctx=None,
+    ):
+        self.num_servers = max(1, num_servers)
+        self.max_batch = max_batch
+        self.linger_ms = linger_ms
+        self.threads = max(1, threads)
+        self.niceness = niceness
+        self.triage = triage or {}
+        self.ctx = ctx or multiprocessing.get_context()
+        self._manager: Optional[SyncManager] = None
+        self._request_q = None
+        self._servers: List[multiprocessing.Process] = []
+
+    def start(self) -> "OCRService":
+        self._manager = SyncManager(ctx=self.ctx)
+        self._manager.start()
+        # Bounded so workers block (backpressure) instead of piling up images
+        self._request_q = self.ctx.Queue(maxsize=self.num_servers * self.max_batch)
+        for _ in range(self.num_servers):
+            proc = self.ctx.Process(
+                target=_serve,
+                args=(
+                    self._request_q, self.max_batch, self.linger_ms,
+                    self.threads, self.niceness, self.triage,
+                ),
+                daemon=True,
+            )
+            proc.start()
+            self._servers.append(proc)
+        logging.info(f"Started {self.num_servers} OCR server(s)")
+        return self
+
+    def client_args(self) -> Tuple:
+        """Picklable arguments for RemoteOCR, passed through Pool initargs."""
+        return (self._request_q, self._manager.address)
+
+    def stop(self, timeout: float = 30.0) -> None:
+        for _ in self._servers:
+            self._request_q.put(None)
+        for proc in self._servers:
+            proc.join(timeout)
+            if proc.is_alive():
+                proc.terminate()
+        self._servers = []
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+    def __enter__(self) -> "OCRService":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+class RemoteOCR:
+    """
+    Worker-side client with the same recognize(blobs) / last_outcomes
+    interface as LocalOCR. Blocks until the service answers this worker.
+    """
+
+    def __init__(self, request_q, manager_address, timeout: float = 600.0):
+        self.request_q = request_q
+        self.timeout = timeout
+        manager = SyncManager(address=manager_address)
+        manager.connect()
+        self.reply_q = manager.Queue()
+        self._ids = itertools.count()
+        self.last_outcomes: List[str] = []
+
+    def recognize(self, blobs: List[bytes]) -> List[Optional[str]]:
+        if not blobs:
+            return []
+        req_id = (os.getpid(), next(self._ids))
+        self.request_q.put((req_id, self.reply_q, list(blobs)))
+        deadline = time.monotonic() + self.timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"OCR service did not answer within {self.timeout:.0f}s")
+            try:
+                reply_id, texts, outcomes = self.reply_q.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if reply_id == req_id:  # drop late replies to earlier, timed-out requests
+                self.last_outcomes = outcomes
+                return texts
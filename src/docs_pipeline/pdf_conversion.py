@@ -0,0 +1,258 @@
+# src/docs_pipeline/pdf_conversion.py
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, Iterable, Iterator, Optional
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from .llm_export import JsonArrayWriter
+
+
+class PDFConverter:
+    """
+    The original renderer: reloads a debug JSON file and lays it out as one
+    platypus Paragraph per line. Kept for existing callers and as the
+    benchmark baseline; the pipeline uses ChunkPDFWriter.
+    """
+
+    def convert(self, json_file: str, pdf_file: str) -> None:
+        # platypus is imported here: it is most of reportlab's import time,
+        # which every BackgroundPDFWriter process would otherwise pay
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib import colors
+
+        with open(json_file, 'r', encoding='utf-8') as f:
+            json_data = json.load(f)
+        pretty_json = json.dumps(json_data, indent=4, ensure_ascii=False)
+        doc = SimpleDocTemplate(pdf_file, pagesize=letter)
+        styles = getSampleStyleSheet()
+        json_style = ParagraphStyle(
+            name='JsonStyle',
+            fontName='Courier',
+            fontSize=10,
+            leading=12,
+            textColor=colors.black,
+            spaceBefore=6,
+            spaceAfter=6
+        )
+        story = []
+        story.append(Paragraph(f"JSON Output: {os.path.basename(json_file)}", styles['Title']))
+        story.append(Spacer(1, 12))
+        for line in pretty_json.splitlines():
+            # Escape HTML entities to prevent PDF rendering issues
+            formatted_line = (
+                line.replace('&', '&amp;')
+                    .replace('<', '&lt;')
+                    .replace('>', '&gt;')
+                    .replace(' ', '&nbsp;')
+            )
+            story.append(Paragraph(formatted_line, json_style))
+        doc.build(story)
+
+
+# ----------------------------------------------------------------------
+# Streaming renderer — tagged chunks straight onto a canvas
+# ----------------------------------------------------------------------
+# The page content is the same pretty-printed JSON array as json/<name>.json
+# (serialized by JsonArrayWriter), drawn as preformatted Courier lines with
+# one text object per page. No JSON reload, no per-line Paragraph layout
+# and no entity escaping; lines wider than the page wrap at a space (or
+# mid-word when there is none).
+
+class _LineSink:
+    """File-like target for JsonArrayWriter that hands complete lines on."""
+
+    def __init__(self, emit):
+        self.emit = emit
+        self.pending = ""
+
+    def write(self, text: str) -> None:
+        lines = (self.pending + text).split("\n")
+        self.pending = lines.pop()
+        for line in lines:
+            self.emit(line)
+
+    def flush(self) -> None:
+        if self.pending:
+            self.emit(self.pending)
+            self.pending = ""
+
+
+class ChunkPDFWriter:
+    """
+    Incremental PDF of a document's tagged chunks: write(chunk) renders one
+    chunk, close() finishes the file. Pages are drawn as soon as they fill.
+    """
+
+    FONT = "Courier"
+    FONT_SIZE = 10
+    LEADING = 12
+    MARGIN = 72
+
+    def __init__(self, pdf_file: str, title: str):
+        self.pdf_file = pdf_file
+        self.count = 0
+        self.pages = 0
+        width, height = letter
+        self._top = height - self.MARGIN
+        self._bottom = self.MARGIN
+        self._columns = int((width - 2 * self.MARGIN) // (self.FONT_SIZE * 0.6))  # Courier is 0.6 em wide
+        os.makedirs(os.path.dirname(pdf_file) or ".", exist_ok=True)
+        self._canvas = canvas.Canvas(pdf_file, pagesize=letter, pageCompression=1)
+        self._canvas.setTitle(title)
+        self._canvas.setFont("Helvetica-Bold", 18)
+        self._canvas.drawCentredString(width / 2, self._top - 18, title)
+        self._text = self._new_text(self._top - 18 - 30)
+        self._sink = _LineSink(self._line)
+        self._array = JsonArrayWriter(self._sink, indent=4)
+
+    def _new_text(self, y: float):
+        text = self._canvas.beginText(self.MARGIN, y)
+        text.setFont(self.FONT, self.FONT_SIZE, self.LEADING)
+        return text
+
+    def _wrap(self, line: str) -> Iterator[str]:
+        if len(line) <= self._columns:
+            yield line
+            return
+        indent = " " * min(len(line) - len(line.lstrip(" ")), self._columns // 2)
+        prefix, rest = "", line
+        while len(prefix) + len(rest) > self._columns:
+            width = self._columns - len(prefix)
+            cut = rest.rfind(" ", width // 2, width)  # break at a space when there is one
+            cut = width if cut < 0 else cut + 1
+            yield prefix + rest[:cut]
+            prefix, rest = indent, rest[cut:]
+        yield prefix + rest
+
+    def _line(self, line: str) -> None:
+        for piece in self._wrap(line):
+            if self._text.getY() < self._bottom:
+                self._end_page()
+                self._text = self._new_text(self._top - self.FONT_SIZE)
+            self._text.textLine(piece)
+
+    def _end_page(self) -> None:
+        self._canvas.drawText(self._text)
+        self._canvas.showPage()
+        self.pages += 1
+
+    def write(self, chunk: Dict) -> None:
+        self._array.write(chunk)
+        self.count += 1
+
+    def close(self) -> str:
+        if self._canvas is not None:
+            self._array.close()
+            self._sink.flush()
+            self._end_page()
+            self._canvas.save()
+            self._canvas = None
+        return self.pdf_file
+
+    def __enter__(self) -> "ChunkPDFWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def render_chunks(chunks: Iterable[Dict], pdf_file: str, title: str) -> str:
+    """Render a whole list of tagged chunks (see ChunkPDFWriter)."""
+    with ChunkPDFWriter(pdf_file, title) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    return pdf_file
+
+
+class BackgroundPDFWriter:
+    """
+    ChunkPDFWriter in a child process, so rendering runs on another core
+    while the worker tags: reportlab is pure Python and holds the GIL, so
+    on a thread it only took turns with tagging (benchmarks/bench_pdf.py).
+    Chunks go down the child's stdin as JSON lines; the pipe buffer bounds
+    what is pending and blocks the worker when the renderer falls behind.
+    close() waits for the file and raises any rendering error, abort()
+    kills the child and removes the partial file. The child is a plain
+    subprocess: pool workers are daemonic and may not start
+    multiprocessing children.
+    """
+
+    _END = "\n"  # a JSON line is never empty
+
+    def __init__(self, pdf_file: str, title: str):
+        self.pdf_file = pdf_file
+        self.count = 0
+        self._error: Optional[BaseException] = None
+        self._stderr = tempfile.TemporaryFile()
+        env = dict(os.environ)
+        package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env["PYTHONPATH"] = os.pathsep.join(p for p in (package_root, env.get("PYTHONPATH")) if p)
+        self._proc = subprocess.Popen(
+            [sys.executable, "-m", __name__, pdf_file, title],
+            stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=self._stderr,
+            env=env, text=True, encoding="utf-8",
+        )
+
+    def write(self, chunk: Dict) -> None:
+        if self._error is not None:
+            return
+        try:
+            self._proc.stdin.write(json.dumps(chunk, ensure_ascii=False) + "\n")
+            self.count += 1
+        except (TypeError, ValueError, OSError) as e:  # unserializable chunk, or the child died
+            self._error = e
+
+    def close(self) -> str:
+        if self._error is None:
+            try:
+                self._proc.stdin.write(self._END)
+            except OSError as e:
+                self._error = e
+        try:
+            self._proc.stdin.close()
+        except OSError:
+            pass
+        self._proc.wait()
+        self._stderr.seek(0)
+        stderr = self._stderr.read().decode("utf-8", "replace").strip()
+        self._stderr.close()
+        if self._error is None and self._proc.returncode != 0:
+            self._error = RuntimeError(stderr.splitlines()[-1] if stderr else f"exit code {self._proc.returncode}")
+        if self._error is not None:
+            if os.path.exists(self.pdf_file):
+                os.remove(self.pdf_file)
+            raise RuntimeError(f"PDF rendering failed for {self.pdf_file}: {self._error}") from self._error
+        return self.pdf_file
+
+    def abort(self) -> None:
+        self._proc.kill()
+        self._proc.wait()
+        for stream in (self._proc.stdin, self._stderr):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        if os.path.exists(self.pdf_file):
+            os.remove(self.pdf_file)
+
+
+def _render_stdin(pdf_file: str, title: str) -> int:
+    """BackgroundPDFWriter's child: render JSON lines from stdin until the end marker."""
+    lines = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8")
+    writer = ChunkPDFWriter(pdf_file, title)
+    for line in lines:
+        if line == BackgroundPDFWriter._END:
+            writer.close()
+            return 0
+        writer.write(json.loads(line))
+    return 1  # stdin closed without the end marker: the worker died; nothing is saved
+
+
+if __name__ == "__main__":
+    sys.exit(_render_stdin(*sys.argv[1:3]))
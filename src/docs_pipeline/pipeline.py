@@ -0,0 +1,907 @@
+# src/docs_pipeline/pipeline.py
+import os
+import sys
+import json
+import time
+import shutil
+import signal
+import argparse
+import logging
+import tempfile
+from contextlib import ExitStack
+from typing import IO, Dict, Iterable, List, NamedTuple, Optional, Union
+from functools import partial
+from collections import Counter
+from multiprocessing import cpu_count, get_context
+
+# ----------------------------------------------------------------------
+# 1. Imports — models live in workers.py (loaded once per worker process)
+# ----------------------------------------------------------------------
+# Only lightweight modules are imported here. spaCy/NLTK (tagging), EasyOCR
+# and torch (ingestion, ocr_service) and reportlab (pdf_conversion) are
+# imported by the stage that needs them, so --help, an empty input
+# directory or a run without --ocr_images/--to_pdf never pays for them —
+# neither in this process nor in each spawned worker.
+from .cleaning import TextCleaner
+from .chunking import TextChunker
+from .utils import get_files_with_extension, input_key, read_file_list
+from .manifest import ANNOTATION_KEYS, BuildManifest, file_digest, output_paths, settings_fingerprint
+from .workers import (
+    init_worker, preload_models, get_tagger, get_ingester,
+    fork_available, memory_snapshot, summarize_worker_memory, ocr_cache_stats
+)
+from .llm_export import EXPORTERS, ChunkExporter, JsonArrayWriter, with_global_chunk_id
+from .corpus_writer import ShardedCorpusWriter
+from .columnar import FORMATS as COLUMNAR_FILES
+from .stage_cache import StageCache
+from .scheduler import CostHistory, file_features, longest_first, schedule_efficiency
+from .supervisor import Supervisor, WorkerInitError, error_record, hard_timeout
+from .journal import ErrorLog, RunJournal
+from .sharding import parse_shard, shard_dir, shard_of
+from .instrumentation import track, build_report, write_report, format_stage_table, profile_call
+
+# Records of files processed with --no_per_file, left here by the worker for
+# the parent to copy into the combined outputs (and then removed)
+PARTS_DIR = ".corpus_parts"
+
+# ----------------------------------------------------------------------
+# 2. Worker function — reuses the worker's resident TextTagger/ingester
+# ----------------------------------------------------------------------
+class FileOutputs(NamedTuple):
+    """Where one file's outputs go (None: not written)."""
+
+    json: Optional[str]
+    pdf: Optional[str]
+    llm: Dict[str, Optional[str]]  # format -> per-file output
+    vectors: Optional[str]
+    columnar: Optional[str]
+    # What the parent copies into the combined outputs: the per-file
+    # outputs, or part files under PARTS_DIR when there are none
+    corpus: Dict[str, str]
+    corpus_vectors: Optional[str]
+    corpus_columnar: Optional[str]
+
+    def per_file_paths(self) -> List[str]:
+        return [p for p in (self.json, self.pdf, self.vectors, self.columnar, *self.llm.values()) if p]
+
+    def all_paths(self) -> List[str]:
+        """Everything this file writes, to remove if it fails halfway."""
+        paths = [*self.per_file_paths(), *self.corpus.values(), self.corpus_vectors, self.corpus_columnar]
+        return [p for p in dict.fromkeys(paths) if p]
+
+
+def plan_outputs(
+    output_dir: str,
+    base_name: str,
+    formats: List[str],
+    per_file: bool,
+    capture_corpus: bool,
+    to_pdf: bool,
+    vectors: Optional[str],
+    columnar: Optional[str],
+) -> FileOutputs:
+    """Output paths of one file; `base_name` mirrors its key without the extension."""
+    def path(*parts: str) -> str:
+        return os.path.join(output_dir, *parts)
+
+    llm = {fmt: path("llm", fmt, f"{base_name}.{EXPORTERS[fmt][1]}") if per_file else None for fmt in formats}
+    vectors_file = path("vectors", f"{base_name}.npy") if per_file and vectors else None
+    columnar_file = path("columnar", f"{base_name}.{columnar}") if per_file and columnar else None
+    corpus, corpus_vectors, corpus_columnar = {}, None, None
+    if capture_corpus:
+        corpus = {
+            fmt: llm[fmt] or path(PARTS_DIR, fmt, f"{base_name}.jsonl")
+            for fmt in formats if EXPORTERS[fmt][1] == "jsonl"
+        }
+        if vectors:
+            corpus_vectors = vectors_file or path(PARTS_DIR, "vectors", f"{base_name}.npy")
+        if columnar:
+            corpus_columnar = columnar_file or path(PARTS_DIR, "columnar", f"{base_name}.{columnar}")
+    return FileOutputs(
+        json=path("json", f"{base_name}.json") if per_file else None,
+        pdf=path("pdf", f"{base_name}.pdf") if to_pdf else None,
+        llm=llm, vectors=vectors_file, columnar=columnar_file,
+        corpus=corpus, corpus_vectors=corpus_vectors, corpus_columnar=corpus_columnar,
+    )
+
+
+def spool_text(file_path: str, ocr_images: bool, metrics, sidecar: IO[str]) -> int:
+    """
+    Ingest and clean the document in one pass, writing each cleaned block's
+    words to `sidecar` (a line per block) for the chunker. Returns the word
+    count, which chunk_position needs before the first chunk is tagged.
+    """
+    with metrics.stage("ingest"):
+        document = get_ingester().open(file_path, ocr_images=ocr_images)
+    blocks = metrics.timed(document, "ingest", count="paragraphs")
+    n_words = 0
+    for block in metrics.timed(TextCleaner().clean_stream(blocks), "clean"):
+        words = block.split()
+        if words:
+            sidecar.write(" ".join(words) + "\n")
+            n_words += len(words)
+    sidecar.seek(0)
+    metrics.count("words", n_words)
+    return n_words
+
+
+def export_chunks(
+    tagged_chunks: Iterable[Dict],
+    outputs: FileOutputs,
+    file_name: str,
+    vectors: Optional[str],
+    vector_dim: int,
+    pdf_writer,
+    metrics,
+) -> None:
+    """Write each tagged chunk to the JSON, export, vector, columnar and PDF outputs as it arrives."""
+    if outputs.json:
+        os.makedirs(os.path.dirname(outputs.json), exist_ok=True)
+    with ExitStack() as stack:
+        exporters = [
+            stack.enter_context(ChunkExporter(fmt, path or outputs.corpus[fmt], source_name=file_name))
+            for fmt, path in outputs.llm.items() if path or fmt in outputs.corpus
+        ]
+        debug = None
+        if outputs.json:
+            debug = JsonArrayWriter(stack.enter_context(open(outputs.json, "w", encoding="utf-8")), indent=4)
+        # Chunk vectors, one row per exported record (a chunk that failed
+        # to tag gets a zero row)
+        vector_writer = None
+        vectors_out = outputs.vectors or outputs.corpus_vectors
+        if vectors_out:
+            import numpy as np
+            from .vectors import NpyWriter
+            vector_writer = stack.enter_context(NpyWriter(vectors_out, vectors, vector_dim))
+        # The same rows as a typed table, converted a batch of chunks at a time
+        columnar_writer, columnar_batch = None, []
+        columnar_out = outputs.columnar or outputs.corpus_columnar
+        if columnar_out:
+            from .columnar import BATCH as COLUMNAR_BATCH, ColumnarWriter, chunk_table
+            columnar_writer = stack.enter_context(ColumnarWriter(columnar_out))
+        for chunk in tagged_chunks:
+            vector = chunk.pop("vector", None)
+            if vector_writer:
+                vector_writer.append(vector if vector is not None else np.zeros(vector_writer.dim, vectors))
+            with metrics.stage("export"):
+                # ---- ENSURE policy_keywords exists (defense in depth) ----
+                if "policy_keywords" not in chunk:
+                    chunk["policy_keywords"] = []
+                if debug:
+                    debug.write(chunk)
+                for exporter in exporters:
+                    exporter.write(chunk)
+                if pdf_writer:
+                    pdf_writer.write(chunk)
+                if columnar_writer:
+                    columnar_batch.append(chunk)
+                    if len(columnar_batch) == COLUMNAR_BATCH:
+                        columnar_writer.append(chunk_table(columnar_batch))
+                        columnar_batch = []
+        with metrics.stage("export"):
+            if columnar_batch:
+                columnar_writer.append(chunk_table(columnar_batch))
+            if debug:
+                debug.close()
+            stack.close()
+
+
+def process_single(
+    file_path: str,
+    output_dir: str,
+    chunk_size: int,
+    overlap: int,
+    ocr_images: bool,
+    to_pdf: bool,
+    export_format: Union[str, List[str]],
+    config_path: str = "config.yaml",
+    per_file: bool = True,
+    capture_corpus: bool = False,
+    input_root: Optional[str] = None,
+    stage_cache: Optional[str] = None,
+    analysis_key: Optional[str] = None,
+    vectors: Optional[str] = None,
+    columnar: Optional[str] = None,
+) -> dict:
+    """
+    Process a single .docx file.
+    `export_format` is one format or a list; ingestion and tagging run once
+    and every chunk fans out to each format's exporter.
+    Returns dict with paths to generated files ("llm" maps format -> path,
+    None when `per_file` is off), the number of "chunks" (0 for an empty
+    document, whatever "llm" holds), the worker's memory snapshot and the
+    file's per-stage timings ("metrics", see instrumentation.py). With
+    `capture_corpus`, "corpus" maps each JSONL format to the file holding
+    this file's records, for the parent to stream into the combined corpus:
+    the per-file output, or with `per_file` off a part file under
+    PARTS_DIR. Per-file outputs mirror the file's subdirectory under
+    `input_root`. With a `stage_cache` directory, a document already
+    analysed under the same `analysis_key` (see stage_cache.py) skips
+    ingestion and spaCy and is only re-annotated. With `vectors` (a dtype)
+    every chunk's vector goes to vectors/<key>.npy (see vectors.py); with
+    `columnar` ("parquet" or "arrow") the chunks also go to
+    columnar/<key>.<ext> as a typed table (see columnar.py). With
+    `capture_corpus`, "corpus_vectors" and "corpus_columnar" name those
+    files (or their part files) likewise. Records are written as chunks are
+    tagged; neither the worker nor the parent holds a whole file's output.
+
+    The stages are helpers: spool_text (ingest + clean, once), the chunker
+    and tagger streams, plan_outputs and export_chunks.
+    """
+    formats = [export_format] if isinstance(export_format, str) else list(export_format)
+    file_name = os.path.basename(file_path)
+    base_name = os.path.splitext(input_key(file_path, input_root))[0]
+    outputs = plan_outputs(output_dir, base_name, formats, per_file, capture_corpus, to_pdf, vectors, columnar)
+    ocr_before = ocr_cache_stats()
+    partial_outputs = []
+    pdf_writer = None
+    cache_writer = None
+    with track(file_name) as metrics, ExitStack() as resources:
+        result = {"file": file_path, "chunks": 0, "json": None, "pdf": None, "llm": None, "vectors": None,
+                  "columnar": None, "corpus": None, "corpus_vectors": None, "corpus_columnar": None,
+                  "memory": None, "ocr_cache": None}
+        try:
+            chunker = TextChunker(chunk_size=chunk_size, overlap=overlap)
+            # ---- STAGE CACHE: chunks and entities from an earlier run ----
+            cache = StageCache(stage_cache) if stage_cache and analysis_key else None
+            cache_key = StageCache.make_key(file_digest(file_path), analysis_key) if cache else None
+            cached = cache.load(cache_key) if cache else None
+            if cached:
+                header, rows = cached
+                metrics.count("stage_cache_hits")
+                metrics.count("words", header["words"])
+                total_chunks = header["chunks"]
+            else:
+                # ---- INGESTION + CLEAN, once; the words wait in a sidecar ----
+                # (chunk_position needs the chunk count before tagging starts)
+                sidecar = resources.enter_context(tempfile.TemporaryFile("w+", encoding="utf-8"))
+                n_words = spool_text(file_path, ocr_images, metrics, sidecar)
+                total_chunks = chunker.count_chunks(n_words)
+                if cache:
+                    metrics.count("stage_cache_misses")
+                    cache_writer = cache.writer(cache_key, total_chunks, n_words, vectors=vectors)
+            result["chunks"] = total_chunks
+            if total_chunks == 0:
+                logging.warning(f"Empty document after ingestion: {file_name}")
+                if cache_writer:
+                    cache_writer.commit()
+                result["metrics"] = metrics.to_dict()
+                return result
+
+            # ---- CHUNK → TAG, one chunk at a time ----
+            tagger = get_tagger(config_path)
+            if cached:
+                # Only keywords and intents are recomputed
+                tagged_chunks = metrics.timed(tagger.annotate_stream(rows, file_name, total_chunks), "tag")
+            else:
+                chunks = metrics.timed(chunker.chunk_stream(sidecar), "chunk", count="chunks")
+                tagged_chunks = metrics.timed(tagger.tag_stream(chunks, file_name, total_chunks, vectors=vectors), "tag")
+                if cache_writer:
+                    tagged_chunks = cache_writer.recorded(tagged_chunks)
+
+            partial_outputs = outputs.all_paths()
+            # PDF is rendered from the tagged chunks in a child process
+            if to_pdf:
+                from .pdf_conversion import BackgroundPDFWriter
+                pdf_writer = BackgroundPDFWriter(outputs.pdf, f"JSON Output: {base_name}.json")
+
+            # ---- JSON (debug) + LLM EXPORT (+ PDF), written as chunks are tagged ----
+            export_chunks(tagged_chunks, outputs, file_name, vectors, tagger.vector_dim, pdf_writer, metrics)
+
+            # ---- PDF (optional): wait for the renderer process ----
+            if pdf_writer:
+                with metrics.stage("pdf"):
+                    pdf_writer.close()
+            if cache_writer:
+                cache_writer.commit()
+
+            print(f"Done: {file_name} ({', '.join(formats)})")
+            ocr_after = ocr_cache_stats()
+            metrics.count("bytes_written", sum(os.path.getsize(p) for p in outputs.per_file_paths()))
+            metrics.count("corpus_bytes", sum(os.path.getsize(p) for p in outputs.corpus.values()))
+            result.update({
+                "json": outputs.json, "pdf": outputs.pdf, "llm": outputs.llm, "vectors": outputs.vectors,
+                "columnar": outputs.columnar,
+                "corpus": outputs.corpus if capture_corpus else None,
+                "corpus_vectors": outputs.corpus_vectors,
+                "corpus_columnar": outputs.corpus_columnar,
+                "memory": memory_snapshot(),
+                "ocr_cache": {k: ocr_after[k] - ocr_before[k] for k in ocr_after},
+            })
+
+        except Exception as e:
+            # Don't leave half-written outputs behind for the corpus or manifest
+            if pdf_writer:
+                pdf_writer.abort()
+            if cache_writer:
+                cache_writer.abort()
+            for path in partial_outputs:
+                if os.path.exists(path):
+                    os.remove(path)
+            # Reported by the parent (errors.jsonl), not printed here
+            result["error"] = error_record(e)
+        result["metrics"] = metrics.to_dict()
+        return result
+
+
+def copy_records(key, corpus, vectors_path, columnar_path, corpus_writers, vector_writer, columnar_writer) -> None:
+    """
+    Append one file's records to the combined outputs, streamed from the
+    files that hold them: `corpus` maps each format to a JSONL file, and
+    `vectors_path` / `columnar_path` (if any) hold the matching rows. Each
+    record gets the `global_chunk_id` of its input `key`, as in `docs merge`.
+
+    Records come through disk rather than over a result queue on purpose:
+    the per-file outputs are written anyway (incremental builds and `docs
+    merge` reuse them) and files reused from an earlier run only exist
+    there; a file's records reach the corpus only once its worker has
+    finished it, so a file that times out, crashes its worker or is
+    retried by the supervisor never leaves half its records behind; and
+    only paths cross the process boundary, so the pool's result pipe stays
+    small. Without per-file outputs (--no_per_file) workers write part
+    files for the same reasons. Reading back a file just written is
+    usually served from the page cache.
+    """
+    for fmt, writer in corpus_writers.items():
+        with open(corpus[fmt], "r", encoding="utf-8") as in_f:
+            for line in in_f:
+                if line.strip():
+                    writer.write_line(with_global_chunk_id(line, key, fmt))
+    if vector_writer and vectors_path:
+        from .vectors import copy_rows
+        copy_rows(vector_writer, vectors_path)
+    if columnar_writer and columnar_path:
+        columnar_writer.copy(columnar_path)
+
+
+# ----------------------------------------------------------------------
+# 3. CLI entry point
+# ----------------------------------------------------------------------
+def main(argv: Optional[List[str]] = None, prog: Optional[str] = None) -> int:
+    """Run the pipeline (`python src/pipeline.py ...` or `docs run ...`)."""
+    parser = argparse.ArgumentParser(prog=prog, description="Universal RAG Document Optimizer")
+    parser.add_argument("--input_dir", default=None, help="Directory with .docx files")
+    parser.add_argument(
+        "--file_list", default=None,
+        help="Text file with one .docx path per line (relative to the list file), instead of or "
+             "within --input_dir"
+    )
+    parser.add_argument("--recursive", action="store_true", help="Also take .docx files in subdirectories of --input_dir")
+    parser.add_argument(
+        "--shard", type=parse_shard, default=None, metavar="K/N",
+        help="Process only shard K of N (by a stable hash of each file's path); outputs go to "
+             "<output_dir>/shard-K-of-N, to be combined with `docs merge`"
+    )
+    parser.add_argument("--output_dir", default="output", help="Root output directory")
+    parser.add_argument("--chunk_size", type=int, default=500, help="Words per chunk")
+    parser.add_argument("--overlap", type=int, default=100, help="Word overlap between chunks")
+    parser.add_argument("--ocr_images", action="store_true", help="Enable OCR on images")
+    parser.add_argument(
+        "--ingest_mode", choices=["fast", "docx"], default="fast",
+        help="fast: stream word/document.xml (+ headers, footers, tables); docx: python-docx"
+    )
+    parser.add_argument("--to_pdf", action="store_true", help="Generate PDF output")
+    parser.add_argument(
+        "--tagging-profile", dest="tagging_profile", choices=["fast", "balanced", "full"], default="full",
+        help="fast: keywords+intents, no spaCy; balanced: en_core_web_sm / EntityRuler; full: en_core_web_lg"
+    )
+    parser.add_argument(
+        "--export-format",
+        nargs="+",
+        choices=list(EXPORTERS) + ["all"],
+        default=["bedrock"],
+        help="Target LLM format(s); several may be given, or 'all'"
+    )
+    parser.add_argument("--workers", type=int, default=min(4, cpu_count()), help="Parallel workers")
+    parser.add_argument(
+        "--preload", action="store_true",
+        help="Load spaCy in the parent and fork workers from it (shares model memory copy-on-write)"
+    )
+    parser.add_argument(
+        "--ocr_cache", default=None,
+        help="OCR cache file (default: <output_dir>/ocr_cache.sqlite)"
+    )
+    parser.add_argument("--no_ocr_cache", action="store_true", help="Disable the OCR result cache")
+    parser.add_argument("--ocr_cache_size", type=int, default=100_000, help="Max cached OCR results (LRU)")
+    parser.add_argument(
+        "--ocr_servers", type=int, default=1,
+        help="OCR server processes shared by all workers (0 = EasyOCR inside each worker)"
+    )
+    parser.add_argument("--ocr_threads", type=int, default=1, help="CPU threads per OCR server")
+    parser.add_argument("--ocr_batch", type=int, default=32, help="Max images per cross-document OCR batch")
+    parser.add_argument("--ocr_min_edge", type=int, default=32, help="Skip images with a shorter edge (px)")
+    parser.add_argument("--ocr_max_edge", type=int, default=2048, help="Downscale images with a longer edge (px)")
+    parser.add_argument(
+        "--ocr_min_entropy", type=float, default=1.0,
+        help="Skip near-blank images below this grayscale entropy (bits, 0 disables)"
+    )
+    parser.add_argument("--ocr_grayscale", action="store_true", help="OCR grayscale arrays (less memory)")
+    parser.add_argument(
+        "--stage_cache", default=None,
+        help="Directory of per-document chunks and entities, reused when only keywords/intents "
+             "change (default: <output_dir>/stage_cache)"
+    )
+    parser.add_argument("--no_stage_cache", action="store_true", help="Disable the stage cache")
+    parser.add_argument(
+        "--shard_max_records", type=int, default=0,
+        help="Roll each combined corpus into shards of at most N records (0 = no limit)"
+    )
+    parser.add_argument(
+        "--shard_max_mb", type=float, default=0,
+        help="Roll each combined corpus into shards of at most N MB (0 = no limit; "
+             "Bedrock Knowledge Base sources are capped at 50 MB per file)"
+    )
+    parser.add_argument(
+        "--dedup", choices=["drop", "collapse"], default=None,
+        help="Remove near-duplicate chunks from the combined corpora (MinHash/LSH) once the run is done: "
+             "drop the copies, or collapse them into the first one in key order, which then lists every "
+             "source. Per-file outputs keep their duplicates"
+    )
+    parser.add_argument(
+        "--dedup_threshold", type=float, default=0.9,
+        help="Estimated Jaccard similarity of word 5-grams from which chunks count as duplicates"
+    )
+    parser.add_argument(
+        "--vectors", nargs="?", const="float32", choices=["float32", "float16"], default=None,
+        help="Also write each chunk's spaCy word-vector mean to vectors.npy, row-aligned with the "
+             "combined corpora (full profile only; default dtype float32)"
+    )
+    parser.add_argument(
+        "--columnar", nargs="?", const="parquet", choices=list(COLUMNAR_FILES), default=None,
+        help="Also write every chunk as a row of a typed table, chunks.parquet (default) or chunks.arrow, "
+             "row-aligned with the combined corpora (needs pyarrow)"
+    )
+    parser.add_argument(
+        "--no_per_file", action="store_true",
+        help="Only write the combined corpora; skip per-file llm/ and json/ outputs "
+             "(PDFs are still written with --to_pdf). Files are then always reprocessed."
+    )
+    parser.add_argument(
+        "--report", default=None,
+        help="Run report with per-stage timings (default: <output_dir>/run_report.json)"
+    )
+    parser.add_argument(
+        "--profile", metavar="DOCX", default=None,
+        help="Profile the processing of this one file in-process and exit"
+    )
+    parser.add_argument(
+        "--profiler", choices=["cprofile", "pyinstrument"], default="cprofile",
+        help="Profiler used by --profile (pyinstrument must be installed)"
+    )
+    parser.add_argument(
+        "--schedule", choices=["cost", "input"], default="cost",
+        help="cost: dispatch files longest-first by estimated cost; input: input order"
+    )
+    parser.add_argument(
+        "--file_timeout", type=float, default=0,
+        help="Per-file wall-clock limit in seconds (0 = none); the file is then retried or marked failed"
+    )
+    parser.add_argument("--retries", type=int, default=1, help="Extra attempts for a failed, timed-out or crashed file")
+    parser.add_argument(
+        "--max_tasks_per_child", type=int, default=0,
+        help="Replace each worker after N files (0 = never); bounds memory growth at the cost of reloading models"
+    )
+    rerun = parser.add_mutually_exclusive_group()
+    rerun.add_argument(
+        "--force", action="store_true",
+        help="Ignore the build manifest and reprocess every file"
+    )
+    rerun.add_argument(
+        "--resume", action="store_true",
+        help="Continue an interrupted run: reuse files its journal.jsonl records as done"
+    )
+
+    args = parser.parse_args(argv)
+    if not (args.input_dir or args.file_list or args.profile):
+        parser.error("one of --input_dir or --file_list is required")
+    if args.vectors and args.tagging_profile != "full":
+        parser.error("--vectors needs the word vectors of the full tagging profile (en_core_web_lg)")
+    if args.columnar:
+        from .columnar import require_pyarrow
+        try:
+            require_pyarrow()
+        except ImportError as e:
+            parser.error(str(e))
+    run_started = time.perf_counter()
+    if args.shard:
+        args.output_dir = shard_dir(args.output_dir, *args.shard)
+    os.makedirs(args.output_dir, exist_ok=True)
+    export_formats = list(EXPORTERS) if "all" in args.export_format else list(dict.fromkeys(args.export_format))
+    ocr_cache_path = None
+    if args.ocr_images and not args.no_ocr_cache:
+        ocr_cache_path = args.ocr_cache or os.path.join(args.output_dir, "ocr_cache.sqlite")
+    triage = {
+        "min_edge": args.ocr_min_edge,
+        "max_edge": args.ocr_max_edge,
+        "min_entropy": args.ocr_min_entropy,
+        "grayscale": args.ocr_grayscale,
+    }
+
+    # Profile one file in this process — no pool, manifest or combined corpus
+    if args.profile:
+        init_worker(
+            "config.yaml", args.ocr_images, ocr_cache_path, args.ocr_cache_size, None, triage,
+            args.ingest_mode, args.tagging_profile,
+        )
+        base = os.path.join(args.output_dir, "profile_" + os.path.splitext(os.path.basename(args.profile))[0])
+        res = profile_call(
+            lambda: process_single(
+                args.profile, args.output_dir, args.chunk_size, args.overlap, args.ocr_images,
+                args.to_pdf, export_formats, "config.yaml",
+            ),
+            base, profiler=args.profiler,
+        )
+        if res.get("error"):
+            print(res["error"]["traceback"])
+        print(json.dumps(res["metrics"], indent=2))
+        return 0
+
+    # Inputs are keyed by their path relative to the input root: stable across
+    # hosts and mount points, and distinct for same-named files in subdirectories
+    if args.file_list:
+        docx_files = read_file_list(args.file_list)
+        input_root = args.input_dir or os.path.dirname(os.path.abspath(args.file_list))
+    else:
+        docx_files = get_files_with_extension(args.input_dir, ".docx", recursive=args.recursive)
+        input_root = args.input_dir
+    keys = {path: input_key(path, input_root) for path in docx_files}
+    if len(set(keys.values())) < len(keys):
+        clashes = sorted(k for k, count in Counter(keys.values()).items() if count > 1)
+        print(f"Inputs outside {input_root} share a file name: {', '.join(clashes[:5])}")
+        return 1
+    if args.shard:
+        k, n = args.shard
+        total = len(docx_files)
+        docx_files = [path for path in docx_files if shard_of(keys[path], n) == k]
+        print(f"Shard {k}/{n}: {len(docx_files)} of {total} files -> {args.output_dir}")
+    if not docx_files:
+        print("No .docx files found.")
+        return 0
+
+    # Incremental build — skip files whose bytes and effective settings are unchanged
+    manifest = BuildManifest(args.output_dir)
+    fingerprint = settings_fingerprint(
+        "config.yaml",
+        chunk_size=args.chunk_size,
+        overlap=args.overlap,
+        ocr_images=args.ocr_images,
+        ingest_mode=args.ingest_mode,
+        tagging_profile=args.tagging_profile,
+        ocr_triage=[args.ocr_min_edge, args.ocr_max_edge, args.ocr_min_entropy, args.ocr_grayscale],
+        to_pdf=args.to_pdf,
+        export_format=sorted(export_formats),
+        per_file=not args.no_per_file,
+        vectors=args.vectors,
+        columnar=args.columnar,
+    )
+    # Settings that shape chunks and entities; keyword and intent edits leave it
+    # unchanged, so the stage cache still applies
+    analysis_fingerprint = settings_fingerprint(
+        "config.yaml",
+        ignore=ANNOTATION_KEYS,
+        chunk_size=args.chunk_size,
+        overlap=args.overlap,
+        ocr_images=args.ocr_images,
+        ingest_mode=args.ingest_mode,
+        tagging_profile=args.tagging_profile,
+        ocr_triage=[args.ocr_min_edge, args.ocr_max_edge, args.ocr_min_entropy, args.ocr_grayscale],
+        vectors=args.vectors,
+    )
+    stage_cache_dir = None
+    if not args.no_stage_cache:
+        stage_cache_dir = args.stage_cache or os.path.join(args.output_dir, "stage_cache")
+    pruned = manifest.prune(keys.values())
+    if pruned:
+        print(f"Pruned outputs of {len(pruned)} deleted inputs")
+
+    # Unchanged files are only reused if their per-file records can be fed
+    # back into the combined corpora
+    jsonl_formats = [fmt for fmt in export_formats if EXPORTERS[fmt][1] == "jsonl"]
+    hashes = {path: file_digest(path) for path in docx_files}
+
+    # Files an interrupted run finished (per its journal) count as built
+    journal = RunJournal(args.output_dir, resume=args.resume)
+    errors_log = ErrorLog(args.output_dir, resume=args.resume)
+    if args.resume:
+        if args.no_per_file:
+            logging.warning("--resume needs per-file outputs to rebuild the corpus; --no_per_file reprocesses everything")
+        resumed = 0
+        for path in docx_files:
+            entry = journal.completed.get(keys[path])
+            if entry and entry["hash"] == hashes[path] and entry["fingerprint"] == fingerprint:
+                manifest.record(keys[path], hashes[path], fingerprint, entry["outputs"])
+                resumed += 1
+        print(f"Resuming: {resumed} files already done by the interrupted run")
+
+    results_by_file = {}
+    todo = []
+    for path in docx_files:
+        outputs = None if args.force else manifest.lookup(keys[path], hashes[path], fingerprint)
+        if outputs and all((outputs.get("llm") or {}).get(fmt) for fmt in jsonl_formats):
+            results_by_file[path] = {**outputs, "file": path, "memory": None}
+        else:
+            todo.append(path)
+    print(f"{len(todo)} to process, {len(docx_files) - len(todo)} unchanged")
+    journal.start(keys[path] for path in todo)
+
+    # Longest-first dispatch from size, image count and previous runs' timings
+    history = CostHistory(args.output_dir)
+    history.prune(keys.values())
+    features = {path: file_features(path) for path in todo}
+    if args.schedule == "cost":
+        model = history.model(fingerprint, args.ocr_images)
+        estimates = {
+            path: history.estimate(keys[path], hashes[path], fingerprint, features[path], model) for path in todo
+        }
+        todo = longest_first(todo, estimates)
+
+    # Build worker with shared args
+    worker = partial(
+        process_single,
+        output_dir=args.output_dir,
+        chunk_size=args.chunk_size,
+        overlap=args.overlap,
+        ocr_images=args.ocr_images,
+        to_pdf=args.to_pdf,
+        export_format=export_formats,
+        config_path="config.yaml",
+        per_file=not args.no_per_file,
+        capture_corpus=bool(jsonl_formats or args.columnar),
+        input_root=input_root,
+        stage_cache=stage_cache_dir,
+        analysis_key=analysis_fingerprint,
+        vectors=args.vectors,
+        columnar=args.columnar,
+    )
+
+    # Combined JSONL corpora — one streaming, optionally sharded writer per format.
+    # Files are copied in as workers finish them, from their per-file outputs
+    # (or part files, see PARTS_DIR). With --dedup they go in key order, as in
+    # `docs merge`, and are staged whole and rewritten (and sharded) by dedup.py
+    # once the run is done; per-file outputs keep their duplicates.
+    max_bytes = int(args.shard_max_mb * 1024 * 1024)
+    corpus_dir = os.path.join(args.output_dir, ".corpus_raw") if args.dedup else args.output_dir
+    corpus_writers = {
+        fmt: ShardedCorpusWriter(
+            corpus_dir, fmt,
+            max_records=0 if args.dedup else args.shard_max_records,
+            max_bytes=0 if args.dedup else max_bytes,
+        )
+        for fmt in jsonl_formats
+    }
+    # Chunk vectors, row i = record i of every combined corpus
+    vector_writer = None
+    if args.vectors and jsonl_formats:
+        from .vectors import MATRIX, NpyWriter
+        vector_writer = NpyWriter(os.path.join(corpus_dir, MATRIX), args.vectors)
+    # Typed chunk table, same rows, written a row group at a time
+    columnar_writer = None
+    if args.columnar:
+        from .columnar import ColumnarWriter
+        columnar_writer = ColumnarWriter(
+            os.path.join(corpus_dir if corpus_writers else args.output_dir, COLUMNAR_FILES[args.columnar])
+        )
+    parts_dir = os.path.join(args.output_dir, PARTS_DIR)
+    # --dedup's reorder buffer: a finished file's record sources wait in
+    # `ready` until every file before it in key order is in, so the "first
+    # occurrence" kept (and the rows of vectors.npy / chunks.parquet) do not
+    # depend on which worker finished first. They are files on disk, so it
+    # holds paths, never records. Without --dedup files go in as they finish.
+    ordered = bool(args.dedup)
+    order = sorted(docx_files, key=keys.get) if ordered else []
+    ready = {}
+    copied = 0
+
+    def flush_ready() -> None:
+        nonlocal copied
+        while copied < len(order) and order[copied] in ready:
+            path = order[copied]
+            sources = ready.pop(path)
+            copied += 1
+            if not sources:  # failed or empty
+                continue
+            copy_records(keys[path], *sources, corpus_writers, vector_writer, columnar_writer)
+            if args.no_per_file:
+                corpus, vectors_path, columnar_path = sources
+                for part in (*corpus.values(), vectors_path, columnar_path):
+                    if part and os.path.exists(part):
+                        os.remove(part)
+
+    def finished(path: str, sources) -> None:
+        if not ordered:
+            order.append(path)
+        ready[path] = sources
+        flush_ready()
+
+    for path, res in results_by_file.items():
+        finished(path, (res["llm"], res.get("vectors"), res.get("columnar")))
+
+    # Parallel execution — models are loaded once per worker by init_worker,
+    # or once in the parent when --preload forks workers from a warm process.
+    if todo:
+        ctx = None
+        if args.preload:
+            if fork_available():
+                preload_models("config.yaml", args.tagging_profile)
+                ctx = get_context("fork")
+            else:
+                logging.warning("--preload requires the fork start method; loading models per worker instead")
+        ctx = ctx or get_context()
+        ocr_service = None
+        if args.ocr_images and args.ocr_servers > 0:
+            from .ocr_service import OCRService
+            ocr_service = OCRService(
+                num_servers=args.ocr_servers, max_batch=args.ocr_batch,
+                threads=args.ocr_threads, triage=triage, ctx=ctx,
+            ).start()
+        initargs = (
+            "config.yaml", args.ocr_images, ocr_cache_path, args.ocr_cache_size,
+            ocr_service.client_args() if ocr_service else None, triage, args.ingest_mode,
+            args.tagging_profile,
+        )
+        # Files are handed out one at a time (longest first) by the supervisor,
+        # which enforces --file_timeout, retries failures and replaces crashed
+        # or hung workers; finished files are journaled as they arrive.
+        supervisor = Supervisor(
+            lambda initializer, init_args: ctx.Pool(
+                args.workers, initializer=initializer, initargs=init_args,
+                maxtasksperchild=args.max_tasks_per_child or None,
+            ),
+            ctx, args.workers, init_worker, initargs, timeout=args.file_timeout, retries=args.retries,
+        )
+        if args.file_timeout and not hasattr(signal, "SIGALRM"):
+            logging.warning(f"No SIGALRM here: files are only stopped after {hard_timeout(args.file_timeout):g}s")
+        pool_started = time.perf_counter()
+        spans = []  # (start, end) of each file as seen from here
+        try:
+            for outcome in supervisor.run(worker, todo):
+                path, res = outcome.path, outcome.result
+                if outcome.errors:
+                    errors_log.write(keys[path], outcome.errors, final=bool(res.get("error")))
+                if res.get("metrics"):
+                    done = time.perf_counter()
+                    spans.append((done - res["metrics"]["wall_s"], done))
+                corpus = res.pop("corpus", None)
+                vectors_path, columnar_path = res.pop("corpus_vectors", None), res.pop("corpus_columnar", None)
+                finished(path, (corpus, vectors_path, columnar_path) if corpus is not None else None)
+                res["attempts"] = outcome.attempts
+                results_by_file[path] = res
+                if res.get("error"):
+                    manifest.forget(keys[path])
+                    journal.failed(keys[path], hashes[path], fingerprint, outcome.attempts)
+                    logging.warning(
+                        f"Failed {keys[path]} after {outcome.attempts} attempt(s): "
+                        f"{res['error']['type']}: {res['error']['message']}"
+                    )
+                    continue
+                # Only files with outputs on disk can be reused (with --no_per_file
+                # "llm" maps every format to None; an empty document has none)
+                if output_paths(res):
+                    manifest.record(keys[path], hashes[path], fingerprint, res)
+                else:
+                    manifest.forget(keys[path])
+                if res.get("chunks"):  # not an empty document ("llm" is set either way with --no_per_file)
+                    history.record(keys[path], hashes[path], fingerprint, features[path], res["metrics"]["wall_s"])
+                journal.done(keys[path], hashes[path], fingerprint, res, res["metrics"]["wall_s"])
+        except WorkerInitError as e:
+            print(f"Aborting: {e}")
+            return 1
+        finally:
+            journal.close()
+            errors_log.close()
+            if ocr_service:
+                ocr_service.stop()
+            shutil.rmtree(parts_dir, ignore_errors=True)
+        # Measured from the first file's start, so pool start-up (model loading) is reported apart
+        first_start = min((start for start, _ in spans), default=pool_started)
+        last_end = max((end for _, end in spans), default=first_start)
+        scheduling = schedule_efficiency([end - start for start, end in spans], args.workers, last_end - first_start)
+        scheduling.update(
+            schedule=args.schedule, startup_s=round(first_start - pool_started, 3), pool_restarts=supervisor.restarts,
+        )
+        print(
+            f"Scheduling ({args.schedule}): {scheduling['efficiency']:.0%} busy "
+            f"({scheduling['busy_s']:.1f}s of {args.workers} workers x {scheduling['wall_s']:.1f}s); "
+            f"best possible {scheduling['best_efficiency']:.0%} (wall >= {scheduling['bound_s']:.1f}s), "
+            f"pool start-up {scheduling['startup_s']:.1f}s"
+        )
+    else:
+        scheduling = None
+    manifest.save()
+    history.save()
+    if stage_cache_dir and not args.stage_cache:
+        # Only a private cache is pruned; a shared --stage_cache may serve other inputs
+        StageCache(stage_cache_dir).prune(
+            StageCache.make_key(hashes[path], analysis_fingerprint) for path in docx_files
+        )
+    journal.close()
+    errors_log.close()
+
+    corpora = {fmt: writer.close() for fmt, writer in corpus_writers.items()}
+    records = {fmt: writer.total_records for fmt, writer in corpus_writers.items()}
+    vectors_path = vector_writer.close() if vector_writer else None
+    columnar_path = columnar_writer.close() if columnar_writer else None
+    dedup_report = None
+    if args.dedup and corpora:
+        from .dedup import dedup_corpora, format_dedup
+        dedup_report = dedup_corpora(
+            corpora, args.output_dir, mode=args.dedup, threshold=args.dedup_threshold,
+            max_records=args.shard_max_records, max_bytes=max_bytes, vectors=vectors_path,
+            columnar=columnar_path,
+        )
+        shutil.rmtree(corpus_dir, ignore_errors=True)
+        corpora = {fmt: f["shards"] for fmt, f in dedup_report["formats"].items()}
+        records = {fmt: dedup_report["records_out"] for fmt in corpora}
+        print(format_dedup(dedup_report))
+    for fmt, shards in corpora.items():
+        index_path = os.path.join(args.output_dir, f"{fmt}_corpus.index.json")
+        where = shards[0] if len(shards) == 1 else f"{len(shards)} shards, index {index_path}"
+        print(f"Combined {fmt} corpus: {records[fmt]} records ({where})")
+    if vector_writer:
+        from .vectors import write_meta
+        rows = dedup_report["vectors"] if dedup_report else vector_writer.rows
+        write_meta(args.output_dir, "en_core_web_lg", args.vectors, vector_writer.dim, rows)
+        print(f"Chunk vectors: {rows} x {vector_writer.dim} {args.vectors} ({os.path.join(args.output_dir, 'vectors.npy')})")
+    else:
+        # A matrix from an earlier run would no longer line up with the corpora
+        for name in ("vectors.npy", "vectors.json"):
+            if os.path.exists(os.path.join(args.output_dir, name)):
+                os.remove(os.path.join(args.output_dir, name))
+    if columnar_writer:
+        rows = dedup_report["columnar"] if dedup_report else columnar_writer.rows
+        print(f"Columnar chunks: {rows} rows ({os.path.join(args.output_dir, COLUMNAR_FILES[args.columnar])})")
+    for fmt, name in COLUMNAR_FILES.items():
+        # Likewise a table of an earlier run, or in the other format
+        if fmt != args.columnar and os.path.exists(os.path.join(args.output_dir, name)):
+            os.remove(os.path.join(args.output_dir, name))
+
+    results = [results_by_file[path] for path in docx_files]
+
+    if args.ocr_images:
+        hits = sum(res["ocr_cache"]["hits"] for res in results if res.get("ocr_cache"))
+        misses = sum(res["ocr_cache"]["misses"] for res in results if res.get("ocr_cache"))
+        print(f"OCR cache: {hits} hits, {misses} misses")
+
+    if stage_cache_dir:
+        counts = [res["metrics"]["counts"] for res in results if res.get("metrics")]
+        hits = sum(c.get("stage_cache_hits", 0) for c in counts)
+        misses = sum(c.get("stage_cache_misses", 0) for c in counts)
+        if hits or misses:
+            print(f"Stage cache: {hits} hits (re-annotated only), {misses} misses")
+
+    memory_report = summarize_worker_memory(res.get("memory") for res in results)
+    if memory_report:
+        print(memory_report)
+
+    # Per-stage timings of the files processed in this run (reused files have none)
+    report = build_report(
+        (res.get("metrics") for res in results),
+        wall_s=time.perf_counter() - run_started,
+        workers=args.workers,
+        export_formats=export_formats,
+        reused=len(docx_files) - len(todo),
+        scheduling=scheduling,
+        dedup=dedup_report,
+        no_output=[
+            keys[res["file"]] for res in results
+            if res.get("metrics") and not res.get("chunks") and not res.get("error")
+        ],
+        failed=[
+            {"file": keys[res["file"]], "attempts": res["attempts"],
+             "type": res["error"]["type"], "message": res["error"]["message"]}
+            for res in results if res.get("error")
+        ],
+        retried=sum(1 for res in results if res.get("attempts", 1) > 1),
+    )
+    report_path = write_report(report, args.report or os.path.join(args.output_dir, "run_report.json"))
+    if report["stages"]:
+        print(format_stage_table(report))
+    print(f"Run report: {report_path}")
+    if report["failed"]:
+        print(f"{len(report['failed'])} files failed; details in {errors_log.path}")
+    print(f"Processed {len(docx_files)} files to {args.output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
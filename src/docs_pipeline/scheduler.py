@@ -0,0 +1,164 @@
+# src/docs_pipeline/scheduler.py
+import os
+import re
+import json
+import logging
+import zipfile
+from typing import Dict, Iterable, List
+
+# ----------------------------------------------------------------------
+# Size-aware scheduling — longest (estimated) file first
+# ----------------------------------------------------------------------
+# A run ends when the last worker finishes its last file, so one long
+# manual dispatched late keeps every other worker idle. Files are sent out
+# one at a time (chunksize=1) in decreasing order of estimated cost: the
+# big ones start first and the small ones fill the gaps (LPT scheduling).
+# A file's cost is its own wall time from the previous run when neither the
+# file nor the settings changed; otherwise a per-byte / per-image rate
+# fitted on previous runs' timings, or the raw features on a first run.
+
+_TEXT_PART = re.compile(r"word/(document|header\d*|footer\d*)\.xml$")
+
+# Text-byte equivalent of one image before any timings exist (OCR only)
+DEFAULT_IMAGE_BYTES = 200_000
+
+# Fewer timed files than this and the fitted rates are not trusted
+MIN_SAMPLES = 3
+
+
+def file_features(path: str) -> Dict[str, int]:
+    """Cost features read from the zip directory (nothing is decompressed)."""
+    features = {"file_bytes": os.path.getsize(path), "text_bytes": 0, "images": 0}
+    try:
+        with zipfile.ZipFile(path) as zf:
+            for info in zf.infolist():
+                if info.filename.startswith("word/media/"):
+                    features["images"] += 1
+                elif _TEXT_PART.match(info.filename):
+                    features["text_bytes"] += info.file_size
+    except (zipfile.BadZipFile, OSError):
+        features["text_bytes"] = features["file_bytes"]
+    return features
+
+
+class CostModel:
+    """seconds ≈ text_bytes × per_text_byte + images × per_image."""
+
+    def __init__(self, per_text_byte: float = 1.0, per_image: float = 0.0, fitted: bool = False):
+        self.per_text_byte = per_text_byte
+        self.per_image = per_image
+        self.fitted = fitted
+
+    @classmethod
+    def default(cls, ocr_images: bool) -> "CostModel":
+        """Relative costs only: text bytes, plus images when they are OCR'd."""
+        return cls(1.0, DEFAULT_IMAGE_BYTES if ocr_images else 0.0)
+
+    @classmethod
+    def fit(cls, samples: List[Dict], ocr_images: bool) -> "CostModel":
+        """
+        Two-step ratio fit on timed files: the text rate from files without
+        images (all files if none), then the image rate from what the text
+        rate leaves unexplained on files with images. Both are >= 0.
+        """
+        if len(samples) < MIN_SAMPLES:
+            return cls.default(ocr_images)
+        plain = [s for s in samples if not s["features"]["images"]] or samples
+        text_bytes = sum(s["features"]["text_bytes"] for s in plain)
+        if text_bytes <= 0:
+            return cls.default(ocr_images)
+        per_text_byte = sum(s["seconds"] for s in plain) / text_bytes
+        with_images = [s for s in samples if s["features"]["images"]]
+        per_image = 0.0
+        if with_images:
+            rest = sum(max(0.0, s["seconds"] - per_text_byte * s["features"]["text_bytes"]) for s in with_images)
+            per_image = rest / sum(s["features"]["images"] for s in with_images)
+        return cls(per_text_byte, per_image, fitted=True)
+
+    def predict(self, features: Dict[str, int]) -> float:
+        return features["text_bytes"] * self.per_text_byte + features["images"] * self.per_image
+
+
+class CostHistory:
+    """
+    Per-file wall times of previous runs, stored in output_dir next to the
+    build manifest: features, content hash and settings fingerprint of the
+    run that produced each timing.
+    """
+
+    FILENAME = "schedule_history.json"
+    VERSION = 1
+
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, self.FILENAME)
+        self.entries: Dict[str, Dict] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                self.entries = data.get("files", {})
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable schedule history {self.path}: {e}")
+
+    def model(self, fingerprint: str, ocr_images: bool) -> CostModel:
+        """Rates fitted on the timings recorded with these settings."""
+        samples = [e for e in self.entries.values() if e["fingerprint"] == fingerprint]
+        return CostModel.fit(samples, ocr_images)
+
+    def estimate(
+        self, key: str, content_hash: str, fingerprint: str, features: Dict[str, int], model: CostModel
+    ) -> float:
+        """This file's last wall time if nothing changed, else the model's prediction."""
+        entry = self.entries.get(key)
+        # An unfitted model predicts in relative units, which cannot be mixed with seconds
+        if entry and entry["hash"] == content_hash and entry["fingerprint"] == fingerprint and model.fitted:
+            return entry["seconds"]
+        return model.predict(features)
+
+    def record(self, key: str, content_hash: str, fingerprint: str, features: Dict[str, int], seconds: float) -> None:
+        self.entries[key] = {
+            "hash": content_hash, "fingerprint": fingerprint, "features": features, "seconds": round(seconds, 4),
+        }
+
+    def prune(self, current_keys: Iterable[str]) -> None:
+        current = set(current_keys)
+        self.entries = {k: v for k, v in self.entries.items() if k in current}
+
+    def save(self) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": self.VERSION, "files": self.entries}, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+def longest_first(paths: List[str], estimates: Dict[str, float]) -> List[str]:
+    """Paths in decreasing estimated cost; ties keep input order."""
+    return sorted(paths, key=lambda p: -estimates.get(p, 0.0))
+
+
+def schedule_efficiency(busy_s: List[float], workers: int, wall_s: float) -> Dict:
+    """
+    busy / (workers × wall): the share of worker time spent processing
+    files. `bound_s` is the shortest possible wall time for these files
+    (the larger of perfect balance and the longest single file), so
+    `best_efficiency` is what an ideal schedule would have reached; the gap
+    between the two is the tail latency left to win.
+    """
+    busy = sum(busy_s)
+    bound = max(busy / workers, max(busy_s)) if busy_s and workers else 0.0
+    return {
+        "workers": workers,
+        "files": len(busy_s),
+        "busy_s": round(busy, 3),
+        "wall_s": round(wall_s, 3),
+        "efficiency": round(busy / (workers * wall_s), 3) if workers and wall_s > 0 else 0.0,
+        "bound_s": round(bound, 3),
+        "best_efficiency": round(busy / (workers * bound), 3) if workers and bound > 0 else 0.0,
+    }
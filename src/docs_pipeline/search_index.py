@@ -0,0 +1,511 @@
+# src/docs_pipeline/search_index.py
+import os
+import sys
+import json
+import math
+import time
+import heapq
+import shutil
+import bisect
+import fnmatch
+import argparse
+import logging
+from array import array
+from itertools import groupby
+from operator import itemgetter
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .corpus_writer import corpus_files, corpus_formats
+from .keywords import tokenize
+from .llm_export import record_metadata, record_text
+from .vectors import NpyWriter
+
+# ----------------------------------------------------------------------
+# BM25 inverted index over a combined corpus — `docs index` / `docs search`
+# ----------------------------------------------------------------------
+# Every record of {format}_corpus (row i, the same numbering as vectors.npy)
+# is indexed under the word tokens of its text — the tokenizer the keyword
+# matcher uses — plus the tokens of the `keywords` and `policy_keywords`
+# the tagger attached, so tagged terms weigh more.
+#
+# The build streams over the corpus once, SPIMI-style: postings accumulate
+# in memory up to a budget, are flushed as a sorted run, and the runs are
+# merged term by term at the end. Runs hold consecutive records, so a
+# term's postings stay in row order by concatenating its runs' slices.
+# On disk, in <output_dir>/bm25_index/<format>/:
+#
+#   terms.bin, term_offsets.npy   sorted UTF-8 terms, looked up by bisection
+#   df.npy, postings.npy          document frequency; each term's slice of
+#   docs.npy, tf.npy              (row, term frequency) pairs
+#   doc_len.npy, doc_file.npy,    per row: indexed length, file id, intent
+#   doc_intents.npy,              bitmask, and the shard and byte offset of
+#   doc_shard.npy, doc_offset.npy the record, to show hits without a scan
+#   meta.json                     counts, BM25 parameters, file names,
+#                                 intents, corpus files at build time
+#
+# Queries memory-map everything and touch only the postings of their terms.
+
+INDEX_DIR = "bm25_index"
+VERSION = 1
+K1 = 1.2
+B = 0.75
+BLOCK_POSTINGS = 5_000_000  # postings held in memory before a run is flushed (~16 bytes each)
+MAX_INTENTS = 64            # bits in doc_intents
+_ROWS_PER_FLUSH = 65536  # per-row values buffered before they are written
+
+_DOC_ARRAYS = {  # name -> dtype, one value per corpus row (in this order)
+    "doc_len": "uint32",
+    "doc_file": "uint32",
+    "doc_intents": "uint64",
+    "doc_shard": "uint16",
+    "doc_offset": "uint64",
+}
+
+
+def index_path(output_dir: str, export_format: str) -> str:
+    return os.path.join(output_dir, INDEX_DIR, export_format)
+
+
+def _as_list(value) -> List[str]:
+    """A metadata list field; the generic format joins its lists with '|'."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [v for v in value.split("|") if v]
+    return [str(v) for v in value]
+
+
+def record_terms(record: Dict, export_format: str) -> Tuple[List[str], str, List[str]]:
+    """(indexed terms, file name, intents) of one corpus record."""
+    metadata = record_metadata(record, export_format)
+    terms = tokenize(record_text(record, export_format))
+    terms.extend(tokenize(" ".join(_as_list(metadata.get("keywords")) + _as_list(metadata.get("policy_keywords")))))
+    file_name = str(metadata.get("file_name") or metadata.get("source") or "")
+    return terms, file_name, _as_list(metadata.get("intents"))
+
+
+def _load(path: str) -> np.ndarray:
+    """Memory-map a .npy (an empty array cannot be mapped, and need not be)."""
+    try:
+        return np.load(path, mmap_mode="r")
+    except ValueError:
+        return np.load(path)
+
+
+# ----------------------------------------------------------------------
+# Build
+# ----------------------------------------------------------------------
+class _Vocab(dict):
+    """Term -> id, assigned on first sight (a C-level lookup for known terms)."""
+
+    def __missing__(self, term: str) -> int:
+        self[term] = n = len(self)
+        return n
+
+
+class _RunWriter:
+    """
+    Postings of consecutive records, kept as flat (term id, tf) arrays plus
+    each record's row and term count, and flushed as a sorted run: terms
+    in order, and for each term its rows ascending.
+    """
+
+    def __init__(self, directory: str, budget: int):
+        self.directory = directory
+        self.budget = budget
+        self.runs: List[str] = []
+        self._reset()
+
+    def _reset(self) -> None:
+        self._vocab = _Vocab()
+        self._ids, self._tfs = array("I"), array("I")
+        self._rows, self._lengths = array("I"), array("I")
+
+    def add(self, row: int, counts: Counter) -> None:
+        self._ids.extend(map(self._vocab.__getitem__, counts))
+        self._tfs.extend(counts.values())
+        self._rows.append(row)
+        self._lengths.append(len(counts))
+        if len(self._ids) >= self.budget:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._ids:
+            return
+        prefix = os.path.join(self.directory, f"run-{len(self.runs):05d}")
+        terms = sorted(self._vocab)
+        rank = np.empty(len(terms), dtype=np.uint32)
+        rank[np.fromiter(map(self._vocab.__getitem__, terms), dtype=np.int64, count=len(terms))] = np.arange(len(terms))
+        keys = rank[np.frombuffer(self._ids, dtype=np.uint32)]
+        order = np.argsort(keys, kind="stable")  # stable: rows stay ascending within a term
+        rows = np.repeat(np.frombuffer(self._rows, dtype=np.uint32), np.frombuffer(self._lengths, dtype=np.uint32))
+        tfs = np.minimum(np.frombuffer(self._tfs, dtype=np.uint32), 65535).astype(np.uint16)
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys, minlength=len(terms)), out=offsets[1:])
+        np.save(prefix + ".docs.npy", rows[order])
+        np.save(prefix + ".tf.npy", tfs[order])
+        np.save(prefix + ".offsets.npy", offsets)
+        with open(prefix + ".terms", "w", encoding="utf-8") as f:
+            f.write("\n".join(terms) + "\n")
+        self.runs.append(prefix)
+        self._reset()
+
+
+def _run_terms(prefix: str, run: int) -> Iterator[Tuple[str, int]]:
+    with open(prefix + ".terms", "r", encoding="utf-8") as f:
+        for line in f:
+            yield line.rstrip("\n"), run
+
+
+def _merge_runs(runs: List[str], out_dir: str) -> Tuple[int, int]:
+    """
+    Merge sorted runs into the final term and postings arrays; returns
+    (terms, postings). The term lists are merged as a stream straight into
+    terms.bin, giving each run's terms their final ids; each run's postings
+    are then copied into place in one vectorised scatter.
+    """
+    ids = [array("I") for _ in runs]
+    term_ends = array("Q", [0])
+    end = 0
+    with open(os.path.join(out_dir, "terms.bin"), "wb") as f:
+        merged = heapq.merge(*(_run_terms(prefix, run) for run, prefix in enumerate(runs)))
+        for term_id, (term, group) in enumerate(groupby(merged, key=itemgetter(0))):
+            for _, run in group:
+                ids[run].append(term_id)
+            encoded = term.encode("utf-8")
+            f.write(encoded)
+            end += len(encoded)
+            term_ends.append(end)
+    n_terms = len(term_ends) - 1
+    offsets = [np.load(prefix + ".offsets.npy") for prefix in runs]
+    ids = [np.frombuffer(run_ids, dtype=np.uint32) for run_ids in ids]
+
+    df = np.zeros(n_terms, dtype=np.int64)
+    for run_ids, run_offsets in zip(ids, offsets):
+        df[run_ids] += np.diff(run_offsets)  # a run lists each term once
+    starts = np.zeros(n_terms + 1, dtype=np.int64)
+    np.cumsum(df, out=starts[1:])
+    n_postings = int(starts[-1])
+
+    np.save(os.path.join(out_dir, "term_offsets.npy"), np.frombuffer(term_ends, dtype=np.uint64))
+    np.save(os.path.join(out_dir, "df.npy"), df.astype(np.uint32))
+    np.save(os.path.join(out_dir, "postings.npy"), starts.astype(np.uint64))
+    if not n_postings:
+        np.save(os.path.join(out_dir, "docs.npy"), np.zeros(0, dtype=np.uint32))
+        np.save(os.path.join(out_dir, "tf.npy"), np.zeros(0, dtype=np.uint16))
+        return n_terms, 0
+    docs = np.lib.format.open_memmap(os.path.join(out_dir, "docs.npy"), "w+", np.uint32, (n_postings,))
+    tfs = np.lib.format.open_memmap(os.path.join(out_dir, "tf.npy"), "w+", np.uint16, (n_postings,))
+    filled = starts[:-1].copy()
+    for prefix, run_ids, run_offsets in zip(runs, ids, offsets):
+        counts = np.diff(run_offsets)
+        # Run postings are in term order, and so are their destinations
+        dest = np.repeat(filled[run_ids] - run_offsets[:-1], counts) + np.arange(run_offsets[-1])
+        docs[dest] = np.load(prefix + ".docs.npy")
+        tfs[dest] = np.load(prefix + ".tf.npy")
+        filled[run_ids] += counts
+    docs.flush()
+    tfs.flush()
+    del docs, tfs
+    return n_terms, n_postings
+
+
+def build_index(
+    output_dir: str,
+    export_format: Optional[str] = None,
+    index_dir: Optional[str] = None,
+    block_postings: int = BLOCK_POSTINGS,
+) -> Dict:
+    """
+    Index output_dir's combined corpus of `export_format` (default: the
+    first one found) into `index_dir`. Streams the corpus once; memory is
+    bounded by `block_postings`. Replaces an earlier index only when the
+    new one is complete. Returns its meta.json.
+    """
+    started = time.perf_counter()
+    if export_format is None:
+        formats = corpus_formats(output_dir)
+        if not formats:
+            raise ValueError(f"no combined corpus in {output_dir}")
+        export_format = formats[0]
+    files = corpus_files(output_dir, export_format)
+    index_dir = index_dir or index_path(output_dir, export_format)
+    tmp_dir = f"{index_dir}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    try:
+        runs = _RunWriter(tmp_dir, block_postings)
+        file_ids: Dict[str, int] = {}
+        intent_bits: Dict[str, int] = {}
+        total_len = rows = 0
+        doc_writers = {
+            name: NpyWriter(os.path.join(tmp_dir, f"{name}.npy"), dtype, flat=True)
+            for name, dtype in _DOC_ARRAYS.items()
+        }
+        buffers = {name: [] for name in _DOC_ARRAYS}
+        for shard, path in enumerate(files):
+            offset = 0
+            with open(path, "rb") as f:
+                for line in f:
+                    start, offset = offset, offset + len(line)
+                    if not line.strip():
+                        continue
+                    terms, file_name, intents = record_terms(json.loads(line), export_format)
+                    runs.add(rows, Counter(terms))
+                    mask = 0
+                    for intent in intents:
+                        if intent not in intent_bits and len(intent_bits) < MAX_INTENTS:
+                            intent_bits[intent] = len(intent_bits)
+                        if intent in intent_bits:
+                            mask |= 1 << intent_bits[intent]
+                    file_id = file_ids.setdefault(file_name, len(file_ids))
+                    for values, value in zip(buffers.values(), (len(terms), file_id, mask, shard, start)):
+                        values.append(value)
+                    total_len += len(terms)
+                    rows += 1
+                    if len(buffers["doc_len"]) >= _ROWS_PER_FLUSH:
+                        for name, values in buffers.items():
+                            doc_writers[name].append(np.array(values, dtype=_DOC_ARRAYS[name]))
+                            values.clear()
+        for name, values in buffers.items():
+            doc_writers[name].append(np.array(values, dtype=_DOC_ARRAYS[name]))
+            doc_writers[name].close()
+        runs.flush()
+        n_terms, n_postings = _merge_runs(runs.runs, tmp_dir)
+        for prefix in runs.runs:
+            for suffix in (".docs.npy", ".tf.npy", ".offsets.npy", ".terms"):
+                os.remove(prefix + suffix)
+        if len(intent_bits) == MAX_INTENTS:
+            logging.warning(f"Only the first {MAX_INTENTS} distinct intents can be filtered on")
+
+        meta = {
+            "version": VERSION,
+            "format": export_format,
+            "docs": rows,
+            "terms": n_terms,
+            "postings": n_postings,
+            "avgdl": total_len / rows if rows else 0.0,
+            "k1": K1,
+            "b": B,
+            "files": [os.path.basename(p) for p in files],
+            "corpus": [{"file": os.path.basename(p), "bytes": os.path.getsize(p)} for p in files],
+            "file_names": list(file_ids),
+            "intents": list(intent_bits),
+            "build_s": round(time.perf_counter() - started, 3),
+        }
+        with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        if os.path.isdir(index_dir):
+            shutil.rmtree(index_dir)
+        os.replace(tmp_dir, index_dir)
+        meta["path"] = index_dir
+        meta["bytes"] = sum(entry.stat().st_size for entry in os.scandir(index_dir))
+        return meta
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+
+# ----------------------------------------------------------------------
+# Query
+# ----------------------------------------------------------------------
+class _Terms(Sequence):
+    """The sorted term dictionary as a sequence of bytes, for bisect."""
+
+    def __init__(self, blob, offsets: np.ndarray):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> bytes:
+        return bytes(self._blob[self._offsets[i]:self._offsets[i + 1]])
+
+
+class BM25Index:
+    """A built index, memory-mapped; search() scores only the query terms' postings."""
+
+    def __init__(self, index_dir: str):
+        self.index_dir = index_dir
+        with open(os.path.join(index_dir, "meta.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("version") != VERSION:
+            raise ValueError(f"{index_dir} was built by another version; run `docs index` again")
+        arrays = ("term_offsets", "df", "postings", "docs", "tf", *_DOC_ARRAYS)
+        for name in arrays:
+            setattr(self, name, _load(os.path.join(index_dir, f"{name}.npy")))
+        blob_path = os.path.join(index_dir, "terms.bin")
+        blob = np.memmap(blob_path, dtype=np.uint8, mode="r") if os.path.getsize(blob_path) else b""
+        self._terms = _Terms(blob, self.term_offsets)
+        self._intent_bits = {name: 1 << i for i, name in enumerate(self.meta["intents"])}
+        self._file_masks: Dict[Tuple[str, ...], np.ndarray] = {}
+
+    def term_id(self, term: str) -> Optional[int]:
+        key = term.encode("utf-8")
+        i = bisect.bisect_left(self._terms, key)
+        return i if i < len(self._terms) and self._terms[i] == key else None
+
+    def _filter(self, rows: np.ndarray, intents: Sequence[str], file_names: Sequence[str]) -> np.ndarray:
+        keep = np.ones(len(rows), dtype=bool)
+        if intents:
+            if any(intent not in self._intent_bits for intent in intents):
+                return np.zeros(len(rows), dtype=bool)
+            bits = np.uint64(sum(self._intent_bits[intent] for intent in set(intents)))
+            keep &= (self.doc_intents[rows] & bits) == bits
+        if file_names:
+            keep &= self._file_mask(tuple(sorted(set(file_names))))[self.doc_file[rows]]
+        return keep
+
+    def _file_mask(self, patterns: Tuple[str, ...]) -> np.ndarray:
+        """Boolean per file id; the last few pattern sets are kept, as glob matching is per name."""
+        if patterns not in self._file_masks:
+            if len(self._file_masks) >= 16:
+                self._file_masks.pop(next(iter(self._file_masks)))
+            self._file_masks[patterns] = np.fromiter(
+                (any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns) for name in self.meta["file_names"]),
+                dtype=bool, count=len(self.meta["file_names"]),
+            )
+        return self._file_masks[patterns]
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        intents: Sequence[str] = (),
+        file_names: Sequence[str] = (),
+    ) -> List[Tuple[int, float]]:
+        """
+        Top k (row, BM25 score), best first. `intents` must all be on a
+        record; `file_names` are glob patterns, any of which may match.
+        """
+        n, avgdl = self.meta["docs"], self.meta["avgdl"] or 1.0
+        k1, b = self.meta["k1"], self.meta["b"]
+        rows_parts, score_parts = [], []
+        for term, qtf in Counter(tokenize(query)).items():
+            t = self.term_id(term)
+            if t is None:
+                continue
+            start, end = int(self.postings[t]), int(self.postings[t + 1])
+            rows = np.asarray(self.docs[start:end])
+            tf = self.tf[start:end].astype(np.float32)
+            df = int(self.df[t])
+            idf = math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+            norm = k1 * (1.0 - b + b * self.doc_len[rows].astype(np.float32) / avgdl)
+            rows_parts.append(rows)
+            score_parts.append(qtf * idf * tf * (k1 + 1.0) / (tf + norm))
+        if not rows_parts:
+            return []
+        if len(rows_parts) == 1:
+            rows, scores = rows_parts[0], score_parts[0]
+        elif sum(map(len, rows_parts)) * 8 > n:
+            # Long postings: accumulate into one slot per record (every score is > 0)
+            dense = np.bincount(np.concatenate(rows_parts), weights=np.concatenate(score_parts), minlength=n)
+            rows = np.flatnonzero(dense)
+            scores = dense[rows].astype(np.float32)
+        else:
+            rows, inverse = np.unique(np.concatenate(rows_parts), return_inverse=True)
+            scores = np.bincount(inverse, weights=np.concatenate(score_parts)).astype(np.float32)
+        if intents or file_names:
+            keep = self._filter(rows, intents, file_names)
+            rows, scores = rows[keep], scores[keep]
+        if len(scores) > k:
+            # Everything tied with the k-th score stays, so ties go to the lowest row
+            top = np.flatnonzero(scores >= np.partition(scores, len(scores) - k)[len(scores) - k])
+            rows, scores = rows[top], scores[top]
+        order = np.lexsort((rows, -scores))[:k]
+        return [(int(rows[i]), float(scores[i])) for i in order]
+
+    def record(self, output_dir: str, row: int) -> Dict:
+        """The corpus record of a row, read straight from its offset."""
+        path = os.path.join(output_dir, self.meta["files"][int(self.doc_shard[row])])
+        with open(path, "rb") as f:
+            f.seek(int(self.doc_offset[row]))
+            return json.loads(f.readline())
+
+    def stale(self, output_dir: str) -> bool:
+        """True when the corpus files differ from the ones indexed."""
+        for entry in self.meta["corpus"]:
+            path = os.path.join(output_dir, entry["file"])
+            if not os.path.exists(path) or os.path.getsize(path) != entry["bytes"]:
+                return True
+        return [os.path.basename(p) for p in corpus_files(output_dir, self.meta["format"])] != self.meta["files"]
+
+
+# ----------------------------------------------------------------------
+# CLI — `docs index` and `docs search`
+# ----------------------------------------------------------------------
+def index_main(argv: Optional[List[str]] = None, prog: Optional[str] = None) -> int:
+    """`docs index`: build the BM25 index of a run's combined corpus."""
+    parser = argparse.ArgumentParser(prog=prog, description="Build a BM25 index over a combined corpus")
+    parser.add_argument("output_dir", help="Output directory of a run (or merge)")
+    parser.add_argument("--format", default=None, help="Corpus to index (default: the first found)")
+    parser.add_argument("--index_dir", default=None, help="Default: <output_dir>/bm25_index/<format>")
+    parser.add_argument(
+        "--block_postings", type=int, default=BLOCK_POSTINGS,
+        help=f"Postings held in memory before a sorted run is written (default: {BLOCK_POSTINGS})"
+    )
+    args = parser.parse_args(argv)
+    try:
+        meta = build_index(args.output_dir, args.format, args.index_dir, args.block_postings)
+    except (OSError, ValueError) as e:
+        print(f"Indexing failed: {e}", file=sys.stderr)
+        return 1
+    print(
+        f"Indexed {meta['docs']} {meta['format']} records: {meta['terms']} terms, {meta['postings']} postings "
+        f"in {meta['build_s']:.1f}s -> {meta['path']} ({meta['bytes'] / 1e6:.1f} MB)"
+    )
+    return 0
+
+
+def search_main(argv: Optional[List[str]] = None, prog: Optional[str] = None) -> int:
+    """`docs search`: BM25 top-k over the index built by `docs index`."""
+    parser = argparse.ArgumentParser(prog=prog, description="BM25 search over a corpus indexed with `docs index`")
+    parser.add_argument("output_dir", help="Output directory of a run (or merge)")
+    parser.add_argument("query", nargs="+", help="Query words")
+    parser.add_argument("--format", default=None, help="Indexed corpus to search (default: the first found)")
+    parser.add_argument("--index_dir", default=None, help="Default: <output_dir>/bm25_index/<format>")
+    parser.add_argument("--k", type=int, default=10, help="Number of results (default: 10)")
+    parser.add_argument("--intent", action="append", default=[], help="Only records with this intent (repeatable: all)")
+    parser.add_argument(
+        "--file_name", action="append", default=[],
+        help="Only records of files matching this glob (repeatable: any)"
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON lines")
+    args = parser.parse_args(argv)
+
+    index_dir = args.index_dir
+    if not index_dir:
+        root = os.path.join(args.output_dir, INDEX_DIR)
+        formats = [args.format] if args.format else sorted(os.listdir(root)) if os.path.isdir(root) else []
+        index_dir = os.path.join(root, formats[0]) if formats else None
+    if not index_dir or not os.path.exists(os.path.join(index_dir, "meta.json")):
+        print(f"No BM25 index for {args.output_dir}; run `docs index {args.output_dir}` first", file=sys.stderr)
+        return 1
+    index = BM25Index(index_dir)
+    if index.stale(args.output_dir):
+        print("Warning: the corpus changed since it was indexed; run `docs index` again", file=sys.stderr)
+
+    started = time.perf_counter()
+    hits = index.search(" ".join(args.query), k=args.k, intents=args.intent, file_names=args.file_name)
+    elapsed = time.perf_counter() - started
+    fmt = index.meta["format"]
+    for rank, (row, score) in enumerate(hits, 1):
+        record = index.record(args.output_dir, row)
+        metadata, text = record_metadata(record, fmt), record_text(record, fmt)
+        if args.json:
+            print(json.dumps({"rank": rank, "row": row, "score": round(score, 4), "metadata": metadata,
+                              "text": text}, ensure_ascii=False))
+        else:
+            where = metadata.get("global_chunk_id") or f"{metadata.get('source', '?')}#{metadata.get('chunk_id', '?')}"
+            print(f"{rank:>3}. {score:.3f}  row {row}  {where}\n     {' '.join(text.split())[:100]}")
+    if not args.json:
+        print(f"{len(hits)} results from {index.meta['docs']} records in {elapsed * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(search_main())
@@ -0,0 +1,357 @@
+# src/docs_pipeline/sharding.py
+import os
+import re
+import sys
+import json
+import shutil
+import hashlib
+import argparse
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+
+from .manifest import BuildManifest
+from .journal import ErrorLog, RunJournal, read_journal
+from .corpus_writer import ShardedCorpusWriter
+from .llm_export import EXPORTERS, with_global_chunk_id
+
+# ----------------------------------------------------------------------
+# Multi-node runs — `--shard K/N` and `docs merge`
+# ----------------------------------------------------------------------
+# Every node lists the same inputs and keeps the files whose key (path
+# relative to the input root) hashes to its shard, so the split needs no
+# coordination and does not depend on listing order or on where the input
+# is mounted. Shard K of N writes everything — per-file outputs, manifest,
+# journal, corpora — under <output_dir>/shard-K-of-N/, so nodes can share
+# one output directory. `docs merge` then reads the per-file records listed
+# in every shard's manifest, in key order, and writes the final corpora and
+# a merged manifest (pointing at the per-file outputs, linked into
+# output_dir): the result depends only on the inputs, not on N or on which
+# node finished first. Each record gets a `global_chunk_id`,
+# "<key>#<chunk_id>", unique across the whole corpus, as in a single-host
+# run. Chunk vectors of a
+# `--vectors` run and chunk tables of a `--columnar` run are merged the
+# same way, row-aligned with the records. Before merging, every shard's
+# journal is read back: a shard that never finished, or has inputs that
+# failed or were built without per-file outputs, stops the merge (failed
+# inputs can be left out on purpose with --allow_failed).
+
+SHARD_DIR_RE = re.compile(r"^shard-(\d+)-of-(\d+)$")
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """'K/N' -> (K, N), 1 <= K <= N (argparse type)."""
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", spec)
+    if not match:
+        raise argparse.ArgumentTypeError(f"expected K/N, e.g. 2/8, not {spec!r}")
+    k, n = int(match.group(1)), int(match.group(2))
+    if not 1 <= k <= n:
+        raise argparse.ArgumentTypeError(f"shard {k}/{n}: K must be between 1 and N")
+    return k, n
+
+
+def shard_of(key: str, n: int) -> int:
+    """Shard (1..n) of an input key — a stable hash, the same on every host and Python."""
+    digest = hashlib.sha1(key.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % n + 1
+
+
+def shard_dir(output_dir: str, k: int, n: int) -> str:
+    return os.path.join(output_dir, f"shard-{k:0{len(str(n))}d}-of-{n}")
+
+
+def find_shards(output_dir: str) -> List[str]:
+    """Shard namespaces under output_dir, in shard order."""
+    found = []
+    with os.scandir(output_dir) as entries:
+        for entry in entries:
+            match = SHARD_DIR_RE.match(entry.name)
+            if match and entry.is_dir():
+                found.append((int(match.group(1)), entry.path))
+    return [path for _, path in sorted(found)]
+
+
+def _check_complete(shard_dirs: List[str]) -> None:
+    """All shards of a single N, each exactly once."""
+    seen: Dict[int, set] = {}
+    for path in shard_dirs:
+        match = SHARD_DIR_RE.match(os.path.basename(os.path.normpath(path)))
+        if not match:
+            raise ValueError(f"{path}: not a shard directory (shard-K-of-N)")
+        k, n = int(match.group(1)), int(match.group(2))
+        if k in seen.setdefault(n, set()):
+            raise ValueError(f"shard {k}/{n} given twice")
+        seen[n].add(k)
+    if len(seen) != 1:
+        raise ValueError(f"shards of different runs: N = {', '.join(map(str, sorted(seen)))}")
+    (n, ks), = seen.items()
+    missing = sorted(set(range(1, n + 1)) - ks)
+    if missing:
+        raise ValueError(f"missing shard(s) {', '.join(f'{k}/{n}' for k in missing)}")
+
+
+def _journal_problems(path: str) -> Tuple[Dict[str, str], Set[str], Set[str]]:
+    """
+    From a shard's journal.jsonl and errors.jsonl: inputs that failed for
+    good (key -> last error), inputs a run queued but never finished, and
+    inputs finished without per-file outputs (--no_per_file).
+    """
+    journal = os.path.join(path, RunJournal.FILENAME)
+    if not os.path.exists(journal):
+        logging.warning(f"{path}: no {RunJournal.FILENAME}; cannot check it for failed inputs")
+        return {}, set(), set()
+    failed: Dict[str, str] = {}
+    unfinished: Set[str] = set()
+    no_output: Set[str] = set()
+    for entry in read_journal(journal):
+        if entry.get("status") == "started":
+            unfinished.update(entry["files"])
+            continue
+        key = entry["file"]
+        unfinished.discard(key)
+        failed.pop(key, None)
+        no_output.discard(key)
+        if entry["status"] == "failed":
+            failed[key] = f"failed after {entry.get('attempts')} attempt(s)"
+        elif entry["outputs"].get("llm") and not any(entry["outputs"]["llm"].values()):
+            no_output.add(key)
+    errors = os.path.join(path, ErrorLog.FILENAME)
+    if failed and os.path.exists(errors):
+        for error in read_journal(errors):
+            if error.get("file") in failed and error.get("final"):
+                failed[error["file"]] = f"{error.get('type')}: {error.get('message')}"
+    return failed, unfinished, no_output
+
+
+def _listing(keys) -> str:
+    keys = sorted(keys)
+    return ", ".join(keys[:5]) + (f" and {len(keys) - 5} more" if len(keys) > 5 else "")
+
+
+def _adopt_outputs(outputs: Dict, shard_path: str, output_dir: str) -> Dict:
+    """
+    A shard's manifest outputs moved into output_dir: each file is
+    hard-linked (copied across filesystems) to the same path relative to
+    output_dir as it had to its shard, and the paths are rewritten.
+    """
+    shard_name = os.path.basename(os.path.normpath(shard_path))
+
+    def adopt(path: Optional[str]) -> Optional[str]:
+        if not path:
+            return path
+        rel = os.path.relpath(path, shard_path)
+        if rel.startswith(os.pardir):  # recorded under another mount point of the output
+            head, sep, rel = os.path.normpath(path).partition(os.sep + shard_name + os.sep)
+            if not sep:
+                return path
+        dest = os.path.join(output_dir, rel)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        if os.path.exists(dest):
+            os.remove(dest)
+        try:
+            os.link(path, dest)
+        except OSError:
+            shutil.copy2(path, dest)
+        return dest
+
+    return {k: {f: adopt(p) for f, p in v.items()} if isinstance(v, dict) else adopt(v) for k, v in outputs.items()}
+
+
+def merge_shards(
+    output_dir: str,
+    shard_dirs: Optional[List[str]] = None,
+    max_records: int = 0,
+    max_bytes: int = 0,
+    dedup: Optional[str] = None,
+    dedup_threshold: float = 0.9,
+    allow_failed: bool = False,
+) -> Dict:
+    """
+    Combine shard namespaces into output_dir: {format}_corpus.jsonl (sharded
+    like a normal run with max_records / max_bytes, near-duplicates removed
+    across all shards with `dedup`, see dedup.py) and manifest.json.
+    Raises ValueError when shards are missing, overlap, have no manifest,
+    have unfinished inputs, lack the per-file outputs the merge reads
+    (--no_per_file), or have failed inputs (unless `allow_failed`, which
+    merges the rest and lists them under "failed").
+    """
+    shard_dirs = find_shards(output_dir) if shard_dirs is None else list(shard_dirs)
+    if not shard_dirs:
+        raise ValueError(f"no shard-K-of-N directories in {output_dir}")
+    _check_complete(shard_dirs)
+
+    failed: Dict[str, str] = {}
+    for path in shard_dirs:
+        if not os.path.exists(os.path.join(path, BuildManifest.FILENAME)):
+            raise ValueError(f"{path} has no {BuildManifest.FILENAME}; its run has not finished")
+        shard_failed, unfinished, no_output = _journal_problems(path)
+        if unfinished:
+            raise ValueError(
+                f"{path}: {len(unfinished)} inputs never finished ({_listing(unfinished)}); "
+                f"rerun the shard with --resume"
+            )
+        if no_output:
+            raise ValueError(
+                f"{path}: {len(no_output)} inputs have no per-file outputs ({_listing(no_output)}); "
+                f"rerun the shard without --no_per_file"
+            )
+        failed.update(shard_failed)
+    if failed:
+        details = "; ".join(f"{key}: {failed[key]}" for key in sorted(failed)[:5])
+        if len(failed) > 5:
+            details += f"; and {len(failed) - 5} more"
+        if not allow_failed:
+            raise ValueError(
+                f"{len(failed)} inputs failed ({details}); rerun their shards, or merge without them "
+                f"with --allow_failed"
+            )
+        logging.warning(f"Merging without {len(failed)} failed inputs ({details})")
+
+    entries: Dict[str, Dict] = {}
+    shard_of_key: Dict[str, str] = {}
+    for path in shard_dirs:
+        for key, entry in BuildManifest(path).entries.items():
+            if key in entries:
+                raise ValueError(f"{key} was built by more than one shard")
+            entries[key] = entry
+            shard_of_key[key] = path
+    fingerprints = {entry["fingerprint"] for entry in entries.values()}
+    if len(fingerprints) > 1:
+        logging.warning(f"Shards were built with {len(fingerprints)} different settings fingerprints")
+
+    # Formats every file has a per-file JSONL output for
+    formats = None
+    for key, entry in entries.items():
+        llm = {fmt: p for fmt, p in (entry["outputs"].get("llm") or {}).items() if p and EXPORTERS[fmt][1] == "jsonl"}
+        if not llm:
+            raise ValueError(f"{key} has no per-file JSONL output (built with --no_per_file?); nothing to merge")
+        formats = set(llm) if formats is None else formats & set(llm)
+
+    corpora = {}
+    corpus_dir = os.path.join(output_dir, ".corpus_raw") if dedup else output_dir
+    caps = {} if dedup else {"max_records": max_records, "max_bytes": max_bytes}
+    vectors_path = None
+    if formats and all(entry["outputs"].get("vectors") for entry in entries.values()):
+        from .vectors import MATRIX, NpyWriter, copy_rows
+        with NpyWriter(os.path.join(corpus_dir, MATRIX)) as vector_writer:
+            for key in sorted(entries):
+                copy_rows(vector_writer, entries[key]["outputs"]["vectors"])
+        vectors_path = vector_writer.path
+    elif any(entry["outputs"].get("vectors") for entry in entries.values()):
+        logging.warning("Only some shards were built with --vectors; chunk vectors are not merged")
+    columnar_path = None
+    tables = [entry["outputs"].get("columnar") for entry in entries.values()]
+    if formats and all(tables) and len({os.path.splitext(p)[1] for p in tables}) == 1:
+        from .columnar import FORMATS as COLUMNAR_FILES, ColumnarWriter, extension
+        name = COLUMNAR_FILES[extension(tables[0])]
+        with ColumnarWriter(os.path.join(corpus_dir, name)) as columnar_writer:
+            for key in sorted(entries):
+                columnar_writer.copy(entries[key]["outputs"]["columnar"])
+        columnar_path = columnar_writer.path
+    elif any(tables):
+        logging.warning("Shards were not all built with the same --columnar; chunk tables are not merged")
+    for fmt in sorted(formats or ()):
+        with ShardedCorpusWriter(corpus_dir, fmt, **caps) as writer:
+            for key in sorted(entries):
+                with open(entries[key]["outputs"]["llm"][fmt], "r", encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            writer.write_line(with_global_chunk_id(line, key, fmt))
+        corpora[fmt] = {"records": writer.total_records, "shards": [s["file"] for s in writer.shards]}
+
+    dedup_report = None
+    if dedup and corpora:
+        from .dedup import dedup_corpora
+        raw = {fmt: [os.path.join(corpus_dir, name) for name in c["shards"]] for fmt, c in corpora.items()}
+        dedup_report = dedup_corpora(
+            raw, output_dir, mode=dedup, threshold=dedup_threshold, max_records=max_records, max_bytes=max_bytes,
+            vectors=vectors_path, columnar=columnar_path,
+        )
+        shutil.rmtree(corpus_dir, ignore_errors=True)
+        corpora = {
+            fmt: {"records": dedup_report["records_out"], "shards": [os.path.basename(p) for p in f["shards"]]}
+            for fmt, f in dedup_report["formats"].items()
+        }
+
+    vectors = None
+    if vectors_path:
+        from .vectors import META, load_matrix, write_meta
+        with open(os.path.join(shard_dirs[0], META), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        matrix = load_matrix(os.path.join(output_dir, MATRIX))
+        write_meta(output_dir, meta["model"], meta["dtype"], matrix.shape[1], len(matrix))
+        vectors = {"rows": len(matrix), "dim": matrix.shape[1], "dtype": meta["dtype"]}
+
+    columnar = None
+    if columnar_path:
+        name = os.path.basename(columnar_path)
+        rows = dedup_report["columnar"] if dedup_report else columnar_writer.rows
+        columnar = {"rows": rows, "path": os.path.join(output_dir, name)}
+
+    # The merged manifest describes output_dir: per-file outputs are linked
+    # in from the shards, so incremental runs there can reuse them
+    manifest = BuildManifest(output_dir)
+    manifest.entries = {
+        key: dict(entry, outputs=_adopt_outputs(entry["outputs"], shard_of_key[key], output_dir))
+        for key, entry in entries.items()
+    }
+    manifest.save()
+    return {"shards": len(shard_dirs), "files": len(entries), "corpora": corpora, "dedup": dedup_report,
+            "vectors": vectors, "columnar": columnar, "failed": sorted(failed)}
+
+
+def main(argv: Optional[List[str]] = None, prog: Optional[str] = None) -> int:
+    """`docs merge`: combine the outputs of `--shard K/N` runs."""
+    parser = argparse.ArgumentParser(
+        prog=prog, description="Merge the shard-K-of-N outputs of a sharded run into the final corpora"
+    )
+    parser.add_argument("output_dir", help="The --output_dir every shard ran with; merged outputs go here")
+    parser.add_argument(
+        "--shards", nargs="+", default=None, metavar="DIR",
+        help="Shard directories (default: every shard-K-of-N directory in output_dir)"
+    )
+    parser.add_argument(
+        "--shard_max_records", type=int, default=0,
+        help="Roll each combined corpus into shards of at most N records (0 = no limit)"
+    )
+    parser.add_argument(
+        "--shard_max_mb", type=float, default=0,
+        help="Roll each combined corpus into shards of at most N MB (0 = no limit)"
+    )
+    parser.add_argument(
+        "--dedup", choices=["drop", "collapse"], default=None,
+        help="Remove near-duplicate chunks across all shards (see `docs run --help`)"
+    )
+    parser.add_argument("--dedup_threshold", type=float, default=0.9, help="Jaccard threshold for --dedup")
+    parser.add_argument(
+        "--allow_failed", action="store_true",
+        help="Merge even if some inputs failed in their shard (they are left out and listed)"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        summary = merge_shards(
+            args.output_dir, args.shards,
+            max_records=args.shard_max_records, max_bytes=int(args.shard_max_mb * 1024 * 1024),
+            dedup=args.dedup, dedup_threshold=args.dedup_threshold, allow_failed=args.allow_failed,
+        )
+    except (OSError, ValueError) as e:
+        print(f"Merge failed: {e}", file=sys.stderr)
+        return 1
+    if summary["dedup"]:
+        from .dedup import format_dedup
+        print(format_dedup(summary["dedup"]))
+    for fmt, corpus in summary["corpora"].items():
+        print(f"Combined {fmt} corpus: {corpus['records']} records ({', '.join(corpus['shards'])})")
+    if summary["vectors"]:
+        v = summary["vectors"]
+        print(f"Chunk vectors: {v['rows']} x {v['dim']} {v['dtype']} ({os.path.join(args.output_dir, 'vectors.npy')})")
+    if summary["columnar"]:
+        print(f"Columnar chunks: {summary['columnar']['rows']} rows ({summary['columnar']['path']})")
+    if summary["failed"]:
+        print(f"Left out {len(summary['failed'])} failed inputs: {_listing(summary['failed'])}")
+    print(f"Merged {summary['files']} files from {summary['shards']} shards into {args.output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
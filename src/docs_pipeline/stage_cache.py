@@ -0,0 +1,152 @@
+# src/docs_pipeline/stage_cache.py
+import os
+import gzip
+import json
+import base64
+import logging
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+# ----------------------------------------------------------------------
+# Stage cache — the model-driven half of tagging, per document
+# ----------------------------------------------------------------------
+# Ingestion, OCR, cleaning, chunking and spaCy produce, for every chunk,
+# its text, word count, top words and entities. None of that depends on
+# config.yaml's keywords or intents, yet a keyword edit used to rerun all of
+# it. Those rows are kept here, one gzipped JSON-lines file per document,
+# keyed by the document's SHA-256 and a fingerprint of the settings that
+# shape them (chunking, OCR, ingest mode, tagging profile, entity patterns;
+# see ANNOTATION_KEYS in manifest.py for what is left out). A document
+# whose key is cached is only re-annotated and re-exported. With chunk
+# vectors (vectors.py) each row also keeps its vector, base64-encoded; the
+# dtype is in the header and in the analysis fingerprint.
+#
+# Files are written to a per-process temporary name and renamed into place,
+# so workers (or shards sharing a cache directory) never see partial rows.
+
+Row = Tuple  # content, word_count, top words, entities[, vector]
+
+
+class StageCacheWriter:
+    """
+    Rows of one document, written as its chunks are tagged. commit() puts
+    the entry in place only if every chunk was tagged without error.
+    """
+
+    def __init__(self, path: str, header: Dict):
+        self.path = path
+        self.complete = True
+        self._tmp = f"{path}.{os.getpid()}.tmp"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._f = gzip.open(self._tmp, "wt", encoding="utf-8")
+        self._f.write(json.dumps(header) + "\n")
+
+    def add(self, chunk: Dict) -> None:
+        """Record a tagged chunk's cacheable part (see TextTagger.annotate_stream)."""
+        if "error" in chunk:
+            self.complete = False
+            return
+        row = [chunk["content"], chunk["word_count"], chunk["keywords"], chunk.get("entities")]
+        if "vector" in chunk:
+            row.append(base64.b64encode(chunk["vector"].tobytes()).decode("ascii"))
+        self._f.write(json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def recorded(self, tagged_chunks: Iterable[Dict]) -> Iterator[Dict]:
+        """Re-yield tagged chunks, adding each one on the way."""
+        for chunk in tagged_chunks:
+            self.add(chunk)
+            yield chunk
+
+    def commit(self) -> None:
+        if not self.complete:
+            self.abort()
+            return
+        self._f.close()
+        os.replace(self._tmp, self.path)
+
+    def abort(self) -> None:
+        self._f.close()
+        if os.path.exists(self._tmp):
+            os.remove(self._tmp)
+
+
+class StageCache:
+    """Per-document stage outputs in `directory`, keyed by make_key()."""
+
+    VERSION = 1
+    SUFFIX = ".jsonl.gz"
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    @staticmethod
+    def make_key(content_hash: str, analysis_fingerprint: str) -> str:
+        return f"{content_hash}-{analysis_fingerprint[:16]}"
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + self.SUFFIX)
+
+    def load(self, key: str) -> Optional[Tuple[Dict, Iterator[Row]]]:
+        """(header, rows) for a cached document, or None. Rows are read lazily."""
+        path = self.path(key)
+        try:
+            f = gzip.open(path, "rt", encoding="utf-8")
+            header = json.loads(f.readline())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, EOFError) as e:
+            logging.warning(f"Dropping unreadable stage cache entry {path}: {e}")
+            self._remove(path)
+            return None
+        if header.get("version") != self.VERSION:
+            f.close()
+            return None
+        return header, self._rows(f, path, header.get("vectors"))
+
+    def _rows(self, f, path: str, vector_dtype: Optional[str] = None) -> Iterator[Row]:
+        if vector_dtype:
+            import numpy as np
+        try:
+            with f:
+                for line in f:
+                    row = json.loads(line)
+                    if row[3] is not None:  # (text, label) pairs, as TextTagger makes them
+                        row[3] = [tuple(entity) for entity in row[3]]
+                    if vector_dtype:
+                        row[4] = np.frombuffer(base64.b64decode(row[4]), dtype=vector_dtype)
+                    yield tuple(row)
+        except (OSError, ValueError, EOFError):
+            # A damaged entry must not fail the retry too
+            self._remove(path)
+            raise
+
+    def writer(self, key: str, chunks: int, words: int, vectors: Optional[str] = None) -> StageCacheWriter:
+        header = {"version": self.VERSION, "chunks": chunks, "words": words}
+        if vectors:
+            header["vectors"] = vectors
+        return StageCacheWriter(self.path(key), header)
+
+    def prune(self, keep: Iterable[str]) -> int:
+        """Remove entries (and leftover temporary files) not in `keep`; returns how many."""
+        keep = {key + self.SUFFIX for key in keep}
+        removed = 0
+        if not os.path.isdir(self.directory):
+            return 0
+        with os.scandir(self.directory) as subdirs:
+            for subdir in subdirs:
+                if not subdir.is_dir():
+                    continue
+                with os.scandir(subdir.path) as entries:
+                    for entry in entries:
+                        if entry.name not in keep:
+                            self._remove(entry.path)
+                            removed += 1
+        return removed
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.warning(f"Could not remove stage cache entry {path}: {e}")
@@ -0,0 +1,226 @@
+# src/docs_pipeline/supervisor.py
+import os
+import time
+import signal
+import logging
+import traceback
+from collections import deque
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+
+# ----------------------------------------------------------------------
+# Supervised pool — per-file timeouts, retries, crash and hang recovery
+# ----------------------------------------------------------------------
+# Files go to a multiprocessing Pool at most `workers` at a time, so every
+# file in flight is running and its start is known. Each worker announces
+# the file it starts (and its pid) on an events queue. From that the parent
+# can tell when a file overran its timeout, or when the worker holding it
+# died (OOM killer, segfault) — the Pool replaces a dead worker but would
+# never report its task. Failed files are retried up to `retries` times.
+#
+# Timeouts are enforced twice: SIGALRM inside the worker raises FileTimeout
+# in Python code; a worker stuck in C code (a hung OCR call) does not see
+# it, so past a hard limit the parent terminates the whole pool, starts a
+# new one and re-queues the other files that were in flight.
+
+_EVENTS: Dict[str, object] = {"queue": None}
+
+
+class FileTimeout(Exception):
+    """Raised inside a worker when a file exceeds its wall-clock limit."""
+
+
+class WorkerInitError(RuntimeError):
+    """A worker could not start (model missing, bad config, ...)."""
+
+
+class Outcome(NamedTuple):
+    path: str
+    result: Dict          # process_single's result; "error" is set on failure
+    attempts: int
+    errors: List[Dict]    # one entry per failed attempt: attempt, kind, type, message, traceback
+
+
+def error_record(e: BaseException) -> Dict:
+    """Picklable description of an exception, for results and errors.jsonl."""
+    return {
+        "type": type(e).__name__,
+        "message": str(e),
+        "traceback": "".join(traceback.format_exception(type(e), e, e.__traceback__)),
+    }
+
+
+def hard_timeout(timeout: float) -> Optional[float]:
+    """When the parent gives up on a file that ignored its SIGALRM."""
+    return timeout + max(30.0, timeout / 2) if timeout > 0 else None
+
+
+# ---- worker side ------------------------------------------------------
+def init_supervised(events, initializer: Optional[Callable], *initargs) -> None:
+    """Pool initializer wrapper: keep the events queue, report init failures."""
+    _EVENTS["queue"] = events
+    if initializer is None:
+        return
+    try:
+        initializer(*initargs)
+    except BaseException as e:
+        events.put(("init_failed", os.getpid(), error_record(e)))
+        raise
+
+
+def supervised_call(func: Callable[[str], Dict], timeout: float, path: str) -> Dict:
+    """Run func(path) in a worker under a SIGALRM wall-clock limit."""
+    events = _EVENTS["queue"]
+    if events is not None:
+        events.put(("start", path, os.getpid()))
+    alarm = timeout > 0 and hasattr(signal, "SIGALRM")
+    if alarm:
+        def on_alarm(signum, frame):
+            raise FileTimeout(f"{os.path.basename(path)} exceeded {timeout:g}s")
+        previous = signal.signal(signal.SIGALRM, on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return func(path)
+    except FileTimeout as e:  # fired outside func's own error handling
+        return {"file": path, "llm": None, "error": error_record(e)}
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+
+
+# ---- parent side ------------------------------------------------------
+def _alive(pid: int) -> bool:
+    if os.name != "posix":  # os.kill(pid, 0) would terminate the process on Windows
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class Supervisor:
+    """
+    Run `func` over paths on pools made by `make_pool(initializer, initargs)`,
+    yielding one Outcome per path as it finishes for good (in completion
+    order). `timeout` is the per-file limit in seconds (0 = none);
+    `hard_limit` overrides when the parent gives up on a file.
+    """
+
+    POLL_S = 0.05
+    CRASH_GRACE_S = 1.0  # a recycled worker exits right after its result is sent
+
+    def __init__(
+        self,
+        make_pool: Callable,
+        ctx,
+        workers: int,
+        initializer: Optional[Callable] = None,
+        initargs: tuple = (),
+        timeout: float = 0,
+        retries: int = 1,
+        hard_limit: Optional[float] = None,
+    ):
+        self.make_pool = make_pool
+        self.ctx = ctx
+        self.workers = max(1, workers)
+        self.initializer = initializer
+        self.initargs = initargs
+        self.timeout = timeout
+        self.retries = max(0, retries)
+        self.hard_limit = hard_limit if hard_limit is not None else hard_timeout(timeout)
+        self.restarts = 0
+
+    def _start(self):
+        # SimpleQueue writes synchronously: a Queue's feeder thread could still hold
+        # the "start" of a worker that dies right away. A fresh one per pool, since
+        # a killed worker may die holding the old one's lock.
+        events = self.ctx.SimpleQueue()
+        pool = self.make_pool(init_supervised, (events, self.initializer, *self.initargs))
+        return pool, events
+
+    def _drain(self, events, inflight: Dict[str, Dict]) -> None:
+        messages = []
+        while not events.empty():
+            messages.append(events.get())
+        if not messages:
+            time.sleep(self.POLL_S)
+        for kind, subject, detail in messages:
+            if kind == "init_failed":
+                raise WorkerInitError(f"Worker {subject} failed to start: {detail['type']}: {detail['message']}")
+            task = inflight.get(subject)
+            if kind == "start" and task is not None and task["pid"] is None:
+                task["pid"] = detail
+                task["started"] = time.monotonic()
+
+    def _check(self, path: str, task: Dict, now: float, limit: Optional[float]):
+        """(result, failure kind, error) once the task is over, else None."""
+        if task["result"].ready():
+            try:
+                result = task["result"].get()
+            except Exception as e:  # raised outside func's own handling (e.g. unpicklable result)
+                result = {"file": path, "llm": None, "error": error_record(e)}
+            error = result.get("error")
+            if not error:
+                return result, None, None
+            return result, "timeout" if error["type"] == "FileTimeout" else "error", error
+        pid = task["pid"]
+        if pid is not None and not _alive(pid):
+            task.setdefault("dead_since", now)
+            if now - task["dead_since"] >= self.CRASH_GRACE_S:
+                message = f"worker {pid} exited while processing {os.path.basename(path)}"
+                return None, "crash", {"type": "WorkerCrash", "message": message, "traceback": ""}
+        if limit is not None and task["started"] is not None and now - task["started"] > limit:
+            message = f"{os.path.basename(path)} still running after {limit:g}s; pool restarted"
+            return None, "hang", {"type": "HardTimeout", "message": message, "traceback": ""}
+        return None
+
+    def run(self, func: Callable[[str], Dict], paths: List[str]) -> Iterator[Outcome]:
+        pending = deque((path, 1) for path in paths)
+        errors: Dict[str, List[Dict]] = {path: [] for path in paths}
+        inflight: Dict[str, Dict] = {}
+        limit = self.hard_limit
+        pool, events = self._start()
+        try:
+            while pending or inflight:
+                while pending and len(inflight) < self.workers:
+                    path, attempt = pending.popleft()
+                    inflight[path] = {
+                        "result": pool.apply_async(supervised_call, (func, self.timeout, path)),
+                        "attempt": attempt, "pid": None, "started": None,
+                    }
+                self._drain(events, inflight)
+                now = time.monotonic()
+                restart = False
+                for path, task in list(inflight.items()):
+                    checked = self._check(path, task, now, limit)
+                    if checked is None:
+                        continue
+                    del inflight[path]
+                    result, kind, error = checked
+                    if kind is None:
+                        yield Outcome(path, result, task["attempt"], errors[path])
+                        continue
+                    errors[path].append({"attempt": task["attempt"], "kind": kind, **error})
+                    restart = restart or kind == "hang"
+                    if task["attempt"] <= self.retries:
+                        # Retried after the rest of the queue, so one bad file cannot stall the others
+                        pending.append((path, task["attempt"] + 1))
+                        logging.warning(f"Retrying {os.path.basename(path)} after {kind}: {error['message']}")
+                    else:
+                        failed = result or {"file": path, "llm": None}
+                        failed["error"] = error
+                        yield Outcome(path, failed, task["attempt"], errors[path])
+                if restart:
+                    pool.terminate()
+                    pool.join()
+                    for path, task in inflight.items():
+                        pending.appendleft((path, task["attempt"]))
+                    inflight.clear()
+                    self.restarts += 1
+                    pool, events = self._start()
+        finally:
+            pool.terminate()
+            pool.join()
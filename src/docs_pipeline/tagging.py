@@ -0,0 +1,477 @@
+# src/docs_pipeline/tagging.py
+import nltk
+import logging
+import yaml
+import os
+import re
+import time
+from typing import List, Dict, Iterable, Iterator, Set, Tuple, Optional
+from nltk.corpus import stopwords
+from collections import Counter
+from itertools import islice
+from nltk.tokenize.destructive import MacIntyreContractions, NLTKWordTokenizer
+from .keywords import TOKEN_RE, KeywordMatcher, tokenize
+from .intents import IntentClassifier
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# ----------------------------------------------------------------------
+# Words from the spaCy doc
+# ----------------------------------------------------------------------
+# word_count and the top keywords used to come from
+# nltk.word_tokenize(chunk.lower()), and policy keywords and intents from a
+# regex pass over the text: two more tokenizations of every chunk. All of
+# them are now read off the doc spaCy already made.
+#
+# doc_tokens() gives keywords.tokenize()'s \w+ runs (what config keywords
+# and intent markers are matched against) from the doc's tokens.
+#
+# doc_words() gives nltk.word_tokenize()'s words. Sentences still come from
+# NLTK's Punkt model (span_tokenize, one regex scan; its trained
+# abbreviations keep "dr." and "e.g." whole), but the Treebank regexes no
+# longer run: the doc's tokens are joined back into whitespace-separated
+# spans and each span is cut where Treebank cuts (spaCy splits "5km" and
+# "well-known", Treebank does not; Treebank splits "a@b.com"). Plain
+# alphanumeric spans, most of any text, are words as they are.
+# tests/test_tagger.py compares both with the old tokenizations.
+
+# Padded by the Treebank tokenizer wherever they occur
+_PADDED = frozenset(";@#$%&?!*()[]{}<>«“‘„»”’‒–—―")
+# A double quote at the start of a span or after one of these opens: ``
+_QUOTE_OPENERS = frozenset("([{<`«“‘„")
+# What may follow the last period of a text and still be split from it
+_CLOSERS = frozenset(")]}>\"'»”’")
+# Padded before Treebank splits a quote off the end of a word
+_PADDED_EARLY = frozenset(";@#$%&?!‒–—―«“‘„")
+# Treebank's clitic rules, in the order it applies them, and its contractions
+_CLITICS = (("'s", "'m", "'d", "'"), ("'ll", "'re", "'ve", "n't"))
+_TREEBANK = NLTKWordTokenizer()
+_CONTRACTIONS = [
+    re.compile(pattern) for pattern in MacIntyreContractions.CONTRACTIONS2 + MacIntyreContractions.CONTRACTIONS3
+]
+_CONTRACTION_HINT = re.compile(r"\b(?:can|d|gim|gon|got|lem|more|wan)")
+_CONTRACTION_WORDS = frozenset(("cannot", "gimme", "gonna", "gotta", "lemme", "wanna"))
+# A quote not after a word character is split off, unless it starts a clitic
+_QUOTE_CLITIC = re.compile(r"(?:re|ve|ll|m|t|s|d|n)\b")
+
+
+def load_punkt(language: str = "english"):
+    """NLTK's trained Punkt sentence tokenizer, the one nltk.word_tokenize uses."""
+    try:
+        from nltk.tokenize.punkt import PunktTokenizer  # nltk >= 3.8.2 (punkt_tab)
+    except ImportError:
+        return nltk.data.load(f"tokenizers/punkt/{language}.pickle")
+    return PunktTokenizer(language)
+
+
+def doc_tokens(doc) -> List[str]:
+    """keywords.tokenize(doc.text), from the doc's tokens ("don't" is one run, "do" + "n't" to spaCy)."""
+    tokens: List[str] = []
+    glued = False  # the previous token ended in a word character, no space after
+    for tok in doc:
+        text = tok.lower_
+        runs = [text] if text.isalnum() else TOKEN_RE.findall(text)
+        if runs and glued and TOKEN_RE.match(text):
+            tokens[-1] += runs.pop(0)
+        tokens.extend(runs)
+        glued = not tok.whitespace_ and bool(TOKEN_RE.match(text[-1:]))
+    return tokens
+
+
+def _spans(doc) -> List[Tuple[int, str]]:
+    """(offset, lowercased text) of each whitespace-separated run of the doc, from its tokens."""
+    spans: List[Tuple[int, str]] = []
+    parts: List[str] = []
+    offset = 0
+    for tok in doc:
+        if not tok.is_space:
+            if not parts:
+                offset = tok.idx
+            parts.append(tok.lower_)
+        if parts and (tok.whitespace_ or tok.is_space):
+            spans.append((offset, "".join(parts)))
+            parts = []
+    if parts:
+        spans.append((offset, "".join(parts)))
+    return spans
+
+
+def _clitics(word: str, spaced: bool) -> List[str]:
+    """
+    Treebank's clitic and contraction rules for a word the padding left
+    whole; `spaced` if a space follows it by the time Treebank splits a
+    closing quote off a word.
+    """
+    tail: List[str] = []
+    if spaced and word.endswith("'") and len(word) > 1 and word[-2] != "'":
+        word, tail = word[:-1], ["'"]
+    for suffixes in _CLITICS:
+        for suffix in suffixes:
+            if word.endswith(suffix) and len(word) > len(suffix) and word[-len(suffix) - 1] != "'":
+                word, tail = word[:-len(suffix)], [suffix] + tail
+                break
+    if not _CONTRACTION_HINT.search(word):
+        return [word] + tail
+    text = f" {word} "
+    for regexp in _CONTRACTIONS:
+        text = regexp.sub(r" \1 \2 ", text)
+    return text.split() + tail
+
+
+def _word_char(c: str) -> bool:
+    return c.isalnum() or c == "_"
+
+
+def _span_words(span: str, periods: Set[int], sentence_start: bool, after_space: bool, before_space: bool) -> List[str]:
+    """
+    Treebank tokens of one span; the periods at `periods` end a sentence and
+    are split off. Treebank only pads at plain spaces, so `after_space` and
+    `before_space` say whether one is next to the span in its sentence.
+    """
+    words: List[str] = []
+    word: List[str] = []
+
+    def flush(spaced: bool):
+        if word:
+            words.extend(_clitics("".join(word), spaced))
+            word.clear()
+
+    i, n = 0, len(span)
+    kept = -1  # a "," or ":" matched along with the one before it, and not padded
+    while i < n:
+        c = span[i]
+        if c == '"' or (c == "'" and span[i + 1:i + 2] == "'"):
+            flush(False)
+            if i:
+                opens = span[i - 1] in _QUOTE_OPENERS or (i == 1 and sentence_start and span[0] == '"')
+            else:
+                opens = after_space or (sentence_start and c == '"')  # only " opens a sentence
+            words.append("``" if opens else "''")
+            i += 1 if c == '"' else 2
+        elif c in _PADDED:
+            flush(c in _PADDED_EARLY)
+            words.append(c)
+            i += 1
+        elif c == "`" or (c in ".-" and span[i + 1:i + 2] == c):
+            # backtick pairs, "--" pairs and runs of two or more dots
+            j = i
+            while j < n and span[j] == c:
+                j += 1
+            flush(c != "-")
+            if c == ".":
+                words.append(span[i:j])
+            else:
+                pairs, odd = divmod(j - i, 2)
+                words.extend([c * 2] * pairs)
+                if odd:  # "```" is `` and `; "---" is -- and a "-" left on the next word
+                    (word if c == "-" else words).append(c)
+            i = j
+        elif c in ",:" and i != kept and not span[i + 1:i + 2].isdecimal():
+            flush(True)
+            words.append(c)
+            i += 1
+            kept = i
+        elif i in periods:
+            flush(True)
+            words.append(".")
+            i += 1
+        elif (
+            c == "'" and i + 1 < n and (i == 0 or not _word_char(span[i - 1])) and _word_char(span[i + 1])
+            and not _QUOTE_CLITIC.match(span, i + 1)
+        ):
+            flush(True)
+            words.append("'")
+            i += 1
+        else:
+            word.append(c)
+            i += 1
+    flush(before_space)
+    return words
+
+
+def _final_period(text: str, sentence: List[Tuple[int, str]]) -> Tuple[int, int]:
+    """(span, index) of the period Treebank splits off the end of a sentence, or (-1, -1)."""
+    k = len(sentence) - 1
+    while k > 0 and all(c in _CLOSERS for c in sentence[k][1]):
+        offset, span = sentence[k]
+        previous, before = sentence[k - 1]
+        if span.startswith(('"', "''")) or text[previous + len(before):offset].strip(" "):
+            return -1, -1  # an opening quote by then (`` is no closer), or not plain spaces
+        k -= 1
+    span = sentence[k][1] if sentence else ""
+    end = len(span.rstrip("".join(_CLOSERS)))
+    if end and span[end - 1] == "." and span[end - 2:end - 1] != ".":
+        return k, end - 1
+    return -1, -1
+
+
+def doc_words(doc, punkt) -> List[str]:
+    """
+    nltk.word_tokenize(doc.text.lower()), from the doc's tokens. `punkt` is
+    the sentence tokenizer that splits the text first (see load_punkt).
+    """
+    text = doc.text.lower()
+    if len(text) != len(doc.text):  # lowercasing moved the offsets ("İ")
+        return [word for sentence in punkt.tokenize(text) for word in _TREEBANK.tokenize(sentence)]
+    spans = _spans(doc)
+    words: List[str] = []
+    k = 0
+    for start, end in punkt.span_tokenize(text):
+        sentence: List[Tuple[int, str]] = []
+        while k < len(spans) and spans[k][0] < end:
+            offset, span = spans[k]
+            if offset + len(span) > end:  # the sentence ends inside this run
+                sentence.append((offset, span[:end - offset]))
+                spans[k] = (end, span[end - offset:])
+                break
+            sentence.append((offset, span))
+            k += 1
+        last, period = _final_period(text, sentence)
+        for i, (offset, span) in enumerate(sentence):
+            if span.isalnum() and span not in _CONTRACTION_WORDS:
+                words.append(span)
+                continue
+            after_space = i > 0 and text[offset - 1] == " "
+            before_space = i < len(sentence) - 1 and text[offset + len(span)] == " "
+            periods = {period} if i == last else set()
+            words.extend(_span_words(span, periods, i == 0, after_space, before_space))
+    return words
+
+
+class TextTagger:
+    """
+    Handles tagging chunks with metadata, keywords, entities, and intents.
+
+    `profile` picks the NER backend:
+      fast     — no spaCy: keywords and intents only, no `entities` key
+      balanced — en_core_web_sm (a blank pipeline if it is not installed)
+      full     — en_core_web_lg (the default)
+    config.yaml `entity_patterns` (spaCy EntityRuler patterns) are added to
+    either spaCy profile; with a blank balanced pipeline they are the only NER.
+    """
+    
+    DEFAULT_BATCH_SIZE = 64
+    PROFILES = ("fast", "balanced", "full")
+    SPACY_MODELS = {"balanced": "en_core_web_sm", "full": "en_core_web_lg"}
+
+    def __init__(self, config_path: str = "config.yaml", batch_size: Optional[int] = None, profile: str = "full"):
+        """Load generic keywords from config.yaml."""
+        if profile not in self.PROFILES:
+            raise ValueError(f"Unknown tagging profile {profile!r}; expected one of {self.PROFILES}")
+        self.profile = profile
+        nltk.download('stopwords', quiet=True)
+        
+        # Load generic keywords from config, compiled once into a matcher
+        self.keyword_matcher = KeywordMatcher()
+        config = {}
+        if os.path.exists(config_path):
+            try:
+                with open(config_path, 'r', encoding='utf-8') as f:
+                    config = yaml.safe_load(f) or {}
+                self.keyword_matcher = KeywordMatcher.from_config(config)
+                logging.info(f"Loaded {len(self.keyword_matcher)} keywords from {config_path}")
+            except Exception as e:
+                logging.warning(f"Failed to load keywords from {config_path}: {e}")
+        else:
+            logging.warning(f"Config file {config_path} not found. Using empty keyword set.")
+
+        # nlp.pipe batch size: explicit argument > config.yaml > default
+        self.batch_size = int(batch_size or config.get("tag_batch_size") or self.DEFAULT_BATCH_SIZE)
+        # Also emit keyword_matches: [tag, start, end] character offsets per match
+        self.keyword_offsets = bool(config.get("keyword_offsets", False))
+
+        self.stop_words = set(stopwords.words('english'))
+        self.intent_classifier = IntentClassifier.from_config(config)
+
+        # spaCy pipeline (NER-only for speed); None for the fast profile
+        self.nlp = None if profile == "fast" else self._load_nlp(config.get("entity_patterns") or [])
+        # Sentence splitter behind word_count (see doc_words); spaCy profiles only
+        self.punkt = None if self.nlp is None else self._load_punkt()
+        logging.info(f"TextTagger initialized ({profile} profile)")
+
+    def _load_nlp(self, entity_patterns: List[Dict]):
+        import spacy
+        model = self.SPACY_MODELS[self.profile]
+        try:
+            nlp = spacy.load(model, disable=['parser', 'tagger', 'lemmatizer'])
+        except OSError:
+            if self.profile == "full":
+                raise
+            logging.warning(f"{model} is not installed; balanced profile uses a blank pipeline")
+            nlp = spacy.blank("en")
+        if entity_patterns:
+            ruler = nlp.add_pipe("entity_ruler", before="ner" if "ner" in nlp.pipe_names else None)
+            ruler.add_patterns(entity_patterns)
+            logging.info(f"Loaded {len(entity_patterns)} entity patterns")
+        elif "ner" not in nlp.pipe_names:
+            logging.warning("No NER model and no entity_patterns: chunks will have no entities")
+        return nlp
+
+    def _load_punkt(self):
+        nltk.download('punkt_tab', quiet=True)
+        try:
+            return load_punkt()
+        except LookupError:
+            logging.warning("NLTK punkt_tab is not installed; sentence breaks use spaCy's abbreviations")
+        from nltk.tokenize.punkt import PunktSentenceTokenizer
+        punkt = PunktSentenceTokenizer()
+        punkt._params.abbrev_types.update(
+            orth[:-1].lower() for orth in self.nlp.tokenizer.rules
+            if orth.endswith(".") and len(orth) > 2 and orth[:-1].replace(".", "").isalpha()
+        )
+        return punkt
+
+    def _pipe(self, items: Iterable[Tuple[str, object]], batch_size: Optional[int] = None) -> Iterator[Tuple[str, object, object]]:
+        """(text, context) -> (text, spaCy doc or None, context), batched through nlp.pipe."""
+        if self.nlp is None:
+            for text, context in items:
+                yield text, None, context
+            return
+        stream = self.nlp.pipe(items, as_tuples=True, batch_size=batch_size or self.batch_size)
+        for doc, context in stream:
+            yield doc.text, doc, context
+
+    def _tag_doc(self, i: int, chunk: str, doc, file_name: str, total_chunks: int) -> Dict:
+        """
+        Build the chunk dict from a single spaCy pass: word count, top
+        words, config keywords and intents are all read off the doc's tokens.
+        Without a doc (fast profile) words come from the regex tokenizer and
+        the chunk has no `entities`.
+        """
+        try:
+            if doc is None:
+                tokens = words = tokenize(chunk)
+            else:
+                tokens, words = doc_tokens(doc), doc_words(doc, self.punkt)
+            filtered_words = [w for w in words if w.isalnum() and w not in self.stop_words]
+            top_keywords = [word for word, _ in Counter(filtered_words).most_common(5)]
+            entities = [(ent.text, ent.label_) for ent in doc.ents] if doc is not None else None
+            return self._annotate(i, chunk, len(words), top_keywords, entities, file_name, total_chunks, tokens)
+        except Exception as e:
+            return self._failed(i, chunk, file_name, e)
+
+    def _annotate(
+        self,
+        i: int,
+        chunk: str,
+        word_count: int,
+        top_keywords: List[str],
+        entities: Optional[List],
+        file_name: str,
+        total_chunks: int,
+        tokens: Optional[List[str]] = None,
+    ) -> Dict:
+        """
+        The config.yaml-driven part of tagging (keywords, intents) on top of
+        the model-driven part (word count, top words, entities). `entities`
+        is None when no NER ran.
+        """
+        # Config keywords (terms and aliases) and intents: one automaton
+        # pass each over the same word tokens
+        if tokens is None:
+            tokens = tokenize(chunk)
+        matched_keywords = self.keyword_matcher.match_tokens(tokens)
+
+        intents = self.intent_classifier.classify_tokens(tokens)
+
+        tagged = {
+            'chunk_id': i,
+            'file_name': file_name,
+            'content': chunk,
+            'word_count': word_count,
+            'keywords': top_keywords,
+            'policy_keywords': matched_keywords,  # canonical tags, first occurrence order
+            'entities': entities,
+            'intents': intents,
+            'chunk_position': i / total_chunks if total_chunks > 0 else 0.0,
+        }
+        if entities is None:
+            del tagged['entities']  # no NER ran; exporters treat it as absent
+        if self.keyword_offsets:
+            tagged['keyword_matches'] = [[m.tag, m.start, m.end] for m in self.keyword_matcher.finditer(chunk)]
+        return tagged
+
+    @staticmethod
+    def _failed(i: int, chunk: str, file_name: str, e: Exception) -> Dict:
+        logging.error(f"Error tagging chunk {i}: {e}")
+        return {
+            'chunk_id': i, 'file_name': file_name, 'content': chunk, 'error': str(e)
+        }
+
+    def _tag_single(self, i: int, chunk: str, file_name: str, total_chunks: int) -> Dict:
+        """Tag one chunk on its own (unbatched). Prefer tag_stream/tag_chunks."""
+        doc = self.nlp(chunk) if self.nlp is not None else None
+        return self._tag_doc(i, chunk, doc, file_name, total_chunks)
+
+    @property
+    def vector_dim(self) -> int:
+        """Width of the model's word vectors (0: none, e.g. fast profile or en_core_web_sm)."""
+        if self.nlp is None or not self.nlp.vocab.vectors.size:
+            return 0
+        return self.nlp.vocab.vectors.shape[1]
+
+    def tag_stream(
+        self,
+        chunks: Iterable[str],
+        file_name: str,
+        total_chunks: int,
+        batch_size: Optional[int] = None,
+        vectors: Optional[str] = None,
+    ) -> Iterator[Dict]:
+        """
+        Tag chunks as they arrive (e.g. from TextChunker.chunk_stream).
+        Only one nlp.pipe batch is held in memory; `total_chunks` must be
+        known up front for chunk_position. With `vectors` (a dtype, see
+        vectors.py) each chunk also carries its `vector`, computed per batch.
+        """
+        stream = self._pipe(((chunk, None) for chunk in chunks), batch_size)
+        if not vectors:
+            for i, (text, doc, _) in enumerate(stream):
+                yield self._tag_doc(i, text, doc, file_name, total_chunks)
+            return
+        if not self.vector_dim:
+            raise ValueError(f"{self.profile} profile has no word vectors; chunk vectors need en_core_web_lg")
+        from .vectors import chunk_vectors
+        i = 0
+        while True:
+            batch = list(islice(stream, batch_size or self.batch_size))
+            if not batch:
+                return
+            matrix = chunk_vectors([doc for _, doc, _ in batch], vectors)
+            for (text, doc, _), vector in zip(batch, matrix):
+                tagged = self._tag_doc(i, text, doc, file_name, total_chunks)
+                tagged['vector'] = vector
+                yield tagged
+                i += 1
+
+    def annotate_stream(
+        self,
+        analyses: Iterable[Tuple[str, int, List[str], Optional[List]]],
+        file_name: str,
+        total_chunks: int,
+    ) -> Iterator[Dict]:
+        """
+        Re-tag chunks from a previous run's model output — (content,
+        word_count, top words, entities or None[, vector]) per chunk, see
+        stage_cache.py — applying the current keywords and intents without
+        running spaCy.
+        """
+        for i, (chunk, word_count, top_keywords, entities, *vector) in enumerate(analyses):
+            try:
+                tagged = self._annotate(i, chunk, word_count, top_keywords, entities, file_name, total_chunks)
+            except Exception as e:
+                tagged = self._failed(i, chunk, file_name, e)
+            if vector:
+                tagged['vector'] = vector[0]
+            yield tagged
+
+    def tag_chunks(self, chunks: List[str], file_name: str, batch_size: Optional[int] = None) -> List[Dict]:
+        total_chunks = len(chunks)
+        if total_chunks == 0:
+            return []
+        start = time.perf_counter()
+        tagged = list(self.tag_stream(chunks, file_name, total_chunks, batch_size))
+        elapsed = time.perf_counter() - start
+        rate = len(tagged) / elapsed if elapsed > 0 else float("inf")
+        logging.info(f"Tagged {len(tagged)} chunks for {file_name} ({rate:.1f} chunks/sec)")
+        return tagged
@@ -0,0 +1,60 @@
+# src/docs_pipeline/utils.py
+import os
+import logging
+from typing import Iterator, List, Optional
+
+
+def iter_files(directory: str, extension: str, recursive: bool = False) -> Iterator[str]:
+    """
+    Paths of the files ending in `extension` under `directory`, read with
+    os.scandir (file types come from the directory entries, no stat per
+    file). Symlinked directories are not followed.
+    """
+    stack = [directory]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        stack.append(entry.path)
+                elif entry.name.endswith(extension) and entry.is_file():
+                    yield entry.path
+
+
+def get_files_with_extension(directory: str, extension: str, recursive: bool = False) -> List[str]:
+    """Get all files with a given extension in a directory (sorted, so every node sees the same order)."""
+    return sorted(iter_files(directory, extension, recursive))
+
+
+def read_file_list(list_file: str) -> List[str]:
+    """
+    Input paths from a text file, one per line; blank lines and `#`
+    comments are skipped, relative paths are relative to the list file.
+    Missing files are reported and dropped.
+    """
+    base = os.path.dirname(os.path.abspath(list_file))
+    paths = []
+    with open(list_file, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            path = os.path.normpath(os.path.join(base, line))
+            if os.path.isfile(path):
+                paths.append(path)
+            else:
+                logging.warning(f"{list_file}: no such file {line}")
+    return paths
+
+
+def input_key(path: str, root: Optional[str] = None) -> str:
+    """
+    Stable name of an input file: its path relative to `root` with `/`
+    separators, or its file name when there is no root or it lies outside.
+    Used for the manifest, per-file output names and shard assignment.
+    """
+    if root:
+        rel = os.path.relpath(os.path.abspath(path), os.path.abspath(root))
+        if rel != os.pardir and not rel.startswith(os.pardir + os.sep):
+            return rel.replace(os.sep, "/")
+    return os.path.basename(path)
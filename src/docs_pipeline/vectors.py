@@ -0,0 +1,256 @@
+# src/docs_pipeline/vectors.py
+import os
+import sys
+import json
+import struct
+import argparse
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .corpus_writer import corpus_files, corpus_formats
+
+# ----------------------------------------------------------------------
+# Local chunk vectors — spaCy word vectors, memory-mapped .npy matrices
+# ----------------------------------------------------------------------
+# The full tagging profile already loads en_core_web_lg and its 300-d word
+# vectors. With `--vectors`, every chunk also gets the mean of its tokens'
+# vectors (L2-normalised, so a dot product is the cosine similarity),
+# computed for a whole nlp.pipe batch at once: token ids -> vector table rows
+# -> one gather and one segmented sum in NumPy, no per-token Python.
+#
+# Each file's vectors go to vectors/<key>.npy and, in corpus order, to
+# <output_dir>/vectors.npy: row i is the i-th record of every combined
+# {format}_corpus (across its shards). vectors.json records the model, so
+# `docs vectors` embeds query text the same way. Matrices are streamed to
+# disk (NpyWriter) and searched through np.load(mmap_mode="r") in blocks,
+# so neither side holds the whole matrix in memory.
+
+DTYPES = ("float32", "float16")
+MATRIX = "vectors.npy"
+META = "vectors.json"
+
+_HEADER_SIZE = 128  # fixed, so the final shape can be written over the placeholder
+
+
+def chunk_vectors(docs: Sequence, dtype: str = "float32") -> np.ndarray:
+    """
+    (len(docs), dim) matrix of unit-length mean word vectors, one row per
+    spaCy doc. Tokens without a vector are ignored; a doc with none gets a
+    zero row. Same direction as spaCy's doc.vector.
+    """
+    from spacy.attrs import ORTH
+    table = docs[0].vocab.vectors if docs else None
+    dim = table.shape[1] if table is not None else 0
+    out = np.zeros((len(docs), dim), dtype=np.float32)
+    if not docs or not dim:
+        return out.astype(dtype)
+    rows = [table.find(keys=doc.to_array(ORTH)) if len(doc) else np.empty(0, dtype=np.int32) for doc in docs]
+    counts = np.array([np.count_nonzero(r >= 0) for r in rows])
+    flat = np.concatenate(rows)
+    flat = flat[flat >= 0]
+    if len(flat):
+        gathered = np.asarray(table.data, dtype=np.float32)[flat]
+        has = counts > 0
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[has]
+        out[has] = np.add.reduceat(gathered, starts, axis=0)
+    norms = np.linalg.norm(out, axis=1, keepdims=True)
+    np.divide(out, norms, out=out, where=norms > 0)
+    return out.astype(dtype)
+
+
+class NpyWriter:
+    """
+    Write an (n, dim) .npy matrix one block of rows at a time, without
+    knowing n up front: the header is a fixed-size placeholder rewritten
+    with the final shape on close(). Written to `.tmp` and renamed, so a
+    reader never sees a partial matrix. With `flat` it writes a 1-D array
+    instead (e.g. postings, see search_index.py).
+    """
+
+    BLOCK = 65536  # rows converted and written at a time, so a memmap is never read whole
+
+    def __init__(self, path: str, dtype: str = "float32", dim: int = 0, flat: bool = False):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.dim = dim
+        self.flat = flat
+        self.rows = 0
+        self._tmp = path + ".tmp"
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._f = open(self._tmp, "wb")
+        self._f.write(b"\0" * _HEADER_SIZE)
+
+    def append(self, matrix: np.ndarray) -> None:
+        matrix = np.asarray(matrix)  # a view for memmaps; nothing is read yet
+        if matrix.ndim == 1 and not self.flat:
+            matrix = matrix[None, :]
+        if not len(matrix):
+            return
+        if not self.flat and not self.dim:
+            self.dim = matrix.shape[1]
+        elif not self.flat and matrix.shape[1] != self.dim:
+            raise ValueError(f"{self.path}: rows of width {matrix.shape[1]}, expected {self.dim}")
+        for start in range(0, len(matrix), self.BLOCK):
+            self._f.write(np.ascontiguousarray(matrix[start:start + self.BLOCK], dtype=self.dtype).tobytes())
+        self.rows += len(matrix)
+
+    def close(self) -> str:
+        header = repr({"descr": np.lib.format.dtype_to_descr(self.dtype), "fortran_order": False,
+                       "shape": (self.rows,) if self.flat else (self.rows, self.dim)}).encode("latin1")
+        body = header.ljust(_HEADER_SIZE - 10 - 1) + b"\n"
+        self._f.seek(0)
+        self._f.write(b"\x93NUMPY\x01\x00" + struct.pack("<H", len(body)) + body)
+        self._f.close()
+        os.replace(self._tmp, self.path)
+        return self.path
+
+    def abort(self) -> None:
+        self._f.close()
+        if os.path.exists(self._tmp):
+            os.remove(self._tmp)
+
+    def __enter__(self) -> "NpyWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def load_matrix(path: str) -> np.ndarray:
+    """A vectors .npy, memory-mapped read-only."""
+    return np.load(path, mmap_mode="r")
+
+
+def copy_rows(writer: NpyWriter, path: str) -> int:
+    """Append every row of the .npy at `path`; returns the row count."""
+    matrix = load_matrix(path)
+    writer.append(matrix)
+    return len(matrix)
+
+
+def write_meta(output_dir: str, model: str, dtype: str, dim: int, rows: int) -> str:
+    path = os.path.join(output_dir, META)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"model": model, "dtype": dtype, "dim": dim, "rows": rows, "normalized": True}, f, indent=2)
+    os.replace(tmp, path)
+    return path
+
+
+# ----------------------------------------------------------------------
+# Brute-force cosine top-k over a memory-mapped matrix
+# ----------------------------------------------------------------------
+def top_k(
+    matrix: np.ndarray,
+    query: np.ndarray,
+    k: int = 10,
+    block: int = 65536,
+    exclude: Iterable[int] = (),
+) -> List[Tuple[int, float]]:
+    """
+    The k rows most similar to `query` as (row, cosine), best first. Rows
+    are unit length, so the score is one matrix-vector product per block;
+    only the block and the running top k are in memory.
+    """
+    query = np.asarray(query, dtype=np.float32)
+    norm = np.linalg.norm(query)
+    if norm > 0:
+        query = query / norm
+    exclude = set(exclude)
+    best_rows = np.empty(0, dtype=np.int64)
+    best_scores = np.empty(0, dtype=np.float32)
+    want = k + len(exclude)
+    for start in range(0, len(matrix), block):
+        scores = np.asarray(matrix[start:start + block], dtype=np.float32) @ query
+        if len(scores) > want:
+            keep = np.argpartition(-scores, want - 1)[:want]
+        else:
+            keep = np.arange(len(scores))
+        best_rows = np.concatenate((best_rows, keep + start))
+        best_scores = np.concatenate((best_scores, scores[keep]))
+        if len(best_scores) > want:
+            keep = np.argpartition(-best_scores, want - 1)[:want]
+            best_rows, best_scores = best_rows[keep], best_scores[keep]
+    order = np.lexsort((best_rows, -best_scores))
+    hits = [(int(best_rows[i]), float(best_scores[i])) for i in order if int(best_rows[i]) not in exclude]
+    return hits[:k]
+
+
+def corpus_records(output_dir: str, export_format: str, rows: Iterable[int]) -> Dict[int, Dict]:
+    """Row -> record of {format}_corpus (following its shards), for the given rows only."""
+    wanted = set(rows)
+    found: Dict[int, Dict] = {}
+    row = 0
+    for path in corpus_files(output_dir, export_format):
+        if len(found) == len(wanted):
+            break
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                if row in wanted:
+                    found[row] = json.loads(line)
+                    if len(found) == len(wanted):
+                        break
+                row += 1
+    return found
+
+
+def main(argv: Optional[List[str]] = None, prog: Optional[str] = None) -> int:
+    """`docs vectors`: nearest chunks to a text or to a chunk, over <output_dir>/vectors.npy."""
+    parser = argparse.ArgumentParser(
+        prog=prog, description="Cosine top-k search over the chunk vectors of a `--vectors` run"
+    )
+    parser.add_argument("output_dir", help="Output directory of a run (or merge) with --vectors")
+    query = parser.add_mutually_exclusive_group(required=True)
+    query.add_argument("--text", help="Find the chunks closest to this text (loads the run's spaCy model)")
+    query.add_argument("--row", type=int, help="Find the chunks closest to corpus record ROW (0-based)")
+    parser.add_argument("--k", type=int, default=10, help="Number of results (default: 10)")
+    parser.add_argument("--format", default=None, help="Corpus the results are shown from (default: the first found)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON lines")
+    args = parser.parse_args(argv)
+
+    from .llm_export import record_metadata, record_text
+    path = os.path.join(args.output_dir, MATRIX)
+    if not os.path.exists(path):
+        print(f"No {MATRIX} in {args.output_dir}; run with --vectors first", file=sys.stderr)
+        return 1
+    matrix = load_matrix(path)
+    meta = {}
+    if os.path.exists(os.path.join(args.output_dir, META)):
+        with open(os.path.join(args.output_dir, META), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+
+    if args.row is not None:
+        if not 0 <= args.row < len(matrix):
+            print(f"Row {args.row} out of range (0..{len(matrix) - 1})", file=sys.stderr)
+            return 1
+        vector, exclude = matrix[args.row], [args.row]
+    else:
+        import spacy
+        nlp = spacy.load(meta.get("model", "en_core_web_lg"), disable=["parser", "tagger", "lemmatizer", "ner"])
+        vector, exclude = chunk_vectors([nlp(args.text)])[0], []
+    hits = top_k(matrix, vector, k=args.k, exclude=exclude)
+
+    formats = [args.format] if args.format else corpus_formats(args.output_dir)[:1]
+    records = corpus_records(args.output_dir, formats[0], (row for row, _ in hits)) if formats else {}
+    for rank, (row, score) in enumerate(hits, 1):
+        record = records.get(row)
+        metadata = record_metadata(record, formats[0]) if record else {}
+        text = record_text(record, formats[0]) if record else ""
+        if args.json:
+            print(json.dumps({"rank": rank, "row": row, "score": round(score, 4), "metadata": metadata,
+                              "text": text}, ensure_ascii=False))
+        else:
+            where = metadata.get("global_chunk_id") or f"{metadata.get('source', '?')}#{metadata.get('chunk_id', '?')}"
+            snippet = " ".join(text.split())[:100]
+            print(f"{rank:>3}. {score:.3f}  row {row}  {where}\n     {snippet}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
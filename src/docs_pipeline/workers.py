@@ -0,0 +1,159 @@
+# src/docs_pipeline/workers.py
+import gc
+import os
+import sys
+import logging
+import multiprocessing
+from typing import Dict, Optional
+
+# ----------------------------------------------------------------------
+# Per-process model state — one TextTagger / WordDocumentIngester per worker
+# ----------------------------------------------------------------------
+_STATE: Dict[str, object] = {
+    "tagger": None,
+    "ingester": None,
+    "config_path": None,
+    "profile": "full",
+}
+
+
+def preload_models(config_path: str = "config.yaml", tagging_profile: str = "full") -> None:
+    """
+    Load the spaCy/NLTK tagger in the current (parent) process.
+
+    Call this before creating a fork-based Pool: the children inherit the
+    already-loaded model, so the en_core_web_lg vector table is shared
+    copy-on-write instead of being loaded again by every worker.
+    """
+    get_tagger(config_path, tagging_profile)
+    # Move everything loaded so far into the permanent generation so the
+    # children's garbage collector does not touch (and un-share) those pages.
+    if hasattr(gc, "freeze"):
+        gc.collect()
+        gc.freeze()
+    logging.info(f"Preloaded models in parent (RSS {rss_mb():.0f} MB)")
+
+
+def init_worker(
+    config_path: str = "config.yaml",
+    ocr_images: bool = False,
+    ocr_cache_path: Optional[str] = None,
+    ocr_cache_size: int = 100_000,
+    ocr_service_args: Optional[tuple] = None,
+    triage: Optional[Dict] = None,
+    ingest_mode: str = "fast",
+    tagging_profile: str = "full",
+) -> None:
+    """
+    Pool initializer — runs once per worker process.
+
+    Models inherited from a preloading parent are reused as-is; anything
+    missing is loaded here, so each worker pays the cost once instead of
+    once per document. The OCR cache connection is always opened here,
+    in the worker, never inherited from the parent. With `ocr_service_args`
+    images go to the shared OCR service instead of a per-worker EasyOCR.
+    `triage` holds ImageTriage settings (min/max edge, entropy, grayscale).
+    """
+    get_tagger(config_path, tagging_profile)
+    ingester = get_ingester()
+    ingester.mode = ingest_mode
+    if ocr_images:
+        if triage:
+            from .image_triage import ImageTriage
+            ingester.triage = ImageTriage(**triage)
+        if ocr_cache_path:
+            from .ocr_cache import OCRCache
+            ingester.ocr_cache = OCRCache(ocr_cache_path, max_entries=ocr_cache_size)
+        if ocr_service_args:
+            from .ocr_service import RemoteOCR
+            ingester.ocr_engine = RemoteOCR(*ocr_service_args)
+        else:
+            ingester._init_ocr()
+    logging.info(f"Worker {os.getpid()} ready (RSS {rss_mb():.0f} MB)")
+
+
+def get_tagger(config_path: str = "config.yaml", profile: Optional[str] = None):
+    """
+    Return this process's TextTagger, creating it on first use. Without a
+    `profile` the one this worker was initialised with is kept.
+    """
+    profile = profile or _STATE["profile"]
+    if _STATE["tagger"] is None or _STATE["config_path"] != config_path or _STATE["profile"] != profile:
+        from .tagging import TextTagger
+        _STATE["tagger"] = TextTagger(config_path=config_path, profile=profile)
+        _STATE["config_path"] = config_path
+        _STATE["profile"] = profile
+    return _STATE["tagger"]
+
+
+def get_ingester():
+    """Return this process's WordDocumentIngester (EasyOCR reader is kept on it)."""
+    if _STATE["ingester"] is None:
+        from .ingestion import WordDocumentIngester
+        _STATE["ingester"] = WordDocumentIngester()
+    return _STATE["ingester"]
+
+
+def fork_available() -> bool:
+    """True when the platform supports the fork start method."""
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+# ----------------------------------------------------------------------
+# Memory reporting
+# ----------------------------------------------------------------------
+def rss_mb() -> float:
+    """Current resident set size of this process in MB."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (0.0 if unavailable)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def ocr_cache_stats() -> Dict[str, int]:
+    """Cumulative OCR cache hits/misses for this worker (zeros when disabled)."""
+    ingester = _STATE["ingester"]
+    cache = getattr(ingester, "ocr_cache", None)
+    return cache.stats() if cache is not None else {"hits": 0, "misses": 0}
+
+
+def memory_snapshot() -> Dict[str, float]:
+    """Small, picklable memory report returned with every processed file."""
+    return {"pid": os.getpid(), "rss_mb": round(rss_mb(), 1), "peak_rss_mb": round(peak_rss_mb(), 1)}
+
+
+def summarize_worker_memory(snapshots) -> Optional[str]:
+    """Collapse per-file snapshots into one line per worker pid."""
+    per_pid: Dict[int, Dict[str, float]] = {}
+    for snap in snapshots:
+        if not snap:
+            continue
+        cur = per_pid.setdefault(snap["pid"], {"rss_mb": 0.0, "peak_rss_mb": 0.0, "files": 0})
+        cur["rss_mb"] = max(cur["rss_mb"], snap["rss_mb"])
+        cur["peak_rss_mb"] = max(cur["peak_rss_mb"], snap["peak_rss_mb"])
+        cur["files"] += 1
+    if not per_pid:
+        return None
+    lines = [
+        f"  worker {pid}: rss {m['rss_mb']:.0f} MB, peak {m['peak_rss_mb']:.0f} MB, files {m['files']}"
+        for pid, m in sorted(per_pid.items())
+    ]
+    return "Per-worker memory:\n" + "\n".join(lines)
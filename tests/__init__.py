@@ -1 +1,6 @@
+# The package lives under src/ (src layout); make it importable as
+# docs_pipeline without installing it.
+import os
+import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
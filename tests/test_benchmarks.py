@@ -0,0 +1,30 @@
+# tests/test_benchmarks.py
+import os
+import random
+import tempfile
+import unittest
+from benchmarks.corpus import make_document
+from benchmarks.suite import check_regressions
+from docs_pipeline.docx_stream import DocxStreamReader
+
+class TestBenchmarks(unittest.TestCase):
+    def test_corpus_is_reproducible(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            texts = []
+            for name in ("a.docx", "b.docx"):
+                path = os.path.join(tmp, name)
+                make_document(path, random.Random("seed"), paragraphs=30, tables=2, images=0)
+                texts.append([t for t in DocxStreamReader(path).iter_blocks() if name not in t])
+            self.assertEqual(texts[0], texts[1])
+            self.assertTrue(any(" | " in t for t in texts[0]))  # table rows
+
+    def test_check_regressions(self):
+        baseline = {"tag": {"seconds": 2.0}, "chunk": {"seconds": 0.001}, "pdf": {"skipped": "no reportlab"}}
+        results = {"tag": {"seconds": 2.6}, "chunk": {"seconds": 0.004}, "pdf": {"seconds": 9.0}}
+        regressions = check_regressions(results, baseline, tolerance=0.25)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("tag:"))
+        self.assertEqual(check_regressions({"tag": {"seconds": 2.4}}, baseline, tolerance=0.25), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 # tests/test_chunking.py
 import unittest
-from src.chunking import TextChunker
+from docs_pipeline.chunking import TextChunker
+from docs_pipeline.cleaning import TextCleaner
 
 class TestChunking(unittest.TestCase):
     def test_chunk(self):
@@ -9,5 +10,23 @@ class TestChunking(unittest.TestCase):
         chunks = chunker.chunk(text)
         self.assertEqual(chunks, ["one two three", "three four five"])
 
+    def test_chunk_stream_matches_batch(self):
+        cleaner = TextCleaner()
+        paragraphs = [
+            "Access control  policy.", "", "Step one:\treview\nlogs.",
+            " ".join(f"w{i}" for i in range(37)), "Signed, Compliance",
+        ]
+        for chunk_size, overlap in [(3, 1), (5, 0), (10, 4), (500, 100), (1, 0), (7, 6)]:
+            chunker = TextChunker(chunk_size=chunk_size, overlap=overlap)
+            batch = chunker.chunk(cleaner.clean("\n".join(paragraphs)))
+            stream = list(chunker.chunk_stream(cleaner.clean_stream(iter(paragraphs))))
+            self.assertEqual(stream, batch, (chunk_size, overlap))
+            n_words = len(cleaner.clean("\n".join(paragraphs)).split())
+            self.assertEqual(chunker.count_chunks(n_words), len(batch))
+
+    def test_chunk_stream_empty(self):
+        self.assertEqual(list(TextChunker(3, 1).chunk_stream(["", "  "])), [])
+        self.assertEqual(TextChunker(3, 1).count_chunks(0), 0)
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,6 @@
 # tests/test_cleaning.py
 import unittest
-from src.cleaning import TextCleaner
+from docs_pipeline.cleaning import TextCleaner
 
 class TestCleaning(unittest.TestCase):
     def test_clean(self):
@@ -0,0 +1,65 @@
+# tests/test_columnar.py
+import os
+import tempfile
+import unittest
+from docs_pipeline.columnar import ColumnarWriter, chunk_table, iter_batches, read_table
+
+try:
+    import pyarrow  # noqa: F401
+    HAVE_PYARROW = True
+except ImportError:
+    HAVE_PYARROW = False
+
+def _chunks(n, file_name="a.docx"):
+    return [{
+        "content": f"chunk {i} text", "chunk_id": i, "file_name": file_name, "chunk_position": i / n,
+        "word_count": 3, "keywords": ["policy", "audit"][:i % 3], "policy_keywords": [],
+        "intents": ["rule"], "entities": [("ACME", "ORG")] if i % 2 else [],
+    } for i in range(n)]
+
+@unittest.skipUnless(HAVE_PYARROW, "needs pyarrow")
+class TestColumnar(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_chunk_table_is_typed(self):
+        fast = _chunks(2)
+        del fast[0]["entities"]  # fast tagging profile: no NER ran
+        table = chunk_table(fast)
+        self.assertEqual(str(table.schema.field("chunk_id").type), "int32")
+        self.assertEqual(str(table.schema.field("keywords").type.value_type), "string")
+        self.assertEqual(table.column("entities").to_pylist(), [None, [{"text": "ACME", "label": "ORG"}]])
+        self.assertEqual(table.column("keywords").to_pylist(), [[], ["policy"]])
+
+    def test_writer_streams_row_groups(self):
+        for ext in ("parquet", "arrow"):
+            path = os.path.join(self.tmp.name, f"chunks.{ext}")
+            with ColumnarWriter(path, row_group=4) as writer:
+                writer.append(chunk_table(_chunks(3, "a.docx")))
+                writer.append(chunk_table(_chunks(0)))
+                writer.append(chunk_table(_chunks(6, "b.docx")))
+            self.assertEqual([batch.num_rows for batch in iter_batches(path)][:2], [4, 4])
+            table = read_table(path, columns=["file_name", "chunk_id"])
+            self.assertEqual(table.column_names, ["file_name", "chunk_id"])
+            self.assertEqual(
+                list(zip(table["file_name"].to_pylist(), table["chunk_id"].to_pylist())),
+                [("a.docx", i) for i in range(3)] + [("b.docx", i) for i in range(6)],
+            )
+            self.assertFalse([name for name in os.listdir(self.tmp.name) if name.endswith(".tmp")])
+
+    def test_parquet_dictionary_encodes_tags(self):
+        import pyarrow.parquet as pq
+        path = os.path.join(self.tmp.name, "chunks.parquet")
+        with ColumnarWriter(path) as writer:
+            writer.append(chunk_table(_chunks(50)))
+        group = pq.ParquetFile(path).metadata.row_group(0)
+        encodings = {group.column(i).path_in_schema: group.column(i).encodings for i in range(group.num_columns)}
+        self.assertIn("RLE_DICTIONARY", encodings["intents.list.element"])
+        self.assertIn("RLE_DICTIONARY", encodings["file_name"])
+        self.assertEqual(group.column(0).compression, "ZSTD")
+
+if __name__ == '__main__':
+    unittest.main()
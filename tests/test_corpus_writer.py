@@ -0,0 +1,41 @@
+# tests/test_corpus_writer.py
+import json
+import os
+import tempfile
+import unittest
+from docs_pipeline.corpus_writer import ShardedCorpusWriter
+
+def _lines(n):
+    return [json.dumps({"text": f"record {i}"}) + "\n" for i in range(n)]
+
+class TestShardedCorpusWriter(unittest.TestCase):
+    def test_unsharded_single_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with ShardedCorpusWriter(tmp, "bedrock") as writer:
+                for line in _lines(5):
+                    writer.write_line(line)
+            with open(os.path.join(tmp, "bedrock_corpus.jsonl"), encoding="utf-8") as f:
+                self.assertEqual(f.readlines(), _lines(5))
+            self.assertFalse([n for n in os.listdir(tmp) if n.endswith(".tmp")])
+
+    def test_record_and_byte_caps(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with ShardedCorpusWriter(tmp, "bedrock", max_records=2) as writer:
+                for line in _lines(7):
+                    writer.write_line(line)
+            with open(os.path.join(tmp, "bedrock_corpus.index.json")) as f:
+                index = json.load(f)
+            self.assertEqual(index["records"], 7)
+            self.assertEqual([s["records"] for s in index["shards"]], [2, 2, 2, 1])
+
+            size = len(_lines(1)[0].encode("utf-8"))
+            with ShardedCorpusWriter(tmp, "bedrock", max_bytes=2 * size) as writer:
+                for line in _lines(5):
+                    writer.write_line(line)
+            names = sorted(n for n in os.listdir(tmp) if n.endswith(".jsonl"))
+            # The fourth shard of the earlier run is gone
+            self.assertEqual(names, [f"bedrock_corpus-0000{i}.jsonl" for i in range(3)])
+            self.assertTrue(all(os.path.getsize(os.path.join(tmp, n)) <= 2 * size for n in names))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+# tests/test_dedup.py
+import os
+import json
+import tempfile
+import unittest
+from docs_pipeline.dedup import MinHasher, dedup_corpora, jaccard, lsh_params
+
+BOILERPLATE = ("this agreement is confidential and may not be disclosed to any third party without "
+               "the prior written consent of the company and its legal department in every case")
+
+def _write(path, texts, fmt="bedrock"):
+    with open(path, "w", encoding="utf-8") as f:
+        for i, text in enumerate(texts):
+            if fmt == "generic":
+                record = {"id": f"doc{i}_0", "text": text, "source": f"doc{i}.docx", "chunk_id": 0}
+            else:
+                record = {"text": text, "metadata": {"source": f"doc{i}.docx", "chunk_id": 0}}
+            f.write(json.dumps(record) + "\n")
+
+def _read(paths):
+    records = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            records.extend(json.loads(line) for line in f)
+    return records
+
+class TestDedup(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.texts = [
+            BOILERPLATE,
+            "quarterly revenue grew in every region while operating costs stayed flat against the plan",
+            BOILERPLATE.replace("every case", "every instance"),
+            "the onboarding procedure lists the accounts a new employee needs on their first day at work",
+            BOILERPLATE,
+        ]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _corpora(self, *formats):
+        corpora = {}
+        for fmt in formats:
+            path = os.path.join(self.tmp.name, f"raw_{fmt}.jsonl")
+            _write(path, self.texts, fmt)
+            corpora[fmt] = [path]
+        return corpora
+
+    def test_lsh_params_midpoint_below_threshold(self):
+        for threshold in (0.5, 0.8, 0.9):
+            bands, rows = lsh_params(threshold)
+            self.assertLessEqual(bands * rows, 128)
+            self.assertLessEqual((1 / bands) ** (1 / rows), threshold)
+
+    def test_signatures_estimate_similarity(self):
+        hasher = MinHasher()
+        a, b = hasher.signature(self.texts[0]), hasher.signature(self.texts[2])
+        self.assertEqual(jaccard(a, hasher.signature(BOILERPLATE)), 1.0)
+        self.assertGreater(jaccard(a, b), 0.7)
+        self.assertLess(jaccard(a, hasher.signature(self.texts[1])), 0.1)
+
+    def test_drop_keeps_first_occurrence_in_every_format(self):
+        out = os.path.join(self.tmp.name, "out")
+        os.makedirs(out)
+        report = dedup_corpora(self._corpora("bedrock", "generic"), out, mode="drop", threshold=0.7)
+        self.assertEqual((report["records_in"], report["records_out"], report["duplicates"]), (5, 3, 2))
+        for fmt in ("bedrock", "generic"):
+            records = _read(report["formats"][fmt]["shards"])
+            self.assertEqual([r["text"] for r in records], [self.texts[0], self.texts[1], self.texts[3]])
+        self.assertFalse([name for name in os.listdir(out) if name.startswith(".dedup-")])
+
+    def test_collapse_lists_sources_of_copies(self):
+        out = os.path.join(self.tmp.name, "out")
+        os.makedirs(out)
+        report = dedup_corpora(self._corpora("bedrock"), out, mode="collapse", threshold=0.7)
+        canonical = _read(report["formats"]["bedrock"]["shards"])[0]["metadata"]
+        self.assertEqual(canonical["duplicate_count"], 2)
+        self.assertEqual(canonical["sources"], ["doc0.docx", "doc2.docx", "doc4.docx"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+# tests/test_docx_stream.py
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+import docx
+from docx.shared import Inches
+from PIL import Image
+from docs_pipeline.docx_stream import DocxStreamReader
+from docs_pipeline.ingestion import WordDocumentIngester
+
+class TestDocxStream(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "policy.docx")
+        doc = docx.Document()
+        doc.sections[0].header.paragraphs[0].text = "ACME Policy Manual"
+        doc.sections[0].footer.paragraphs[0].text = "Confidential"
+        doc.add_paragraph("Access must be reviewed\tquarterly.")
+        doc.add_paragraph("")
+        table = doc.add_table(rows=1, cols=2)
+        table.cell(0, 0).text = "Owner"
+        table.cell(0, 1).text = "Security team"
+        image = io.BytesIO()
+        Image.new("RGB", (40, 40), "blue").save(image, "PNG")
+        image.seek(0)
+        doc.add_picture(image, width=Inches(1))
+        doc.add_paragraph("End of policy.")
+        doc.save(self.path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_blocks_in_order(self):
+        blocks = list(DocxStreamReader(self.path).iter_blocks())
+        self.assertEqual(blocks, [
+            "ACME Policy Manual",
+            "Access must be reviewed\tquarterly.",
+            "Owner | Security team",
+            "End of policy.",
+            "Confidential",
+        ])
+
+    def test_body_matches_python_docx(self):
+        expected = [p.text for p in docx.Document(self.path).paragraphs if p.text.strip()]
+        blocks = list(DocxStreamReader(self.path, headers_footers=False).iter_blocks())
+        self.assertEqual([b for b in blocks if " | " not in b], expected)
+
+    def test_image_blobs_are_lazy_and_ordered(self):
+        reader = DocxStreamReader(self.path)
+        for _ in reader.iter_blocks():
+            pass
+        blobs = list(reader.iter_image_blobs())
+        self.assertEqual(len(blobs), 1)
+        self.assertEqual(Image.open(io.BytesIO(blobs[0])).size, (40, 40))
+
+    def test_ocr_needs_no_extra_parse(self):
+        engine = mock.Mock(recognize=lambda blobs: ["LOGO"] * len(blobs), last_outcomes=["ocr"])
+        ingester = WordDocumentIngester(ocr_engine=engine)
+        with mock.patch.object(DocxStreamReader, "iter_blocks", autospec=True,
+                               side_effect=DocxStreamReader.iter_blocks) as iter_blocks:
+            lines = list(ingester.open(self.path, ocr_images=True))
+        self.assertEqual(iter_blocks.call_count, 1)
+        self.assertEqual(lines[-2:], ["Confidential", "[Image Text: LOGO]"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+# tests/test_image_triage.py
+import io
+import unittest
+import numpy as np
+from PIL import Image
+from docs_pipeline.image_triage import ImageTriage, SKIPPED, DOWNSCALED, OCR
+
+def _png(array: np.ndarray) -> bytes:
+    buf = io.BytesIO()
+    Image.fromarray(array).save(buf, format="PNG")
+    return buf.getvalue()
+
+def _noise(h: int, w: int) -> np.ndarray:
+    return np.random.RandomState(0).randint(0, 255, (h, w, 3), dtype=np.uint8)
+
+class TestImageTriage(unittest.TestCase):
+    def test_tiny_image_skipped(self):
+        arr, outcome = ImageTriage(min_edge=32).prepare(_png(_noise(16, 16)))
+        self.assertIsNone(arr)
+        self.assertEqual(outcome, SKIPPED)
+
+    def test_blank_image_skipped(self):
+        arr, outcome = ImageTriage().prepare(_png(np.full((200, 200, 3), 255, dtype=np.uint8)))
+        self.assertIsNone(arr)
+        self.assertEqual(outcome, SKIPPED)
+
+    def test_oversized_image_downscaled(self):
+        arr, outcome = ImageTriage(max_edge=100).prepare(_png(_noise(300, 150)))
+        self.assertEqual(outcome, DOWNSCALED)
+        self.assertEqual(arr.shape, (100, 50, 3))
+
+    def test_grayscale(self):
+        arr, outcome = ImageTriage(grayscale=True).prepare(_png(_noise(64, 64)))
+        self.assertEqual(outcome, OCR)
+        self.assertEqual(arr.shape, (64, 64))
+
+    def test_unreadable_blob_skipped(self):
+        self.assertEqual(ImageTriage().prepare(b"not an image"), (None, SKIPPED))
+
+if __name__ == '__main__':
+    unittest.main()
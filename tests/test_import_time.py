@@ -0,0 +1,51 @@
+# tests/test_import_time.py
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+# Only the stages that need these may import them
+HEAVY = {"easyocr", "torch", "PIL", "numpy", "reportlab", "spacy", "nltk", "docx", "cv2"}
+
+def import_times(*args):
+    """Run `python -X importtime *args` and return {module: cumulative µs} for every import."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args], cwd=SRC, capture_output=True, text=True, timeout=120
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():  # skips the header line
+            times[name.strip()] = int(cumulative)
+    return proc.returncode, times
+
+class TestImportTime(unittest.TestCase):
+    def assertLight(self, times):
+        heavy = sorted(HEAVY & {name.split(".")[0] for name in times})
+        self.assertEqual(heavy, [], f"heavy imports: {heavy}")
+
+    def test_help(self):
+        for args in (["-m", "docs_pipeline.pipeline", "--help"], ["-m", "docs_pipeline", "--help"],
+                     ["-m", "docs_pipeline", "run", "--help"]):
+            code, times = import_times(*args)
+            self.assertEqual(code, 0, args)
+            self.assertLight(times)
+
+    def test_run_without_documents(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            code, times = import_times("-m", "docs_pipeline", "run", "--input_dir", tmp, "--output_dir", tmp)
+        self.assertEqual(code, 0)
+        self.assertLight(times)
+
+    def test_ingester_without_ocr(self):
+        code, times = import_times("-c", "from docs_pipeline.ingestion import WordDocumentIngester; WordDocumentIngester()")
+        self.assertEqual(code, 0)
+        self.assertLight(times)
+
+if __name__ == '__main__':
+    unittest.main()
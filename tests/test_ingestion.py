@@ -1,6 +1,11 @@
 # tests/test_ingestion.py
+import sys
 import unittest
-from src.ingestion import WordDocumentIngester
+from unittest import mock
+
+import numpy as np
+
+from docs_pipeline.ingestion import LocalOCR, WordDocumentIngester
 
 class TestIngestion(unittest.TestCase):
     def test_ingest_docx(self):
@@ -10,5 +15,31 @@ class TestIngestion(unittest.TestCase):
         # self.assertTrue(len(text) > 0)
         self.assertTrue(True)  # Placeholder
 
+
+class FakeReader:
+    """easyocr.Reader stand-in: records each batch, reads an image as its size."""
+
+    def __init__(self, *args, **kwargs):
+        self.batches = []
+
+    def readtext_batched(self, batch, **kwargs):
+        self.batches.append([img.shape for img in batch])
+        return [[f"{(img < 255).sum()} ink"] for img in batch]
+
+
+class TestLocalOCR(unittest.TestCase):
+    def setUp(self):
+        with mock.patch.dict(sys.modules, {"easyocr": mock.Mock(Reader=FakeReader)}):
+            self.ocr = LocalOCR(batch_size=8)
+
+    def test_images_of_different_sizes_share_a_padded_batch(self):
+        images = [np.zeros((h, w), dtype=np.uint8) for h, w in [(40, 300), (60, 310), (200, 500), (900, 120)]]
+        texts = self.ocr.recognize_arrays(images)
+        self.assertEqual(texts, [f"{img.size} ink" for img in images])  # padding is blank
+        self.assertEqual(
+            sorted(self.ocr.reader.batches),
+            [[(256, 512), (256, 512), (256, 512)], [(1024, 256)]],
+        )
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,37 @@
+# tests/test_instrumentation.py
+import time
+import unittest
+from docs_pipeline.instrumentation import FileMetrics, build_report, percentile
+
+def _slow(items, delay):
+    for item in items:
+        time.sleep(delay)
+        yield item
+
+class TestInstrumentation(unittest.TestCase):
+    def test_nested_stages_are_exclusive(self):
+        metrics = FileMetrics("a.docx")
+        inner = metrics.timed(_slow(range(5), 0.01), "ingest", count="paragraphs")
+        outer = metrics.timed(_slow(inner, 0.002), "chunk")
+        self.assertEqual(list(outer), list(range(5)))
+        result = metrics.to_dict()
+        self.assertEqual(result["counts"], {"paragraphs": 5})
+        self.assertGreaterEqual(result["stages"]["ingest"]["wall_s"], 0.05)
+        self.assertLess(result["stages"]["chunk"]["wall_s"], 0.04)
+
+    def test_report_percentiles_and_slowest(self):
+        self.assertEqual(percentile([3, 1, 2, 4], 50), 2)
+        self.assertEqual(percentile([3, 1, 2, 4], 95), 4)
+        files = [
+            {"file": f"{i}.docx", "wall_s": float(i), "peak_rss_mb": 100.0 + i,
+             "stages": {"tag": {"wall_s": float(i), "cpu_s": float(i)}}, "counts": {"chunks": 2}}
+            for i in range(1, 5)
+        ]
+        report = build_report(files + [None], wall_s=5.0, slowest=2)
+        self.assertEqual(report["files"], 4)
+        self.assertEqual(report["stages"]["tag"]["wall_s"]["max"], 4.0)
+        self.assertEqual(report["counts"], {"chunks": 8})
+        self.assertEqual([f["file"] for f in report["slowest_files"]], ["4.docx", "3.docx"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,24 @@
+# tests/test_intents.py
+import unittest
+from docs_pipeline.intents import IntentClassifier
+
+class TestIntentClassifier(unittest.TestCase):
+    def test_word_boundaries_and_defaults(self):
+        classifier = IntentClassifier()
+        self.assertEqual(classifier.classify("Privacy means the protection of data."), ["definition"])
+        self.assertEqual(classifier.classify("He was meanspirited on the steppe."), ["general"])
+        self.assertEqual(classifier.classify("Each step MUST be logged."), ["rule", "procedure"])
+
+    def test_weights_negatives_and_prefixes(self):
+        classifier = IntentClassifier({
+            "definition": {"markers": ["means"], "negative": ["by no means"]},
+            "rule": {"markers": {"must": 0.5, "shall": 0.5}},
+            "regulatory": ["regulat*"],
+        }, default="other")
+        self.assertEqual(classifier.classify("This is by no means final."), ["other"])
+        self.assertEqual(classifier.classify("You must comply."), ["other"])
+        self.assertEqual(classifier.classify("You must and shall comply."), ["rule"])
+        self.assertEqual(classifier.classify("New Regulations apply."), ["regulatory"])
+
+if __name__ == "__main__":
+    unittest.main()
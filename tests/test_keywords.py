@@ -0,0 +1,29 @@
+# tests/test_keywords.py
+import unittest
+from docs_pipeline.keywords import KeywordMatcher
+
+class TestKeywordMatcher(unittest.TestCase):
+    def test_multi_word_terms_and_aliases(self):
+        matcher = KeywordMatcher(
+            ["policy", "access control", "data protection", {"gdpr": ["general data protection regulation"]}],
+            aliases={"DPO": "data protection officer"},
+        )
+        text = "The DPO enforces the General Data Protection Regulation and our Access-Control policy."
+        self.assertEqual(
+            matcher.match(text),
+            ["data protection officer", "data protection", "gdpr", "access control", "policy"],
+        )
+        self.assertEqual(matcher.match("controlled access"), [])
+
+    def test_overlapping_matches_with_offsets(self):
+        matcher = KeywordMatcher(["data protection", "protection officer", "officer"])
+        text = "Data protection officer"
+        found = [(m.tag, text[m.start:m.end]) for m in matcher.finditer(text)]
+        self.assertEqual(found, [
+            ("data protection", "Data protection"),
+            ("protection officer", "protection officer"),
+            ("officer", "officer"),
+        ])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+# tests/test_llm_export.py
+import io
+import json
+import os
+import tempfile
+import unittest
+from docs_pipeline.llm_export import EXPORTERS, ChunkExporter, JsonArrayWriter, export_bedrock_jsonl, export_langchain
+
+CHUNKS = [
+    {
+        'chunk_id': i, 'file_name': 'Policy.docx', 'content': f'Accès must be logged {i}.',
+        'word_count': 5, 'keywords': ['accès'], 'policy_keywords': [], 'entities': [('Acme', 'ORG')],
+        'intents': ['rule'], 'chunk_position': i / 3,
+    }
+    for i in range(3)
+]
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "llm_export")
+
+class TestLLMExport(unittest.TestCase):
+    def test_json_array_writer_matches_json_dump(self):
+        for items in ([], CHUNKS):
+            for indent in (2, 4):
+                buf = io.StringIO()
+                writer = JsonArrayWriter(buf, indent=indent)
+                for item in items:
+                    writer.write(item)
+                writer.close()
+                self.assertEqual(buf.getvalue(), json.dumps(items, indent=indent, ensure_ascii=False))
+
+    def test_streaming_exporter_matches_json_dump_output(self):
+        # Fixtures: CHUNKS as the json.dump-based exporters wrote them before streaming
+        with tempfile.TemporaryDirectory() as tmp:
+            for fmt, name in (("langchain", "langchain.json"), ("haystack", "haystack.json"), ("generic", "generic.jsonl")):
+                with ChunkExporter(fmt, os.path.join(tmp, name), "Policy.docx") as exporter:
+                    for chunk in CHUNKS:
+                        exporter.write(chunk)
+                with open(os.path.join(FIXTURES, name), encoding="utf-8") as a, \
+                        open(exporter.output_file, encoding="utf-8") as b:
+                    self.assertEqual(a.read(), b.read(), fmt)
+            batch = export_langchain(CHUNKS, os.path.join(tmp, "batch", "p.json"), "Policy.docx")
+            with open(os.path.join(FIXTURES, "langchain.json"), encoding="utf-8") as a, open(batch, encoding="utf-8") as b:
+                self.assertEqual(a.read(), b.read())
+
+    def test_bedrock_jsonl_drops_empty_metadata(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = export_bedrock_jsonl(CHUNKS, os.path.join(tmp, "p.jsonl"), "Policy.docx")
+            with open(path) as f:
+                records = [json.loads(line) for line in f]
+        self.assertEqual(len(records), 3)
+        self.assertNotIn("policy_keywords", records[0]["metadata"])
+        self.assertEqual(EXPORTERS["bedrock"][1], "jsonl")
+
+    def test_exporters_accept_chunks_without_entities(self):
+        chunks = [{k: v for k, v in c.items() if k != 'entities'} for c in CHUNKS]  # fast tagging profile
+        with tempfile.TemporaryDirectory() as tmp:
+            for fmt, (_, ext) in EXPORTERS.items():
+                with ChunkExporter(fmt, os.path.join(tmp, f"p.{fmt}.{ext}"), "Policy.docx") as exporter:
+                    for chunk in chunks:
+                        exporter.write(chunk)
+                self.assertEqual(exporter.count, 3, fmt)
+
+if __name__ == '__main__':
+    unittest.main()
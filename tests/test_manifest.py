@@ -0,0 +1,76 @@
+# tests/test_manifest.py
+import os
+import tempfile
+import unittest
+from unittest import mock
+from docs_pipeline import manifest as manifest_module
+from docs_pipeline.manifest import BuildManifest, file_digest, output_paths, settings_fingerprint
+
+class TestManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.out = self.tmp.name
+        self.llm = os.path.join(self.out, "a.jsonl")
+        with open(self.llm, "w") as f:
+            f.write("{}\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_lookup_roundtrip(self):
+        fp = settings_fingerprint("missing.yaml", chunk_size=500)
+        digest = file_digest(self.llm)
+        manifest = BuildManifest(self.out)
+        manifest.record("a.docx", digest, fp, {"json": None, "pdf": None, "llm": self.llm})
+        manifest.save()
+
+        reloaded = BuildManifest(self.out)
+        self.assertEqual(reloaded.lookup("a.docx", digest, fp)["llm"], self.llm)
+        self.assertIsNone(reloaded.lookup("a.docx", "other", fp))
+        self.assertIsNone(reloaded.lookup("a.docx", digest, settings_fingerprint("missing.yaml", chunk_size=400)))
+
+    def test_fingerprint_covers_the_active_profiles_model_only(self):
+        def fingerprints(versions):
+            with mock.patch.object(manifest_module, "spacy_model_version", side_effect=versions.get):
+                return [settings_fingerprint("missing.yaml", tagging_profile=p) for p in ("fast", "balanced", "full")]
+
+        before = fingerprints({"en_core_web_sm": "3.7.0", "en_core_web_lg": "3.7.1"})
+        sm_upgraded = fingerprints({"en_core_web_sm": "3.8.0", "en_core_web_lg": "3.7.1"})
+        lg_upgraded = fingerprints({"en_core_web_sm": "3.7.0", "en_core_web_lg": "3.8.0"})
+        self.assertEqual(len(set(before)), 3)
+        self.assertEqual([a == b for a, b in zip(before, sm_upgraded)], [True, False, True])
+        self.assertEqual([a == b for a, b in zip(before, lg_upgraded)], [True, True, False])
+
+    def test_record_over_worker_result(self):
+        manifest = BuildManifest(self.out)
+        result = {"file": "a.docx", "json": None, "pdf": None, "llm": {"bedrock": self.llm},
+                  "metrics": {"stages": {"tag": {"wall_s": 1.0}}}}
+        manifest.record("a.docx", "h", "f", result)
+        manifest.record("a.docx", "h", "f", result)
+        self.assertEqual(manifest.entries["a.docx"]["outputs"]["llm"], {"bedrock": self.llm})
+
+    def test_rebuild_from_worker_result_drops_stale_outputs(self):
+        # A whole worker result, nested metrics included, recorded over an
+        # earlier build used to fail with "unhashable type: 'dict'"
+        manifest = BuildManifest(self.out)
+        pdf = os.path.join(self.out, "a.pdf")
+        with open(pdf, "w") as f:
+            f.write("%PDF")
+        metrics = {"wall_s": 1.0, "stages": {"tag": {"wall_s": 1.0}}, "counts": {"chunks": 2}}
+        manifest.record("a.docx", "h", "f", {"file": "a.docx", "pdf": pdf, "llm": {"bedrock": self.llm},
+                                             "metrics": metrics, "memory": {"rss_mb": 1.0}})
+        result = {"file": "a.docx", "pdf": None, "llm": {"bedrock": self.llm}, "metrics": metrics}
+        self.assertEqual(output_paths(result), [self.llm])
+        manifest.record("a.docx", "h2", "f", result)
+        self.assertFalse(os.path.exists(pdf))
+        self.assertTrue(os.path.exists(self.llm))
+        self.assertNotIn("metrics", manifest.entries["a.docx"]["outputs"])
+
+    def test_prune_removes_outputs(self):
+        manifest = BuildManifest(self.out)
+        manifest.record("a.docx", "h", "f", {"llm": self.llm})
+        self.assertEqual(manifest.prune(["b.docx"]), ["a.docx"])
+        self.assertFalse(os.path.exists(self.llm))
+
+if __name__ == '__main__':
+    unittest.main()
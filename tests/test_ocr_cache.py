@@ -0,0 +1,36 @@
+# tests/test_ocr_cache.py
+import os
+import tempfile
+import unittest
+from docs_pipeline.ocr_cache import OCRCache
+
+class TestOCRCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "ocr.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_hit_miss_and_settings_key(self):
+        cache = OCRCache(self.path)
+        key = OCRCache.make_key(b"logo", {"langs": ["en"]})
+        self.assertNotEqual(key, OCRCache.make_key(b"logo", {"langs": ["de"]}))
+        self.assertIsNone(cache.get(key))
+        cache.put(key, "ACME CORP")
+        self.assertEqual(OCRCache(self.path).get(key), "ACME CORP")  # shared across instances
+        self.assertEqual(cache.get(key), "ACME CORP")
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1})
+
+    def test_lru_eviction(self):
+        cache = OCRCache(self.path, max_entries=2)
+        for name in ("a", "b", "c"):
+            cache.put(name, name.upper())
+        cache.get("a")  # refresh "a" so "b" is least recently used
+        cache._conn.execute("UPDATE ocr SET last_used = 0 WHERE key = 'b'")
+        self.assertEqual(cache.evict(), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "A")
+
+if __name__ == '__main__':
+    unittest.main()
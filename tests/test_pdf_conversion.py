@@ -0,0 +1,56 @@
+# tests/test_pdf_conversion.py
+import os
+import tempfile
+import unittest
+from docs_pipeline.pdf_conversion import BackgroundPDFWriter, ChunkPDFWriter
+
+CHUNKS = [
+    {'chunk_id': i, 'file_name': 'Policy.docx', 'content': 'Accès must be logged. ' * 200, 'intents': ['rule']}
+    for i in range(5)
+]
+
+class TestPDFConversion(unittest.TestCase):
+    def test_chunk_writer(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with ChunkPDFWriter(os.path.join(tmp, "pdf", "p.pdf"), "JSON Output: p.json") as writer:
+                for chunk in CHUNKS:
+                    writer.write(chunk)
+            with open(writer.pdf_file, "rb") as f:
+                self.assertEqual(f.read(5), b"%PDF-")
+        self.assertEqual(writer.count, 5)
+        self.assertGreater(writer.pages, 1)
+
+    def test_wrap_keeps_text(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = ChunkPDFWriter(os.path.join(tmp, "p.pdf"), "t")
+            line = '        "content": "' + "word " * 40 + "x" * 150
+            pieces = list(writer._wrap(line))
+            writer.close()
+        self.assertTrue(all(len(p) <= writer._columns for p in pieces))
+        self.assertEqual(pieces[0] + "".join(p[8:] for p in pieces[1:]), line)
+
+    def test_background_writer(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = BackgroundPDFWriter(os.path.join(tmp, "p.pdf"), "JSON Output: p.json")
+            for chunk in CHUNKS:
+                writer.write(chunk)
+            with open(writer.close(), "rb") as f:
+                self.assertEqual(f.read(5), b"%PDF-")
+        self.assertEqual(writer.count, 5)
+
+    def test_background_writer_errors_and_abort(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = BackgroundPDFWriter(os.path.join(tmp, "bad.pdf"), "t")
+            writer.write({"not json": {1, 2}})
+            for chunk in CHUNKS:
+                writer.write(chunk)
+            with self.assertRaises(RuntimeError):
+                writer.close()
+
+            writer = BackgroundPDFWriter(os.path.join(tmp, "aborted.pdf"), "t")
+            writer.write(CHUNKS[0])
+            writer.abort()
+            self.assertFalse(os.path.exists(writer.pdf_file))
+
+if __name__ == '__main__':
+    unittest.main()
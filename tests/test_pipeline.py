@@ -1,7 +1,7 @@
 # tests/test_pipeline.py
 import unittest
 import os
-from src.pipeline import process_document
+from docs_pipeline.pipeline import process_document
 
 class TestPipeline(unittest.TestCase):
     def test_process_document(self):
@@ -0,0 +1,153 @@
+# tests/test_run.py
+import gc
+import json
+import os
+import tempfile
+import time
+import unittest
+
+import docx
+
+from docs_pipeline import workers
+from docs_pipeline.llm_export import EXPORTERS
+from docs_pipeline.manifest import BuildManifest
+from docs_pipeline.pipeline import PARTS_DIR, main
+
+
+class StubTagger:
+    """Stands in for TextTagger (no spaCy); logs one line per document it tags."""
+
+    profile = "fast"
+    vector_dim = 0
+
+    def __init__(self, log_path, slow=()):
+        self.log_path = log_path
+        self.slow = set(slow)
+
+    def tag_stream(self, chunks, file_name, total_chunks, batch_size=None, vectors=None):
+        if file_name in self.slow:
+            time.sleep(0.5)
+        with open(self.log_path, "a", encoding="utf-8") as log:
+            log.write(file_name + "\n")
+        for i, chunk in enumerate(chunks):
+            yield {
+                "chunk_id": i, "file_name": file_name, "content": chunk, "word_count": len(chunk.split()),
+                "keywords": chunk.split()[:2], "policy_keywords": [], "intents": ["general"],
+                "chunk_position": i / total_chunks,
+            }
+
+
+def _write_docx(path, paragraphs):
+    document = docx.Document()
+    for text in paragraphs:
+        document.add_paragraph(text)
+    document.save(path)
+
+
+@unittest.skipUnless(workers.fork_available(), "the stub tagger reaches workers through fork (--preload)")
+class TestRun(unittest.TestCase):
+    """Whole `docs run`s over small documents; --preload forks workers that inherit the stub."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.input_dir = os.path.join(self.tmp.name, "in")
+        self.output_dir = os.path.join(self.tmp.name, "out")
+        self.log = os.path.join(self.tmp.name, "tagged.log")
+        os.makedirs(self.input_dir)
+        self.names = [f"doc{k}.docx" for k in range(3)]
+        for k, name in enumerate(self.names):
+            _write_docx(os.path.join(self.input_dir, name), [f"Doc {k} para {i}: access is logged." for i in range(20)])
+        self.saved_state = dict(workers._STATE)
+        workers._STATE.update(tagger=StubTagger(self.log), config_path="config.yaml", profile="fast")
+
+    def tearDown(self):
+        workers._STATE.update(self.saved_state)
+        if hasattr(gc, "unfreeze"):
+            gc.unfreeze()  # preload_models froze the test process
+        self.tmp.cleanup()
+
+    def run_pipeline(self, *args):
+        argv = [
+            "--input_dir", self.input_dir, "--output_dir", self.output_dir, "--tagging-profile", "fast",
+            "--chunk_size", "40", "--overlap", "10", "--workers", "2", "--preload", "--no_stage_cache", *args,
+        ]
+        self.assertEqual(main(argv), 0)
+
+    def tagged(self):
+        with open(self.log, encoding="utf-8") as f:
+            return f.read().split()
+
+    def records(self, path):
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f] if path.endswith(".jsonl") else json.load(f)
+
+    def test_one_tag_pass_fans_out_to_every_format(self):
+        self.run_pipeline("--export-format", "all")
+        self.assertEqual(sorted(self.tagged()), self.names)  # once per document, not per format
+        per_file = {}
+        for fmt, (_, ext) in EXPORTERS.items():
+            counts = [
+                len(self.records(os.path.join(self.output_dir, "llm", fmt, f"{os.path.splitext(name)[0]}.{ext}")))
+                for name in self.names
+            ]
+            per_file[fmt] = counts
+            if ext == "jsonl":
+                corpus = self.records(os.path.join(self.output_dir, f"{fmt}_corpus.jsonl"))
+                self.assertEqual(len(corpus), sum(counts), fmt)
+        self.assertEqual(len({tuple(counts) for counts in per_file.values()}), 1)
+        self.assertGreater(min(per_file["bedrock"]), 1)
+
+    def test_no_per_file_corpus_streams_from_part_files(self):
+        self.run_pipeline("--export-format", "bedrock", "langchain", "--no_per_file")
+        corpus = self.records(os.path.join(self.output_dir, "bedrock_corpus.jsonl"))
+        self.assertEqual(sorted({r["metadata"]["file_name"] for r in corpus}), self.names)
+        self.assertGreater(len(corpus), len(self.names))
+        ids = [r["metadata"]["global_chunk_id"] for r in corpus]  # as in `docs merge`
+        self.assertEqual(len(set(ids)), len(corpus))
+        self.assertIn(f"{self.names[0]}#0", ids)
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, "llm")))
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, PARTS_DIR)))
+        # Nothing on disk to reuse: not in the manifest, so the next run rebuilds the corpus
+        self.assertEqual(BuildManifest(self.output_dir).entries, {})
+        self.run_pipeline("--export-format", "bedrock", "langchain", "--no_per_file")
+        self.assertEqual(len(self.tagged()), 2 * len(self.names))
+        self.assertEqual(len(self.records(os.path.join(self.output_dir, "bedrock_corpus.jsonl"))), len(corpus))
+
+    def test_only_empty_documents_are_reported_without_output(self):
+        _write_docx(os.path.join(self.input_dir, "empty.docx"), [])
+        self.run_pipeline("--export-format", "bedrock", "--no_per_file")  # "llm" is {format: None} for every file
+        with open(os.path.join(self.output_dir, "run_report.json"), encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["no_output"], ["empty.docx"])
+
+    def test_corpus_is_in_key_order_whoever_finishes_first(self):
+        # dup.docx repeats doc0.docx, which finishes last
+        paragraphs = [f"Doc 0 para {i}: access is logged." for i in range(20)]
+        _write_docx(os.path.join(self.input_dir, "dup.docx"), paragraphs)
+        workers._STATE["tagger"] = StubTagger(self.log, slow={"doc0.docx"})
+        self.run_pipeline("--export-format", "bedrock", "--schedule", "input", "--dedup", "collapse")
+        self.assertEqual(self.tagged()[-1], "doc0.docx")
+        corpus = self.records(os.path.join(self.output_dir, "bedrock_corpus.jsonl"))
+        names = [r["metadata"]["file_name"] for r in corpus]
+        self.assertEqual(names, sorted(names))
+        self.assertNotIn("dup.docx", names)  # the later copy, in key order, is the one dropped
+        self.assertEqual(corpus[0]["metadata"]["sources"], ["doc0.docx", "dup.docx"])
+
+    def test_changing_formats_drops_their_outputs(self):
+        self.run_pipeline("--export-format", "bedrock", "langchain", "generic")
+        langchain = os.path.join(self.output_dir, "llm", "langchain", "doc0.json")
+        self.assertTrue(os.path.exists(langchain))
+
+        self.run_pipeline("--export-format", "bedrock")
+        self.assertEqual(len(self.tagged()), 2 * len(self.names))  # new format set: rebuilt
+        self.assertFalse(os.path.exists(langchain))
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, "llm", "generic", "doc0.jsonl")))
+        manifest = BuildManifest(self.output_dir)
+        self.assertEqual(manifest.VERSION, 2)
+        self.assertEqual(set(manifest.entries["doc0.docx"]["outputs"]["llm"]), {"bedrock"})
+
+        self.run_pipeline("--export-format", "bedrock")
+        self.assertEqual(len(self.tagged()), 2 * len(self.names))  # unchanged: reused
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+# tests/test_scheduler.py
+import os
+import tempfile
+import unittest
+import zipfile
+from docs_pipeline.scheduler import CostHistory, CostModel, file_features, longest_first, schedule_efficiency
+
+def sample(text_bytes, images, seconds):
+    return {"features": {"text_bytes": text_bytes, "images": images, "file_bytes": 0}, "seconds": seconds}
+
+class TestScheduler(unittest.TestCase):
+    def test_file_features(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "a.docx")
+            with zipfile.ZipFile(path, "w") as zf:
+                zf.writestr("word/document.xml", "x" * 1000)
+                zf.writestr("word/footer1.xml", "x" * 10)
+                zf.writestr("word/styles.xml", "x" * 500)
+                zf.writestr("word/media/image1.png", b"png")
+            features = file_features(path)
+        self.assertEqual((features["text_bytes"], features["images"]), (1010, 1))
+
+    def test_fit_and_estimate(self):
+        model = CostModel.fit([sample(1000, 0, 1.0), sample(2000, 0, 2.0), sample(1000, 2, 5.0)], ocr_images=True)
+        self.assertTrue(model.fitted)
+        self.assertAlmostEqual(model.per_text_byte, 0.001)
+        self.assertAlmostEqual(model.per_image, 2.0)
+        self.assertFalse(CostModel.fit([sample(1000, 0, 1.0)], ocr_images=False).fitted)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            history = CostHistory(tmp)
+            for i, s in enumerate([sample(1000, 0, 1.0), sample(2000, 0, 2.0), sample(3000, 0, 3.0)]):
+                history.record(f"{i}.docx", "h", "fp", s["features"], s["seconds"])
+            history.save()
+            history = CostHistory(tmp)
+            model = history.model("fp", ocr_images=False)
+            self.assertEqual(history.estimate("0.docx", "h", "fp", sample(1000, 0, 0)["features"], model), 1.0)
+            self.assertAlmostEqual(history.estimate("new.docx", "h", "fp", sample(5000, 0, 0)["features"], model), 5.0)
+            self.assertFalse(history.model("other", ocr_images=False).fitted)
+
+    def test_longest_first_and_efficiency(self):
+        self.assertEqual(longest_first(["a", "b", "c"], {"a": 1, "b": 3, "c": 1}), ["b", "a", "c"])
+        report = schedule_efficiency([4.0, 1.0, 1.0], workers=2, wall_s=5.0)
+        self.assertEqual(report["efficiency"], 0.6)
+        self.assertEqual(report["bound_s"], 4.0)
+        self.assertEqual(report["best_efficiency"], 0.75)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+# tests/test_search_index.py
+import json
+import math
+import tempfile
+import unittest
+from collections import Counter
+from docs_pipeline.corpus_writer import ShardedCorpusWriter
+from docs_pipeline.search_index import BM25Index, build_index, record_terms
+
+WORDS = "access control policy review compliance security breach notification data protection audit".split()
+
+def _records(n):
+    records = []
+    for i in range(n):
+        text = " ".join(WORDS[(i * 7 + j * 3) % len(WORDS)] for j in range(5 + i % 13))
+        records.append({"text": text, "metadata": {
+            "file_name": f"f{i % 4}.docx", "chunk_id": i, "keywords": [WORDS[i % len(WORDS)]],
+            "policy_keywords": ["data protection"] if i % 3 == 0 else [],
+            "intents": ["rule", "procedure"] if i % 2 else ["rule"],
+        }})
+    return records
+
+def _bm25(docs, query, keep=lambda i: True, k1=1.2, b=0.75):
+    """Reference scores, straight from the formula."""
+    n, avgdl = len(docs), sum(map(len, docs)) / len(docs)
+    df = Counter(t for d in docs for t in set(d))
+    scores = {}
+    for i, doc in enumerate(docs):
+        tf = Counter(doc)
+        score = sum(
+            qtf * math.log(1 + (n - df[t] + 0.5) / (df[t] + 0.5)) * tf[t] * (k1 + 1)
+            / (tf[t] + k1 * (1 - b + b * len(doc) / avgdl))
+            for t, qtf in Counter(query.split()).items() if t in tf
+        )
+        if score and keep(i):
+            scores[i] = score
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.records = _records(120)
+        with ShardedCorpusWriter(self.tmp.name, "bedrock", max_records=50) as writer:
+            for record in self.records:
+                writer.write_line(json.dumps(record))
+        # A tiny block budget forces several runs through the merge
+        self.meta = build_index(self.tmp.name, block_postings=200)
+        self.index = BM25Index(self.meta["path"])
+        self.docs = [record_terms(r, "bedrock")[0] for r in self.records]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_keywords_are_indexed_with_the_text(self):
+        self.assertEqual(self.docs[0][-3:], ["access", "data", "protection"])
+        self.assertEqual((self.meta["docs"], self.meta["postings"]), (120, sum(len(set(d)) for d in self.docs)))
+
+    def test_scores_match_reference_bm25(self):
+        for query in ("audit", "data protection", "breach breach review", "unknown words"):
+            expected = _bm25(self.docs, query)[:10]
+            hits = self.index.search(query, k=10)
+            self.assertEqual([row for row, _ in hits], [row for row, _ in expected], query)
+            for (_, got), (_, want) in zip(hits, expected):
+                self.assertAlmostEqual(got, want, places=4)
+
+    def test_filters_and_record_lookup(self):
+        hits = self.index.search("audit policy", k=5, intents=["procedure"], file_names=["f1*", "f3.docx"])
+        keep = lambda i: i % 2 == 1 and self.records[i]["metadata"]["file_name"] in ("f1.docx", "f3.docx")
+        self.assertEqual([row for row, _ in hits], [row for row, _ in _bm25(self.docs, "audit policy", keep)[:5]])
+        self.assertEqual(self.index.search("audit", intents=["definition"]), [])
+        row = hits[-1][0]
+        self.assertEqual(self.index.record(self.tmp.name, row), self.records[row])
+        self.assertFalse(self.index.stale(self.tmp.name))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+# tests/test_sharding.py
+import argparse
+import json
+import os
+import tempfile
+import unittest
+from docs_pipeline.journal import ErrorLog, RunJournal
+from docs_pipeline.manifest import BuildManifest
+from docs_pipeline.sharding import merge_shards, parse_shard, shard_dir, shard_of
+from docs_pipeline.utils import get_files_with_extension, input_key, read_file_list
+
+def _touch(path, text=""):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+class TestSharding(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_parse_and_assign(self):
+        self.assertEqual(parse_shard("2/8"), (2, 8))
+        for bad in ("0/4", "5/4", "2", "a/b"):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                parse_shard(bad)
+        keys = [f"dir{i % 7}/file{i}.docx" for i in range(400)]
+        shards = [shard_of(k, 4) for k in keys]
+        self.assertEqual(set(shards), {1, 2, 3, 4})
+        self.assertEqual(shards, [shard_of(k, 4) for k in keys])  # stable
+        self.assertEqual(shard_of("policy.docx", 4), shard_of("policy.docx", 4))
+
+    def test_recursive_discovery_and_file_list(self):
+        for rel in ("a.docx", "sub/a.docx", "sub/deep/b.docx", "sub/notes.txt"):
+            _touch(os.path.join(self.root, "in", rel))
+        found = get_files_with_extension(os.path.join(self.root, "in"), ".docx", recursive=True)
+        self.assertEqual(
+            [input_key(p, os.path.join(self.root, "in")) for p in found], ["a.docx", "sub/a.docx", "sub/deep/b.docx"]
+        )
+        self.assertEqual(len(get_files_with_extension(os.path.join(self.root, "in"), ".docx")), 1)
+
+        _touch(os.path.join(self.root, "list.txt"), "# inputs\nin/sub/a.docx\n\nin/missing.docx\n")
+        with self.assertLogs(level="WARNING"):
+            listed = read_file_list(os.path.join(self.root, "list.txt"))
+        self.assertEqual(listed, [os.path.join(self.root, "in", "sub", "a.docx")])
+
+    def _build_shard(self, out, k, n, files, failed=(), unfinished=()):
+        ns = shard_dir(out, k, n)
+        manifest = BuildManifest(ns)
+        with RunJournal(ns) as journal, ErrorLog(ns) as errors:
+            journal.start([*files, *failed, *unfinished])
+            for key, chunks in files.items():
+                llm = os.path.join(ns, "llm", "bedrock", key.replace(".docx", ".jsonl"))
+                _touch(llm, "".join(
+                    json.dumps({"text": f"{key} {i}", "metadata": {"chunk_id": i}}) + "\n" for i in range(chunks)
+                ))
+                outputs = {"json": None, "pdf": None, "llm": {"bedrock": llm}}
+                manifest.record(key, "h", "fp", outputs)
+                journal.done(key, "h", "fp", outputs, 0.1)
+            for key in failed:
+                errors.write(key, [{"type": "BadZipFile", "message": "File is not a zip file"}], final=True)
+                journal.failed(key, "h", "fp", 2)
+        if not unfinished:  # an interrupted run never saves its manifest
+            manifest.save()
+        return ns
+
+    def test_merge_orders_by_key_with_global_ids(self):
+        out = os.path.join(self.root, "out")
+        self._build_shard(out, 1, 2, {"sub/b.docx": 2, "c.docx": 1})
+        self._build_shard(out, 2, 2, {"a.docx": 1})
+        summary = merge_shards(out)
+        self.assertEqual(summary["files"], 3)
+        with open(os.path.join(out, "bedrock_corpus.jsonl"), encoding="utf-8") as f:
+            ids = [json.loads(line)["metadata"]["global_chunk_id"] for line in f]
+        self.assertEqual(ids, ["a.docx#0", "c.docx#0", "sub/b.docx#0", "sub/b.docx#1"])
+        entries = BuildManifest(out).entries
+        self.assertEqual(sorted(entries), ["a.docx", "c.docx", "sub/b.docx"])
+        # The merged manifest points into the merge output, not the shards
+        llm = entries["sub/b.docx"]["outputs"]["llm"]["bedrock"]
+        self.assertEqual(llm, os.path.join(out, "llm", "bedrock", "sub", "b.jsonl"))
+        with open(llm, encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+    def test_merge_rejects_incomplete_or_overlapping_shards(self):
+        out = os.path.join(self.root, "out")
+        self._build_shard(out, 1, 3, {"a.docx": 1})
+        self._build_shard(out, 2, 3, {"a.docx": 1})
+        with self.assertRaisesRegex(ValueError, "missing shard"):
+            merge_shards(out)
+        self._build_shard(out, 3, 3, {})
+        with self.assertRaisesRegex(ValueError, "more than one shard"):
+            merge_shards(out)
+
+    def test_merge_refuses_unfinished_or_failed_shards(self):
+        out = os.path.join(self.root, "out")
+        self._build_shard(out, 1, 2, {"a.docx": 1})
+        ns = self._build_shard(out, 2, 2, {"b.docx": 1}, unfinished=["c.docx"])
+        with self.assertRaisesRegex(ValueError, "no manifest.json"):
+            merge_shards(out)
+        BuildManifest(ns).save()  # manifest of an earlier, complete run
+        with self.assertRaisesRegex(ValueError, r"1 inputs never finished \(c.docx\)"):
+            merge_shards(out)
+
+        self._build_shard(out, 2, 2, {"b.docx": 1}, failed=["c.docx"])
+        with self.assertRaisesRegex(ValueError, "c.docx: BadZipFile: File is not a zip file"):
+            merge_shards(out)
+        with self.assertLogs(level="WARNING"):
+            summary = merge_shards(out, allow_failed=True)
+        self.assertEqual((summary["files"], summary["failed"]), (2, ["c.docx"]))
+
+    def test_merge_refuses_shards_without_per_file_outputs(self):
+        out = os.path.join(self.root, "out")
+        self._build_shard(out, 1, 2, {"a.docx": 1})
+        ns = self._build_shard(out, 2, 2, {})
+        with RunJournal(ns) as journal:  # what a --no_per_file run journals (and leaves out of its manifest)
+            journal.start(["b.docx"])
+            journal.done("b.docx", "h", "fp", {"llm": {"bedrock": None}}, 0.1)
+        with self.assertRaisesRegex(ValueError, "without --no_per_file"):
+            merge_shards(out)
+
+if __name__ == '__main__':
+    unittest.main()
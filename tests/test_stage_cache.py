@@ -0,0 +1,64 @@
+# tests/test_stage_cache.py
+import os
+import tempfile
+import unittest
+from docs_pipeline.manifest import ANNOTATION_KEYS, settings_fingerprint
+from docs_pipeline.stage_cache import StageCache
+
+def _chunk(i, **extra):
+    return {"content": f"chunk {i}", "word_count": 2, "keywords": ["chunk"], "entities": [("ACME", "ORG")], **extra}
+
+class TestStageCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = StageCache(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_roundtrip(self):
+        key = StageCache.make_key("ab" * 32, "f" * 64)
+        self.assertIsNone(self.cache.load(key))
+        writer = self.cache.writer(key, chunks=2, words=4)
+        self.assertEqual(len(list(writer.recorded([_chunk(0), _chunk(1)]))), 2)
+        writer.commit()
+        header, rows = self.cache.load(key)
+        self.assertEqual((header["chunks"], header["words"]), (2, 4))
+        self.assertEqual(list(rows), [("chunk 0", 2, ["chunk"], [("ACME", "ORG")]), ("chunk 1", 2, ["chunk"], [("ACME", "ORG")])])
+
+    def test_failed_chunk_or_abort_leaves_no_entry(self):
+        key = StageCache.make_key("cd" * 32, "f" * 64)
+        writer = self.cache.writer(key, chunks=2, words=4)
+        writer.add(_chunk(0))
+        writer.add({"content": "chunk 1", "error": "boom"})
+        writer.commit()
+        self.assertIsNone(self.cache.load(key))
+        writer = self.cache.writer(key, chunks=1, words=2)
+        writer.abort()
+        self.assertIsNone(self.cache.load(key))
+        self.assertEqual(os.listdir(os.path.dirname(self.cache.path(key))), [])
+
+    def test_prune_keeps_current_keys(self):
+        keys = [StageCache.make_key(h * 32, "f" * 64) for h in ("ab", "cd")]
+        for key in keys:
+            writer = self.cache.writer(key, chunks=0, words=0)
+            writer.commit()
+        self.assertEqual(self.cache.prune(keys[:1]), 1)
+        self.assertIsNotNone(self.cache.load(keys[0]))
+        self.assertIsNone(self.cache.load(keys[1]))
+
+    def test_keyword_edits_keep_the_analysis_fingerprint(self):
+        config = os.path.join(self.tmp.name, "config.yaml")
+        fingerprints = []
+        for keywords in ("[policy]", "[policy, audit]"):
+            with open(config, "w") as f:
+                f.write(f"keywords: {keywords}\nentity_patterns: []\n")
+            fingerprints.append((
+                settings_fingerprint(config, ignore=ANNOTATION_KEYS, chunk_size=500),
+                settings_fingerprint(config, chunk_size=500),
+            ))
+        self.assertEqual(fingerprints[0][0], fingerprints[1][0])
+        self.assertNotEqual(fingerprints[0][1], fingerprints[1][1])
+
+if __name__ == '__main__':
+    unittest.main()
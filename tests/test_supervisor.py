@@ -0,0 +1,53 @@
+# tests/test_supervisor.py
+import multiprocessing
+import os
+import signal
+import time
+import unittest
+from docs_pipeline.supervisor import Supervisor, WorkerInitError
+
+def _work(path):
+    if path == "bad":
+        return {"file": path, "llm": None, "error": {"type": "ValueError", "message": "bad", "traceback": ""}}
+    if path == "slow":
+        time.sleep(5)
+    if path == "stuck":  # like a C call that never sees SIGALRM
+        signal.pthread_sigmask(signal.SIG_BLOCK, [signal.SIGALRM])
+        time.sleep(30)
+    if path == "crash":
+        os._exit(1)
+    return {"file": path, "llm": {"bedrock": path}}
+
+def _fail_init():
+    raise RuntimeError("no model")
+
+@unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "needs fork")
+class TestSupervisor(unittest.TestCase):
+    def run_all(self, paths, initializer=None, **kwargs):
+        ctx = multiprocessing.get_context("fork")
+        supervisor = Supervisor(
+            lambda init, initargs: ctx.Pool(2, initializer=init, initargs=initargs), ctx, 2, initializer, **kwargs
+        )
+        return {o.path: o for o in supervisor.run(_work, paths)}, supervisor
+
+    def test_retries_timeouts_and_crashes(self):
+        outcomes, _ = self.run_all(["ok", "bad", "slow", "crash"], timeout=0.5, retries=1)
+        self.assertEqual(outcomes["ok"].attempts, 1)
+        self.assertNotIn("error", outcomes["ok"].result)
+        for path, kind in (("bad", "error"), ("slow", "timeout"), ("crash", "crash")):
+            self.assertEqual(outcomes[path].attempts, 2, path)
+            self.assertEqual([e["kind"] for e in outcomes[path].errors], [kind, kind], path)
+            self.assertIn("error", outcomes[path].result)
+
+    def test_hung_worker_restarts_pool(self):
+        outcomes, supervisor = self.run_all(["stuck", "ok"], timeout=0.2, retries=0, hard_limit=1.0)
+        self.assertEqual(outcomes["stuck"].errors[0]["kind"], "hang")
+        self.assertEqual(outcomes["ok"].result["llm"], {"bedrock": "ok"})
+        self.assertEqual(supervisor.restarts, 1)
+
+    def test_init_failure_aborts(self):
+        with self.assertRaises(WorkerInitError):
+            self.run_all(["ok"], initializer=_fail_init)
+
+if __name__ == '__main__':
+    unittest.main()
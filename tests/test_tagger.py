@@ -0,0 +1,172 @@
+# tests/test_tagger.py
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import nltk
+import spacy
+import yaml
+from nltk.tokenize import NLTKWordTokenizer, PunktSentenceTokenizer
+
+from docs_pipeline import tagging
+from docs_pipeline.keywords import tokenize
+from docs_pipeline.manifest import PROFILE_MODELS
+from docs_pipeline.stage_cache import StageCache
+from docs_pipeline.tagging import TextTagger, doc_tokens, doc_words
+
+# NLTK's English list is not bundled with nltk; pin a small one so the
+# golden keywords below do not depend on what is downloaded
+STOP_WORDS = [
+    "the", "a", "an", "and", "or", "of", "to", "be", "is", "it", "its", "for", "by", "in", "on",
+    "at", "with", "must", "are", "any", "see", "our", "your", "than", "will",
+]
+
+
+def make_punkt():
+    """Punkt with a pinned set of abbreviations (punkt_tab is not bundled with nltk either)."""
+    punkt = PunktSentenceTokenizer()
+    punkt._params.abbrev_types.update(
+        ["dr", "mr", "e.g", "i.e", "u.s", "e.u", "inc", "etc", "no", "corp", "jan", "approx", "vs", "ext", "tel"]
+    )
+    return punkt
+
+
+def make_tagger(profile, config=None, directory=None):
+    """A TextTagger without downloads; balanced falls back to spacy.blank when en_core_web_sm is missing."""
+    path = os.path.join(directory, "config.yaml")
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(config or {"keywords": ["privacy", "retention", "access control"]}, f)
+    with mock.patch.object(tagging.nltk, "download"), \
+            mock.patch.object(tagging, "stopwords", mock.Mock(words=lambda lang: STOP_WORDS)), \
+            mock.patch.object(tagging, "load_punkt", make_punkt):
+        return TextTagger(path, profile=profile)
+
+
+# word_count and top keywords as nltk.word_tokenize(chunk.lower()) produced
+# them before tagging moved to spaCy tokens (checked in, not recomputed)
+GOLDEN = [
+    ("The well-known data-protection self-assessment must be completed by the Data Protection Officer (DPO) each year.",
+     18, ["completed", "data", "protection", "officer", "dpo"]),
+    ("E-mail privacy-team@example.com or visit https://intranet.example.com/policies for the e-mail retention policy; "
+     "retention is 24-48 months.",
+     20, ["retention", "visit", "https", "policy", "months"]),
+    ("\"Confidential\" data means any record marked restricted: see Annex A & B, items #3-#5. Confidential records are "
+     "encrypted at rest and in transit.",
+     32, ["confidential", "data", "means", "record", "marked"]),
+    ("Don't share passwords with third-party vendors. Employees can't disclose them, and the CISO/CTO reviews every "
+     "third-party access request [quarterly].",
+     26, ["do", "share", "passwords", "vendors", "employees"]),
+]
+
+# Abbreviations, initials, quotes, contractions and odd punctuation: what the
+# words read off spaCy's tokens must cut exactly as nltk.word_tokenize did
+NLTK_CORPUS = [
+    "Dr. Smith of Acme Corp. met Mr. Jones in the U.S. on Jan. 5. The meeting ran long.",
+    "Approx. 40% of staff (e.g. contractors, i.e. non-employees) are covered, etc. See Annex A.",
+    "The policy applies to A. Smith and J. R. Doe. Section 3. Data must be kept.",
+    "Refer to No. 7 in the list. Items vs. rules are compared. Ends with an abbreviation like Inc.",
+    "Call ext. 5 between 9am-5pm. Tel.: +1 (555) 123-4567, fax 555.123.4567",
+    'He said "stop." Then he left. (See the annex.) Then continue. Ends with a quote "like this."',
+    "Wait... what? Nothing. Step 1. Open the file. Step 2. Close it. The E.U. agrees. Fine.",
+    "Sentence one.Sentence two without space. Third: yes.\nMultiple   spaces    and\ttabs here.",
+    "Don't share passwords; employees can't and won't disclose them, and we cannot allow it.",
+    "Gimme the data, lemme see, wanna go? Gotta go. More'n enough. D'ye know? 'Tis true, 'twas so.",
+    "Rock 'n' roll isn't gonna stop; I'm sure you'll see. He'd've done it; y'all know; o'clock",
+    "She said \"hello\" and 'goodbye' to the team's lead. It's the users' data, “quoted” text",
+    "Use the --force flag---carefully. Also ```code``` blocks, ''quoted'' and ``quoted'' forms",
+    "Use A/B tests, e.g. on iOS/Android... or not?! Prices: 1,000-2,000 USD; ratio 3:1 at 9:00",
+    "Emails: a.b@c.d, foo@bar.org; tags #gdpr #privacy. Ask what's next—then decide – fast",
+    "The 5km run costs $3.88 (about 10%) and starts at 10:30am. Numbers like v2.0.1 and 3rd-party",
+]
+
+
+class TestTextTagger(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_fast_profile_has_no_entities(self):
+        tagger = make_tagger("fast", directory=self.tmp.name)
+        self.assertIsNone(tagger.nlp)
+        self.assertEqual(tagger.vector_dim, 0)
+        chunk = tagger.tag_chunks(["Privacy notices must be kept for five years."], "a.docx")[0]
+        self.assertNotIn("entities", chunk)
+        self.assertEqual(chunk["policy_keywords"], ["privacy"])
+        self.assertEqual(chunk["word_count"], 8)
+
+    def test_balanced_profile_falls_back_to_blank_pipeline_with_entity_ruler(self):
+        config = {
+            "keywords": ["privacy"],
+            "entity_patterns": [
+                {"label": "ORG", "pattern": "Acme Corp"},
+                {"label": "LAW", "pattern": [{"LOWER": "gdpr"}]},
+            ],
+        }
+        with mock.patch("spacy.load", side_effect=OSError("en_core_web_sm is not installed")):
+            tagger = make_tagger("balanced", config, directory=self.tmp.name)
+            plain = make_tagger("balanced", directory=self.tmp.name)
+        self.assertEqual(tagger.nlp.pipe_names, ["entity_ruler"])
+        chunk = tagger.tag_chunks(["Acme Corp processes data under the GDPR."], "a.docx")[0]
+        self.assertEqual(chunk["entities"], [("Acme Corp", "ORG"), ("GDPR", "LAW")])
+        # Blank pipeline, no patterns: no NER at all, but the key stays
+        self.assertEqual(plain.nlp.pipe_names, [])
+        self.assertEqual(plain.tag_chunks(["Acme Corp processes data."], "a.docx")[0]["entities"], [])
+
+    def test_full_profile_needs_its_model(self):
+        with mock.patch("spacy.load", side_effect=OSError("en_core_web_lg is not installed")):
+            with self.assertRaises(OSError):
+                make_tagger("full", directory=self.tmp.name)
+
+    def test_stage_cache_round_trip_matches_tagging(self):
+        config = {
+            "keywords": ["privacy", "retention", "access control"],
+            "keyword_offsets": True,
+            "entity_patterns": [{"label": "ORG", "pattern": "Acme Corp"}],
+        }
+        chunks = [text for text, _, _ in GOLDEN] + ["Acme Corp must review access control.", ""]
+        cache = StageCache(os.path.join(self.tmp.name, "stage_cache"))
+        with mock.patch("spacy.load", side_effect=OSError("en_core_web_sm is not installed")):
+            taggers = [make_tagger(p, config, directory=self.tmp.name) for p in ("fast", "balanced")]
+        for tagger in taggers:
+            key = StageCache.make_key("ab" * 32, tagger.profile * 16)
+            writer = cache.writer(key, chunks=len(chunks), words=0)
+            tagged = list(writer.recorded(tagger.tag_stream(iter(chunks), "a.docx", len(chunks))))
+            writer.commit()
+            _, rows = cache.load(key)
+            self.assertEqual(list(tagger.annotate_stream(rows, "a.docx", len(chunks))), tagged, tagger.profile)
+        self.assertEqual(tagged[-2]["entities"], [("Acme Corp", "ORG")])
+
+    def test_fingerprinted_models_match_the_profiles(self):
+        self.assertEqual({p: m for p, m in PROFILE_MODELS.items() if m}, TextTagger.SPACY_MODELS)
+        self.assertEqual(set(PROFILE_MODELS), set(TextTagger.PROFILES))
+
+    def test_spacy_words_match_nltk_word_tokenize(self):
+        tagger = make_tagger("balanced", directory=self.tmp.name)
+        tagged = tagger.tag_chunks([text for text, _, _ in GOLDEN], "golden.docx")
+        for chunk, (_, word_count, keywords) in zip(tagged, GOLDEN):
+            self.assertEqual((chunk["word_count"], chunk["keywords"]), (word_count, keywords))
+
+    def test_doc_words_and_tokens_match_the_nltk_and_regex_passes(self):
+        nlp, punkt, treebank = spacy.blank("en"), make_punkt(), NLTKWordTokenizer()
+        for text in NLTK_CORPUS:
+            doc = nlp(text)
+            # nltk.word_tokenize(text.lower()), with the pinned Punkt
+            words = [word for sentence in punkt.tokenize(text.lower()) for word in treebank.tokenize(sentence)]
+            self.assertEqual(doc_words(doc, punkt), words, text)
+            self.assertEqual(doc_tokens(doc), tokenize(text), text)
+
+    def test_doc_words_match_nltk_word_tokenize_with_trained_punkt(self):
+        try:
+            punkt = tagging.load_punkt()
+        except LookupError:
+            self.skipTest("NLTK punkt_tab is not installed")
+        nlp = spacy.blank("en")
+        for text in NLTK_CORPUS:
+            self.assertEqual(doc_words(nlp(text), punkt), nltk.word_tokenize(text.lower()), text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+# tests/test_vectors.py
+import os
+import tempfile
+import unittest
+import numpy as np
+import spacy
+from docs_pipeline.vectors import NpyWriter, chunk_vectors, load_matrix, top_k
+from docs_pipeline.stage_cache import StageCache
+
+def _nlp():
+    nlp = spacy.blank("en")
+    rng = np.random.default_rng(0)
+    for word in ("policy", "security", "audit", "access", "control"):
+        nlp.vocab.set_vector(word, rng.standard_normal(8).astype("float32"))
+    return nlp
+
+class TestVectors(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_chunk_vectors_match_spacy_doc_vector(self):
+        nlp = _nlp()
+        docs = list(nlp.pipe(["security policy audit", "nothing known here", "", "access control policy"]))
+        matrix = chunk_vectors(docs)
+        self.assertEqual(matrix.shape, (4, 8))
+        for row, doc in ((0, docs[0]), (3, docs[3])):
+            expected = doc.vector / np.linalg.norm(doc.vector)
+            np.testing.assert_allclose(matrix[row], expected, rtol=1e-5, atol=1e-6)
+        self.assertFalse(matrix[1].any() or matrix[2].any())
+        self.assertEqual(chunk_vectors(docs, "float16").dtype, np.float16)
+
+    def test_npy_writer_streams_a_loadable_matrix(self):
+        path = os.path.join(self.tmp.name, "vectors.npy")
+        rows = np.arange(30, dtype=np.float32).reshape(10, 3)
+        with NpyWriter(path, "float16") as writer:
+            writer.BLOCK = 4
+            writer.append(rows[:7])
+            writer.append(rows[7])
+            writer.append(rows[8:])
+        matrix = load_matrix(path)
+        self.assertEqual((matrix.shape, matrix.dtype), ((10, 3), np.float16))
+        np.testing.assert_array_equal(matrix, rows.astype(np.float16))
+        with self.assertRaises(ValueError), NpyWriter(os.path.join(self.tmp.name, "bad.npy")) as writer:
+            writer.append(rows)
+            writer.append(np.zeros((1, 4)))
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ["vectors.npy"])
+
+    def test_top_k_matches_full_sort(self):
+        rng = np.random.default_rng(1)
+        matrix = rng.standard_normal((1000, 16)).astype(np.float32)
+        matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+        query = matrix[42]
+        expected = [int(i) for i in np.argsort(-(matrix @ query))[:6]]
+        hits = top_k(matrix, query, k=5, block=64, exclude=[42])
+        self.assertEqual([row for row, _ in hits], expected[1:])
+        self.assertAlmostEqual(top_k(matrix, query, k=1)[0][1], 1.0, places=5)
+
+    def test_stage_cache_keeps_vectors(self):
+        cache = StageCache(self.tmp.name)
+        key = StageCache.make_key("ab" * 32, "f" * 64)
+        vector = np.array([0.5, -0.25], dtype=np.float16)
+        writer = cache.writer(key, chunks=1, words=2, vectors="float16")
+        writer.add({"content": "chunk 0", "word_count": 2, "keywords": ["chunk"], "vector": vector})
+        writer.commit()
+        _, rows = cache.load(key)
+        (row,) = list(rows)
+        self.assertEqual(row[:4], ("chunk 0", 2, ["chunk"], None))
+        np.testing.assert_array_equal(row[4], vector)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+# tests/test_workers.py
+import os
+import unittest
+from docs_pipeline.workers import memory_snapshot, summarize_worker_memory, rss_mb
+
+class TestWorkers(unittest.TestCase):
+    def test_memory_snapshot(self):
+        snap = memory_snapshot()
+        self.assertEqual(snap["pid"], os.getpid())
+        self.assertGreater(rss_mb(), 0)
+
+    def test_summarize_worker_memory(self):
+        snaps = [
+            {"pid": 1, "rss_mb": 100.0, "peak_rss_mb": 120.0},
+            {"pid": 1, "rss_mb": 150.0, "peak_rss_mb": 160.0},
+            None,
+            {"pid": 2, "rss_mb": 90.0, "peak_rss_mb": 95.0},
+        ]
+        report = summarize_worker_memory(snaps)
+        self.assertIn("worker 1: rss 150 MB, peak 160 MB, files 2", report)
+        self.assertIn("worker 2:", report)
+        self.assertIsNone(summarize_worker_memory([None]))
+
+if __name__ == '__main__':
+    unittest.main()